@@ -25,7 +25,9 @@ INDEX_PATTERN = config.get('elasticsearch.index', 'pattern')
 HIMS_CONFIG = {
     'ip': config.get('hims', 'ip'),
     'port': config.getint('hims', 'port'),
-    'key': config.get('hims', 'key')
+    'key': config.get('hims', 'key'),
+    'batch_size': config.getint('hims', 'batch_size', fallback=500),
+    'max_workers': config.getint('hims', 'max_workers', fallback=4)
 }
 
 # 분석 설정
@@ -36,7 +38,62 @@ ANALYSIS_CONFIG = {
     'scroll_size': config.getint('analysis', 'scroll_size'),
     'max_ips_per_url': config.getint('analysis', 'max_ips_per_url'),
     'min_records_threshold': config.getint('analysis', 'min_records_threshold'),
-    'time_window_hours': config.getint('analysis', 'time_window_hours')
+    'time_window_hours': config.getint('analysis', 'time_window_hours'),
+    'time_windows_hours': [
+        int(hours) for hours in config.get(
+            'analysis', 'time_windows_hours', fallback=config.get('analysis', 'time_window_hours')
+        ).split(',') if hours.strip()
+    ],
+    'max_frame_memory_mb': config.getint('analysis', 'max_frame_memory_mb', fallback=1024),
+    'prefetch_ips': config.getint('analysis', 'prefetch_ips', fallback=2),
+    'sessionize': config.getboolean('analysis', 'sessionize', fallback=False),
+    'session_gap_minutes': config.getint('analysis', 'session_gap_minutes', fallback=30),
+    'collapse_runs': config.getboolean('analysis', 'collapse_runs', fallback=False),
+    'time_budget_minutes': config.getint('analysis', 'time_budget_minutes', fallback=0),
+    'schedule_history_days': config.getint('analysis', 'schedule_history_days', fallback=7),
+    'adaptive_sampling': config.getboolean('analysis', 'adaptive_sampling', fallback=False),
+    'sampling_batch_size': config.getint('analysis', 'sampling_batch_size', fallback=50),
+    'sampling_strata': config.getint('analysis', 'sampling_strata', fallback=4),
+    'sampling_min_ips': config.getint('analysis', 'sampling_min_ips', fallback=100),
+    'sampling_ci_half_width': config.getfloat('analysis', 'sampling_ci_half_width', fallback=0.05),
+    'backfill_processes': config.getint('analysis', 'backfill_processes', fallback=4),
+    'es_max_concurrency': config.getint('analysis', 'es_max_concurrency', fallback=8),
+    'status_host': config.get('analysis', 'status_host', fallback='127.0.0.1'),
+    'status_port': config.getint('analysis', 'status_port', fallback=0),
+    'progress_interval_sec': config.getint('analysis', 'progress_interval_sec', fallback=10),
+    'incremental_lag_minutes': config.getint('analysis', 'incremental_lag_minutes', fallback=15),
+    'cpu_workers': config.getint('analysis', 'cpu_workers', fallback=0),
+    'store_pair_summaries': config.getboolean('analysis', 'store_pair_summaries', fallback=False)
+}
+
+# ES/HIMS 요청 지연 제어 설정 (src/data/resilience.py)
+RESILIENCE_CONFIG = {
+    'enabled': config.getboolean('resilience', 'enabled', fallback=True),
+    'timeout_percentile': config.getfloat('resilience', 'timeout_percentile', fallback=99),
+    'timeout_multiplier': config.getfloat('resilience', 'timeout_multiplier', fallback=2.0),
+    'min_timeout_sec': config.getfloat('resilience', 'min_timeout_sec', fallback=1.0),
+    'max_timeout_sec': config.getfloat('resilience', 'max_timeout_sec', fallback=float(ES_CONFIG['request_timeout'])),
+    'hedge': config.getboolean('resilience', 'hedge', fallback=True),
+    'hedge_percentile': config.getfloat('resilience', 'hedge_percentile', fallback=95),
+    'min_samples': config.getint('resilience', 'min_samples', fallback=20),
+    'max_retries': config.getint('resilience', 'max_retries', fallback=2),
+    'retry_base_delay_sec': config.getfloat('resilience', 'retry_base_delay_sec', fallback=0.2),
+    'retry_max_delay_sec': config.getfloat('resilience', 'retry_max_delay_sec', fallback=5.0),
+    'retry_budget_ratio': config.getfloat('resilience', 'retry_budget_ratio', fallback=0.1),
+    'breaker_failure_threshold': config.getint('resilience', 'breaker_failure_threshold', fallback=5),
+    'breaker_reset_sec': config.getfloat('resilience', 'breaker_reset_sec', fallback=30.0),
+    'max_threads': config.getint('resilience', 'max_threads', fallback=16),
+    'max_abandoned': config.getint('resilience', 'max_abandoned', fallback=8),
+    'max_pair_failures': config.getint('resilience', 'max_pair_failures', fallback=3)
+}
+
+# 상주 서비스 설정
+SERVICE_CONFIG = {
+    'run_at': config.get('service', 'run_at', fallback='01:00'),
+    'run_offset_days': config.getint('service', 'run_offset_days', fallback=1),
+    'poll_seconds': config.getint('service', 'poll_seconds', fallback=30),
+    'cache_max_hosts': config.getint('service', 'cache_max_hosts', fallback=1000000),
+    'refresh_minutes': config.getint('service', 'refresh_minutes', fallback=0)
 }
 
 # 카테고리 분류 정의
@@ -1,31 +1,76 @@
 #!/usr/bin/env python3
 """
 URL 분석 실행 스크립트 (완전 자동화)
+
+사용법:
+    python run_analysis.py                  # run과 동일 (오늘 날짜 분석, 자동 재시작)
+    python run_analysis.py run [--date D] [--fresh] [--budget-minutes N] [--status-port P] [--incremental]
+    python run_analysis.py backfill --from D --to D [--processes N] [--es-concurrency N] [--fresh]
+    python run_analysis.py serve [--run-at HH:MM] [--run-now]
+    python run_analysis.py trigger [--date D] [--fresh]
+    python run_analysis.py status [--date D] [--live --port P]
+    python run_analysis.py summary [--date D | --from D --to D] [--exact]
+    python run_analysis.py top-hosts [--date D | --from D --to D] [--url URL ...] [--top N]
+    python run_analysis.py export --output FILE [--date D | --from D --to D] [--ip IP] [--url URL] [--harmful 0|1]
+    python run_analysis.py compact [--date D | --from D --to D]
+    python run_analysis.py reclassify [--date D | --from D --to D] [--refresh-categories]
+    python run_analysis.py clear [--date D | --all]
+
+status/summary/top-hosts/compact/clear는 config.ini, pandas, ES/HIMS 클라이언트를 로드하지 않음
+(시작 시간 목표: READ_ONLY_STARTUP_TARGET_SEC 이내, --timing으로 측정값 출력)
 """
 
-import sys
+import argparse
+import json
 import os
-from datetime import datetime
-import pandas as pd
+import sys
+import time
+from datetime import datetime, timedelta
+
+_START_TIME = time.perf_counter()
 
 # 프로젝트 루트를 Python path에 추가
 sys.path.append(os.path.dirname(__file__))
 
-from src.url_analysis_runner import URLAnalysisRunner
-from config.settings import TRACK_URL
-from src.utils.logger import setup_logging
+DEFAULT_OUTPUT_DIR = "data/analysis_results"
+
+# 조회 전용 명령의 시작 시간 목표 (프로세스 시작 ~ 명령 실행 직전)
+READ_ONLY_STARTUP_TARGET_SEC = 0.3
+
+
+def _date_range(args):
+    """--date 또는 --from/--to 인자를 날짜 리스트로 변환 (None이면 기준 날짜만)"""
+    if args.start_date or args.end_date:
+        start = datetime.strptime(args.start_date or args.end_date, '%Y-%m-%d')
+        end = datetime.strptime(args.end_date or args.start_date, '%Y-%m-%d')
+        return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((end - start).days + 1)]
+    return None
+
+
+def _results(args):
+    """조회 전용 결과 관리자 생성"""
+    from src.utils.results import AnalysisResults
+    return AnalysisResults(args.output_dir, args.date)
 
 
-def main():
-    """메인 함수 - 완전 자동화된 분석"""
-    
+def _print(data):
+    """JSON 형태로 출력"""
+    print(json.dumps(data, ensure_ascii=False, indent=2, default=str))
+
+
+def cmd_run(args):
+    """분석 실행 (기존 기본 동작)"""
+    from config.settings import TRACK_URL
+    from src.url_analysis_runner import URLAnalysisRunner
+    from src.utils.logger import setup_logging
+
     # 로깅 설정
     logger = setup_logging("logs")
-    
+
     # 기본 설정
-    today = datetime.now().strftime('%Y-%m-%d')
+    today = args.date or datetime.now().strftime('%Y-%m-%d')
+
 
-    
     logger.info("="*60)
     logger.info(f"URL 접속 패턴 분석 - {today}")
     logger.info("="*60)
@@ -33,41 +78,53 @@ def main():
     for i, url in enumerate(TRACK_URL, 1):
         logger.info(f"  {i}. {url}")
     logger.info("")
-    
+
     try:
         # 분석 실행기 생성 (날짜별 관리)
-        runner = URLAnalysisRunner("data/analysis_results", today)
-        
+        runner = URLAnalysisRunner(args.output_dir, today)
+
         logger.info(f"📅 분석 날짜: {today}")
         logger.info(f"📁 저장 위치: {runner.file_manager.date_dir}")
-        
+
         # 체크포인트 자동 확인 및 처리
         checkpoint_info = runner.checkpoint_manager.get_checkpoint_info()
-        if checkpoint_info['exists']:
+        if checkpoint_info['exists'] and not args.fresh:
             logger.info(f"✅ 체크포인트 발견: {checkpoint_info['last_processed']}")
             logger.info(f"📊 진행률: {checkpoint_info['progress_percentage']}%")
             logger.info("🔄 자동으로 이전 진행상황에서 계속합니다...")
         else:
             logger.info("🆕 새로운 분석을 시작합니다.")
-        
+
         logger.info("")
-        
-        # 분석 실행 (항상 resume=True로 자동 처리)
-        results = runner.run_analysis(TRACK_URL, resume=True)
-        
+
+        if args.incremental:
+            # 워터마크 이후 구간만 반영 (닫힌 윈도우는 결과 파일, 열린 윈도우는 open_windows 파일)
+            refresh = runner.run_incremental(TRACK_URL, resume=not args.fresh)
+            logger.info("="*60)
+            logger.info("🎉 증분 실행 완료!")
+            logger.info("="*60)
+            for key, value in refresh.items():
+                logger.info(f"  {key}: {value}")
+            return refresh
+
+        # 분석 실행 (기본은 resume=True로 자동 처리)
+        results = runner.run_analysis(
+            TRACK_URL, resume=not args.fresh, budget_minutes=args.budget_minutes, status_port=args.status_port
+        )
+
         # 결과 출력
         logger.info("="*60)
         logger.info("🎉 분석 완료!")
         logger.info("="*60)
         logger.info(f"📊 총 분석 결과: {len(results)}개 레코드")
-        
+
         if not results.empty:
             # 분석 요약
             summary = runner.get_analysis_summary()
             logger.info("\n📈 분석 요약:")
             for key, value in summary.items():
                 logger.info(f"  {key}: {value}")
-            
+
             # 유해 접속 사례
             if '유해 접속 여부' in results.columns:
                 harmful_cases = results[results['유해 접속 여부'] == 1]
@@ -82,17 +139,17 @@ def main():
                     logger.info("\n✅ 유해 접속 사례가 없습니다.")
         else:
             logger.warning("⚠️ 분석 결과가 없습니다.")
-        
+
         # 파일 정보
         file_info = runner.file_manager.get_file_info()
         logger.info(f"\n💾 결과 파일 정보:")
         logger.info(f"   파일 경로: {file_info['results_file']}")
         logger.info(f"   저장 레코드: {file_info['total_records']}개")
         logger.info(f"   파일 크기: {file_info['file_size_mb']} MB")
-        
+
         logger.info(f"\n✨ 분석이 완료되었습니다!")
         return results
-        
+
     except KeyboardInterrupt:
         logger.warning("\n\n⚠️ 사용자에 의해 중단되었습니다.")
         logger.info("💡 다음 실행 시 자동으로 중단된 지점부터 계속됩니다.")
@@ -103,5 +160,217 @@ def main():
         logger.error(traceback.format_exc())
 
 
+def cmd_backfill(args):
+    """날짜 범위 분석 (프로세스 풀에서 날짜별 동시 실행)"""
+    from config.settings import TRACK_URL
+    from src.backfill_runner import BackfillRunner, date_range
+    from src.utils.logger import setup_logging
+
+    logger = setup_logging("logs")
+    dates = date_range(args.start_date, args.end_date or args.start_date)
+    logger.info(f"Backfill {dates[0]} ~ {dates[-1]} ({len(dates)}일), URL {len(TRACK_URL)}개")
+
+    runner = BackfillRunner(args.output_dir, args.processes, args.es_concurrency)
+    summaries = runner.run(
+        dates, TRACK_URL, resume=not args.fresh, budget_minutes=args.budget_minutes, log=logger.info
+    )
+    _print(summaries)
+
+
+def cmd_serve(args):
+    """상주 서비스 실행 (일별 자동 실행 + 수동 트리거)"""
+    from src.service import AnalysisService
+    from src.utils.logger import setup_logging
+
+    logger = setup_logging("logs")
+    service = AnalysisService(args.output_dir, args.run_at, log=logger.info)
+    service.serve_forever(run_now=args.run_now)
+
+
+def cmd_trigger(args):
+    """실행 중인 서비스에 분석 요청"""
+    from src.service import request_run
+
+    trigger_file = request_run(args.output_dir, args.date, args.fresh)
+    print(f"실행 요청을 등록했습니다: {trigger_file}")
+
+
+def cmd_status(args):
+    """날짜별 진행 상태 조회 (--live면 실행 중인 분석의 상태 서버 조회)"""
+    if args.live:
+        from urllib.request import urlopen
+        with urlopen(f"http://{args.host}:{args.port}/status", timeout=5) as response:
+            _print(json.load(response))
+        return
+
+    results = _results(args)
+    if args.date:
+        _print(results.get_status(args.date))
+    else:
+        _print(results.get_daily_summary())
+
+
+def cmd_summary(args):
+    """분석 결과 요약"""
+    _print(_results(args).get_analysis_summary(_date_range(args), exact=args.exact))
+
+
+def cmd_top_hosts(args):
+    """가장 많이 접속된 유해 호스트 (rollup 스케치 병합)"""
+    _print(_results(args).get_top_harmful_hosts(_date_range(args), top=args.top, urls=args.url))
+
+
+def cmd_export(args):
+    """분석 결과 내보내기 (CSV 또는 JSONL)"""
+    file_manager = _results(args).file_manager
+    dates = _date_range(args) or [file_manager.analysis_date]
+
+    if args.ip or args.url or args.harmful is not None:
+        df = file_manager.find(ip=args.ip, url=args.url, harmful=args.harmful, dates=dates)
+    else:
+        df = file_manager.load_all_results(dates)
+
+    if args.output.endswith('.jsonl'):
+        df.to_json(args.output, orient='records', lines=True, force_ascii=False)
+    else:
+        df.to_csv(args.output, index=False, encoding='utf-8-sig')
+    print(f"{len(df)}건을 {args.output}에 저장했습니다.")
+
+
+def cmd_reclassify(args):
+    """저장된 쌍별 호스트 요약으로 결과 재분류 (ES 조회 없음, 날짜별 HIMS 조회 캐시 공유)"""
+    from src.url_analysis_runner import URLAnalysisRunner
+    from src.utils.logger import setup_logging
+
+    setup_logging("logs")
+    dates = _date_range(args) or [args.date or datetime.now().strftime('%Y-%m-%d')]
+    hims_client = hims_lookup = None
+    summaries = []
+    for date_str in dates:
+        runner = URLAnalysisRunner(args.output_dir, date_str, hims_client=hims_client, hims_lookup=hims_lookup)
+        try:
+            summaries.append(runner.reclassify(refresh_categories=args.refresh_categories))
+        finally:
+            runner.close()
+        # 첫 날짜에서 생성된 HIMS 클라이언트/조회 서비스를 다음 날짜에 재사용 (ES는 조회하지 않음)
+        _, hims_client, hims_lookup = runner.get_clients()
+    _print(summaries)
+
+
+def cmd_compact(args):
+    """결과 압축 및 인덱스 생성"""
+    _print(_results(args).compact_results(_date_range(args)))
+
+
+def cmd_clear(args):
+    """데이터 초기화"""
+    _results(args).clear_data(args.date, clear_all=args.all)
+
+
+def build_parser():
+    """명령행 파서 생성"""
+    parser = argparse.ArgumentParser(description="URL 접속 패턴 분석")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help="결과 디렉토리")
+    parser.add_argument('--timing', action='store_true', help="시작/실행 시간 출력")
+    parser.set_defaults(func=cmd_run, date=None, fresh=False, budget_minutes=None, status_port=None, incremental=False)
+    subparsers = parser.add_subparsers(dest='command')
+
+    def add_date_args(subparser, date_range=False):
+        subparser.add_argument('--date', help="분석 날짜 (YYYY-MM-DD), 기본값 오늘")
+        if date_range:
+            subparser.add_argument('--from', dest='start_date', help="시작 날짜 (YYYY-MM-DD)")
+            subparser.add_argument('--to', dest='end_date', help="종료 날짜 (YYYY-MM-DD)")
+
+    run_parser = subparsers.add_parser('run', help="분석 실행")
+    add_date_args(run_parser)
+    run_parser.add_argument('--fresh', action='store_true', help="이전 진행상황을 무시하고 새로 시작")
+    run_parser.add_argument('--budget-minutes', type=float,
+                            help="실행 시간 예산(분), 우선순위 순으로 처리 후 남은 쌍은 deferred_<date>.json에 기록")
+    run_parser.add_argument('--status-port', type=int,
+                            help="상태 조회 HTTP 포트 (GET /status), 기본값 설정 파일 status_port")
+    run_parser.add_argument('--incremental', action='store_true',
+                            help="워터마크 이후 구간만 반영하는 증분 실행 (열린 윈도우는 open_windows_<date>.jsonl)")
+    run_parser.set_defaults(func=cmd_run)
+
+    backfill_parser = subparsers.add_parser('backfill', help="날짜 범위 분석")
+    backfill_parser.add_argument('--from', dest='start_date', required=True, help="시작 날짜 (YYYY-MM-DD)")
+    backfill_parser.add_argument('--to', dest='end_date', help="종료 날짜 (YYYY-MM-DD), 기본값 시작 날짜")
+    backfill_parser.add_argument('--processes', type=int, help="동시에 분석할 날짜 수")
+    backfill_parser.add_argument('--es-concurrency', type=int, help="ES 동시 요청 수 상한 (전체 프로세스 합계)")
+    backfill_parser.add_argument('--fresh', action='store_true', help="날짜별 이전 진행상황을 무시하고 새로 시작")
+    backfill_parser.add_argument('--budget-minutes', type=float, help="날짜별 실행 시간 예산(분)")
+    backfill_parser.set_defaults(func=cmd_backfill)
+
+    serve_parser = subparsers.add_parser('serve', help="상주 서비스 실행")
+    serve_parser.add_argument('--run-at', help="일별 실행 시각 (HH:MM), 기본값 설정 파일 [service] run_at")
+    serve_parser.add_argument('--run-now', action='store_true', help="시작 직후 당일 분석 1회 실행")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    trigger_parser = subparsers.add_parser('trigger', help="서비스에 분석 요청")
+    add_date_args(trigger_parser)
+    trigger_parser.add_argument('--fresh', action='store_true', help="이전 진행상황을 무시하고 새로 시작")
+    trigger_parser.set_defaults(func=cmd_trigger)
+
+    status_parser = subparsers.add_parser('status', help="진행 상태 조회")
+    add_date_args(status_parser)
+    status_parser.add_argument('--live', action='store_true', help="실행 중인 분석의 상태 서버 조회")
+    status_parser.add_argument('--host', default='127.0.0.1', help="상태 서버 주소")
+    status_parser.add_argument('--port', type=int, default=8765, help="상태 서버 포트")
+    status_parser.set_defaults(func=cmd_status)
+
+    summary_parser = subparsers.add_parser('summary', help="분석 결과 요약")
+    add_date_args(summary_parser, date_range=True)
+    summary_parser.add_argument('--exact', action='store_true', help="rollup 대신 결과 파일로 정확히 계산")
+    summary_parser.set_defaults(func=cmd_summary)
+
+    top_hosts_parser = subparsers.add_parser('top-hosts', help="가장 많이 접속된 유해 호스트 (근사)")
+    add_date_args(top_hosts_parser, date_range=True)
+    top_hosts_parser.add_argument('--url', action='append', help="추적 URL 조건 (여러 번 지정 가능)")
+    top_hosts_parser.add_argument('--top', type=int, default=10, help="반환할 호스트 수")
+    top_hosts_parser.set_defaults(func=cmd_top_hosts)
+
+    export_parser = subparsers.add_parser('export', help="분석 결과 내보내기")
+    add_date_args(export_parser, date_range=True)
+    export_parser.add_argument('--output', required=True, help="출력 파일 (.csv 또는 .jsonl)")
+    export_parser.add_argument('--ip', help="사용자 IP 조건")
+    export_parser.add_argument('--url', help="추적 URL 조건")
+    export_parser.add_argument('--harmful', type=int, choices=[0, 1], help="유해 접속 여부 조건")
+    export_parser.set_defaults(func=cmd_export)
+
+    compact_parser = subparsers.add_parser('compact', help="결과 압축 및 인덱스 생성")
+    add_date_args(compact_parser, date_range=True)
+    compact_parser.set_defaults(func=cmd_compact)
+
+    reclassify_parser = subparsers.add_parser('reclassify', help="저장된 쌍별 호스트 요약으로 결과 재분류")
+    add_date_args(reclassify_parser, date_range=True)
+    reclassify_parser.add_argument('--refresh-categories', action='store_true',
+                                   help="저장된 카테고리 대신 HIMS에서 호스트 카테고리를 다시 조회")
+    reclassify_parser.set_defaults(func=cmd_reclassify)
+
+    clear_parser = subparsers.add_parser('clear', help="데이터 초기화")
+    add_date_args(clear_parser)
+    clear_parser.add_argument('--all', action='store_true', help="모든 날짜 삭제")
+    clear_parser.set_defaults(func=cmd_clear)
+
+    return parser
+
+
+def main(argv=None):
+    """메인 함수 - 명령이 없으면 완전 자동화된 분석 실행"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    command_start = time.perf_counter()
+    result = args.func(args)
+
+    if args.timing:
+        startup = command_start - _START_TIME
+        total = time.perf_counter() - _START_TIME
+        target = f" (목표 {READ_ONLY_STARTUP_TARGET_SEC}s)" if args.command != 'run' else ""
+        print(f"[timing] 시작 {startup:.3f}s{target}, 전체 {total:.3f}s", file=sys.stderr)
+
+    return result
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
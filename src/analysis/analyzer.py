@@ -2,12 +2,20 @@
 URL 접속 패턴 분석 모듈
 """
 
+import numpy as np
 import pandas as pd
-from .categorizer import URLCategorizer
+from .categorizer import CLASS_LABELS, URLCategorizer
+from .runs import RUN_COUNT, RUN_LAST_TS
 
 
 class URLAnalyzer:
-    """URL 접속 패턴 분석기"""
+    """
+    URL 접속 패턴 분석기
+    
+    레코드 단위 프레임과 run 단위 프레임(collapse_runs 결과, RUN_COUNT/RUN_LAST_TS 컬럼)을
+    모두 받으며, run 단위 프레임은 건수 가중치로 레코드 단위와 같은 통계를 계산함
+    (analyze_sessions는 레코드 단위 프레임만 지원)
+    """
     
     def __init__(self):
         self.categorizer = URLCategorizer()
@@ -17,7 +25,7 @@ class URLAnalyzer:
         URL 카테고리 통계 분석
         
         Args:
-            df: DataFrame with 'category' column
+            df: DataFrame with 'category' column (레코드 또는 run 단위)
             start_url: 추적할 시작 URL
             ip: 사용자 IP
         
@@ -31,7 +39,8 @@ class URLAnalyzer:
         
         # 시간 정보 파싱 및 정렬
         df['_ts'] = pd.to_datetime(df['@timestamp'], errors='coerce')
-        df = df.sort_values('_ts').reset_index(drop=True)
+        # 안정 정렬: 같은 시각 레코드의 순서를 유지해야 레코드/run 단위 결과가 같음
+        df = df.sort_values('_ts', kind='mergesort').reset_index(drop=True)
         
         # 기본 통계
         stats = self._calculate_basic_stats(df, start_url, ip)
@@ -44,20 +53,249 @@ class URLAnalyzer:
         harmful_stats = self._calculate_harmful_stats(df, start_url)
         stats.update(harmful_stats)
         
+        # 이동 경로 통계 (클래스 전이, 체류 시간, 추적→첫 유해 홉 수)
+        valid = df['_ts'].notna()
+        stats.update(self._calculate_navigation_stats(*self._navigation_arrays(df if valid.all() else df[valid])))
+        
         # Timestamp 객체를 문자열로 변환
         stats = self._convert_timestamps(stats)
         
         return stats
     
+    def analyze_time_windows(self, df, start_url, ip, windows_hours):
+        """
+        여러 시간 윈도우에 대한 URL 카테고리 통계를 한 번에 분석
+        
+        모든 윈도우는 첫 레코드 시각에서 시작하는 접두 구간이므로, 한 번 정렬한
+        프레임에서 누적 합계와 searchsorted 경계만으로 윈도우별 통계를 계산함
+        
+        Args:
+            df: 가장 긴 윈도우로 필터링된 DataFrame ('category' 컬럼 포함). run 단위 프레임은
+                윈도우 경계에서 나뉘어 있어야 함 (collapse_runs의 breaks)
+            start_url: 추적할 시작 URL
+            ip: 사용자 IP
+            windows_hours: 윈도우 길이(시간) 리스트
+        
+        Returns:
+            list: 윈도우별 분석 결과 dict 리스트 (윈도우 길이 오름차순)
+        """
+        df = self.categorizer.classify_dataframe(df, start_url)
+        df['_ts'] = pd.to_datetime(df['@timestamp'], errors='coerce')
+        df = df[df['_ts'].notna()].sort_values('_ts', kind='mergesort').reset_index(drop=True)
+        
+        windows_hours = sorted(set(windows_hours))
+        if df.empty:
+            return [
+                self._with_window(self._get_empty_stats(start_url, ip), hours)
+                for hours in windows_hours
+            ]
+        
+        ts = df['_ts']
+        ts_ns = ts.to_numpy(dtype='datetime64[ns]')
+        host_codes, host_names = pd.factorize(df['sHost'].astype(object))
+        classification = df['classification'].to_numpy()
+        
+        # run 단위면 건수 가중치와 run 마지막 시각 사용
+        counts = df[RUN_COUNT].to_numpy() if RUN_COUNT in df else None
+        cum_counts = np.cumsum(counts) if counts is not None else None
+        last_ts = df[RUN_LAST_TS] if RUN_LAST_TS in df else ts
+        navigation = self._navigation_arrays(df)
+        
+        # 호스트 첫 등장 위치와 분류별 누적 고유 개수
+        is_first = ~pd.Series(host_codes).duplicated().to_numpy()
+        cum_unique = np.cumsum(is_first)
+        cum_unique_by_class = {
+            label: np.cumsum(is_first & (classification == label))
+            for label in ('유해', '안전', '미분류', '추적 URL')
+        }
+        harmful_first_idx = np.flatnonzero(is_first & (classification == '유해'))
+        
+        # 추적 URL 이후 첫 유해 위치
+        track_positions = np.flatnonzero(classification == '추적 URL')
+        track_idx = track_positions[0] if len(track_positions) else None
+        first_harm_idx = None
+        if track_idx is not None:
+            harm_after = np.flatnonzero(classification[track_idx + 1:] == '유해')
+            if len(harm_after):
+                first_harm_idx = track_idx + 1 + harm_after[0]
+        
+        # 윈도우별 경계 (시작 시각 + 윈도우 길이 이하)
+        window_ends = ts_ns[0] + np.array(
+            [np.timedelta64(int(hours * 3600), 's') for hours in windows_hours]
+        )
+        boundaries = np.searchsorted(ts_ns, window_ends, side='right')
+        
+        results = []
+        for hours, end in zip(windows_hours, boundaries):
+            last = end - 1
+            total = int(cum_counts[last]) if counts is not None else int(end)
+            nunique_all = int(cum_unique[last])
+            uniq_harm = int(cum_unique_by_class['유해'][last])
+            hits = np.bincount(host_codes[:end], weights=counts[:end] if counts is not None else None)
+            most_accessed_url = host_names[hits.argmax()]
+            
+            time_to_first_harm_sec = None
+            if track_idx is not None and first_harm_idx is not None and first_harm_idx < end:
+                time_to_first_harm_sec = float(
+                    (ts.iloc[first_harm_idx] - ts.iloc[track_idx]).total_seconds()
+                )
+            
+            stats = {
+                '사용자 IP': ip,
+                '추적 URL': start_url,
+                '접속 Top URL': most_accessed_url,
+                '총 접속 건수': total,
+                '고유 유해 URL 개수': uniq_harm,
+                '유해 접속 여부': 1 if uniq_harm > 0 else 0,
+                '고유 안전 URL 개수': int(cum_unique_by_class['안전'][last]),
+                '고유 미분류 URL 개수': int(cum_unique_by_class['미분류'][last]),
+                '고유 추적 URL 개수': int(cum_unique_by_class['추적 URL'][last]),
+                '평균 방문 횟수(고유당)': round(float(total / nunique_all), 3),
+                '관측 시작 시각': ts.iloc[0],
+                '관측 종료 시각': last_ts.iloc[last],
+                '관측 구간(초)': float((last_ts.iloc[last] - ts.iloc[0]).total_seconds()),
+                '추적→첫 유해 소요(초)': time_to_first_harm_sec,
+                '유해 URL 리스트': host_names[host_codes[harmful_first_idx[harmful_first_idx < end]]].tolist(),
+            }
+            stats.update(self._calculate_navigation_stats(*(array[:end] for array in navigation)))
+            results.append(self._with_window(self._convert_timestamps(stats), hours))
+        
+        return results
+    
+    def analyze_sessions(self, df, start_url, ip, window_hours, gap_minutes):
+        """
+        추적 URL 방문(세션)별 URL 카테고리 통계 분석
+        
+        세션 규칙:
+        - 직전 추적 URL 방문과 gap_minutes 이상 떨어진 추적 URL 방문마다 새 세션 시작
+          (가까운 재방문은 같은 세션의 '추적 URL' 레코드로 남음)
+        - 세션은 시작 방문 다음 레코드부터, 다음 세션 시작 전까지
+        - gap_minutes를 넘는 비활동 구간 이후와 윈도우(window_hours) 밖의 레코드는 제외
+        
+        모든 세션 통계는 세션 번호 기준 groupby 연산으로 한 번에 계산함
+        
+        Args:
+            df: 첫 추적 URL 방문부터의 DataFrame ('category' 컬럼 포함)
+            start_url: 추적할 시작 URL
+            ip: 사용자 IP
+            window_hours: 세션 최대 길이(시간)
+            gap_minutes: 세션을 나누는 비활동 간격(분)
+        
+        Returns:
+            list: 세션별 분석 결과 dict 리스트
+        """
+        df = self.categorizer.classify_dataframe(df, start_url)
+        df['_ts'] = pd.to_datetime(df['@timestamp'], errors='coerce')
+        df = df[df['_ts'].notna()].sort_values('_ts', kind='mergesort').reset_index(drop=True)
+        if df.empty:
+            return []
+        
+        ts = df['_ts']
+        gap = pd.Timedelta(minutes=gap_minutes)
+        is_track = df['classification'] == '추적 URL'
+        
+        # 세션 시작 방문 표시 및 세션 번호 부여 (0은 첫 세션 이전)
+        track_ts = ts[is_track]
+        opens = pd.Series(False, index=df.index)
+        opens[track_ts.index[track_ts.diff().isna() | (track_ts.diff() > gap)]] = True
+        df['_session'] = opens.cumsum()
+        
+        # 비활동 구간 이후 레코드 제외
+        breaks = (ts.diff() > gap) & ~opens
+        broken = breaks.groupby(df['_session']).cumsum() > 0
+        rows = df[(df['_session'] > 0) & ~opens & ~broken].copy()
+        
+        # 세션별 윈도우 적용 (세션 첫 레코드 기준)
+        window_start = rows.groupby('_session')['_ts'].transform('min')
+        rows = rows[rows['_ts'] <= window_start + pd.Timedelta(hours=window_hours)]
+        if rows.empty:
+            return []
+        
+        rows['_host'] = rows['sHost'].astype(object)
+        grouped = rows.groupby('_session')
+        totals = grouped.size()
+        first_ts = grouped['_ts'].min()
+        last_ts = grouped['_ts'].max()
+        session_start = ts[opens].set_axis(df.loc[opens, '_session'])
+        
+        # 세션별 고유 호스트 (첫 등장 레코드)
+        host_first = rows.drop_duplicates(['_session', '_host'])
+        nunique = host_first.groupby('_session').size()
+        uniq_by_class = host_first.groupby(['_session', 'classification']).size().unstack(fill_value=0)
+        harmful_lists = host_first[host_first['classification'] == '유해'].groupby('_session')['_host'].agg(list)
+        
+        # 세션별 최다 접속 호스트 (동률이면 먼저 등장한 호스트)
+        host_hits = rows.groupby(['_session', '_host'], sort=False).size().rename('hits').reset_index()
+        top_hosts = (
+            host_hits.sort_values(['_session', 'hits'], ascending=[True, False], kind='mergesort')
+            .drop_duplicates('_session')
+            .set_index('_session')['_host']
+        )
+        
+        # 세션 내 첫 추적 URL 레코드 이후 첫 유해까지 소요시간
+        track_rows = rows[rows['classification'] == '추적 URL']
+        first_track_pos = track_rows.reset_index().groupby('_session')['index'].min()
+        after_track = rows.index.to_series() > rows['_session'].map(first_track_pos)
+        first_harm_ts = rows[after_track & (rows['classification'] == '유해')].groupby('_session')['_ts'].min()
+        track_time = ts.loc[first_track_pos.to_numpy()].set_axis(first_track_pos.index)
+        time_to_first_harm = (first_harm_ts - track_time).dt.total_seconds()
+        
+        # 세션별 이동 경로 통계 (세션 레코드는 시간순으로 연속된 구간)
+        navigation = self._navigation_arrays(rows)
+        session_ids = rows['_session'].to_numpy()
+        session_starts = np.searchsorted(session_ids, totals.index.to_numpy(), side='left')
+        session_ends = np.searchsorted(session_ids, totals.index.to_numpy(), side='right')
+        
+        results = []
+        for session, begin, end in zip(totals.index, session_starts, session_ends):
+            uniq = uniq_by_class.loc[session]
+            uniq_harm = int(uniq.get('유해', 0))
+            harm_sec = time_to_first_harm.get(session)
+            stats = {
+                '사용자 IP': ip,
+                '추적 URL': start_url,
+                '세션 번호': int(session),
+                '세션 시작 시각': session_start[session],
+                '접속 Top URL': top_hosts[session],
+                '총 접속 건수': int(totals[session]),
+                '고유 유해 URL 개수': uniq_harm,
+                '유해 접속 여부': 1 if uniq_harm > 0 else 0,
+                '고유 안전 URL 개수': int(uniq.get('안전', 0)),
+                '고유 미분류 URL 개수': int(uniq.get('미분류', 0)),
+                '고유 추적 URL 개수': int(uniq.get('추적 URL', 0)),
+                '평균 방문 횟수(고유당)': round(float(totals[session] / nunique[session]), 3),
+                '관측 시작 시각': first_ts[session],
+                '관측 종료 시각': last_ts[session],
+                '관측 구간(초)': float((last_ts[session] - first_ts[session]).total_seconds()),
+                '추적→첫 유해 소요(초)': float(harm_sec) if harm_sec is not None and pd.notna(harm_sec) else None,
+                '유해 URL 리스트': harmful_lists.get(session, []),
+            }
+            stats.update(self._calculate_navigation_stats(*(array[begin:end] for array in navigation)))
+            results.append(self._convert_timestamps(stats))
+        
+        return results
+    
+    def _with_window(self, stats, hours):
+        """결과에 시간 윈도우 길이 추가"""
+        stats['시간 윈도우(시간)'] = hours
+        return stats
+    
     def _calculate_basic_stats(self, df, start_url, ip):
         """기본 통계 계산"""
         if df.empty:
             return self._get_empty_stats(start_url, ip)
         
-        most_accessed_url = df['sHost'].value_counts().index[0]
+        # 최다 접속 호스트 (동률이면 먼저 등장한 호스트), run 단위면 건수 합계 기준
+        hosts = df['sHost'].astype(object)
+        if RUN_COUNT in df:
+            hits = df[RUN_COUNT].groupby(hosts, sort=False).sum()
+            total = int(df[RUN_COUNT].sum())
+        else:
+            hits = hosts.groupby(hosts, sort=False).size()
+            total = len(df)
+        most_accessed_url = hits.idxmax()
         
         # 기본 집계
-        total = len(df)
         nunique_all = df['sHost'].nunique()
         
         # 분류별 건수
@@ -100,7 +338,7 @@ class URLAnalyzer:
         
         # 관측 구간 계산
         first_ts = df['_ts'].dropna().min()
-        last_ts = df['_ts'].dropna().max()
+        last_ts = df[RUN_LAST_TS if RUN_LAST_TS in df else '_ts'].dropna().max()
         span_sec = float((last_ts - first_ts).total_seconds()) if pd.notna(first_ts) and pd.notna(last_ts) else 0.0
         
         return {
@@ -139,6 +377,72 @@ class URLAnalyzer:
             '유해 URL 리스트': harmful_urls
         }
     
+    def _navigation_arrays(self, df):
+        """
+        이동 경로 지표 계산용 배열 (시간순 정렬된 프레임)
+        
+        Returns:
+            tuple: (분류 코드, 호스트 코드, 시작 시각 ns, 마지막 시각 ns)
+        """
+        class_codes = df['class_code'].to_numpy().astype(np.int64)
+        hosts = df['sHost']
+        if isinstance(hosts.dtype, pd.CategoricalDtype):
+            host_codes = hosts.cat.codes.to_numpy()
+        else:
+            host_codes = pd.factorize(hosts)[0]
+        start_ns = df['_ts'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        if RUN_LAST_TS in df:
+            last_ns = df[RUN_LAST_TS].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        else:
+            last_ns = start_ns
+        return class_codes, host_codes, start_ns, last_ns
+    
+    def _calculate_navigation_stats(self, class_codes, host_codes, start_ns, last_ns):
+        """
+        이동 경로 통계 계산 (레코드/run 단위 모두 같은 결과)
+        
+        - 클래스 전이 횟수: 호스트가 바뀌는 이동(이전 호스트 분류 → 다음 호스트 분류) 수
+          (같은 호스트 반복 요청은 이동으로 보지 않음)
+        - 클래스별 체류 시간: 각 레코드에서 다음 레코드까지의 시간을 레코드 분류별로 합산
+        - 추적→첫 유해 홉 수: 첫 추적 URL 레코드부터 그 이후 첫 유해 레코드까지의 호스트 이동 수
+        """
+        k = len(CLASS_LABELS)
+        if len(class_codes) == 0:
+            return self._get_empty_navigation_stats()
+        
+        # 호스트 이동 위치의 (이전 분류, 다음 분류) 쌍 집계
+        changed = host_codes[1:] != host_codes[:-1]
+        transitions = class_codes[:-1][changed] * k + class_codes[1:][changed]
+        matrix = np.bincount(transitions, minlength=k * k).reshape(k, k)
+        
+        # 다음 레코드(run이면 다음 run 시작)까지의 시간, 마지막은 마지막 시각까지
+        next_ns = np.append(start_ns[1:], last_ns[-1])
+        dwell = np.bincount(class_codes, weights=(next_ns - start_ns) / 1e9, minlength=k)
+        
+        hops = None
+        track_positions = np.flatnonzero(class_codes == 0)
+        if len(track_positions):
+            track_idx = track_positions[0]
+            harm_after = np.flatnonzero(class_codes[track_idx + 1:] == 1)
+            if len(harm_after):
+                hops = int(np.count_nonzero(changed[track_idx:track_idx + 1 + harm_after[0]]))
+        
+        return {
+            '클래스 전이 횟수': {
+                source: dict(zip(CLASS_LABELS, row.tolist())) for source, row in zip(CLASS_LABELS, matrix)
+            },
+            '클래스별 체류 시간(초)': {label: round(float(sec), 3) for label, sec in zip(CLASS_LABELS, dwell)},
+            '추적→첫 유해 홉 수': hops,
+        }
+    
+    def _get_empty_navigation_stats(self):
+        """빈 데이터에 대한 이동 경로 통계"""
+        return {
+            '클래스 전이 횟수': {source: dict.fromkeys(CLASS_LABELS, 0) for source in CLASS_LABELS},
+            '클래스별 체류 시간(초)': dict.fromkeys(CLASS_LABELS, 0.0),
+            '추적→첫 유해 홉 수': None,
+        }
+    
     def _get_empty_stats(self, start_url, ip):
         """빈 데이터프레임에 대한 기본 통계"""
         return {
@@ -156,7 +460,8 @@ class URLAnalyzer:
             '관측 종료 시각': None,
             '관측 구간(초)': 0.0,
             '추적→첫 유해 소요(초)': None,
-            '유해 URL 리스트': []
+            '유해 URL 리스트': [],
+            **self._get_empty_navigation_stats(),
         }
     
     def _convert_timestamps(self, stats):
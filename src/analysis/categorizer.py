@@ -2,10 +2,15 @@
 URL 카테고리 분류 모듈
 """
 
+import numpy as np
 import pandas as pd
 from config.settings import HARMFUL_CATEGORIES, SAFE_CATEGORIES
 
 
+# 분류 라벨 (class_code 컬럼의 코드 0~3 순서)
+CLASS_LABELS = ('추적 URL', '유해', '안전', '미분류')
+
+
 class URLCategorizer:
     """URL 카테고리 분류기"""
     
@@ -28,15 +33,20 @@ class URLCategorizer:
         """데이터프레임에 분류 컬럼 추가"""
         df = df.copy()
         
-        # 기본 카테고리 분류
-        df['classification'] = df['category'].apply(self.classify_category)
+        # 기본 카테고리 분류 (벡터화, Int16/categorical 코드 모두 문자열 코드로 비교)
+        codes = df['category'].astype('string')
+        is_harmful = codes.isin(self.harmful_categories).to_numpy()
+        is_safe = codes.isin(self.safe_categories).to_numpy()
+        df['classification'] = np.select([is_harmful, is_safe], ['유해', '안전'], default='미분류')
         
         # 추적 URL이 있는 경우 별도 표시
+        is_track = np.zeros(len(df), dtype=bool)
         if track_url:
-            df['classification'] = df.apply(
-                lambda row: "추적 URL" if row['sHost'] == track_url else row['classification'], 
-                axis=1
-            )
+            is_track = (df['sHost'] == track_url).to_numpy()
+            df['classification'] = np.where(is_track, "추적 URL", df['classification'])
+        
+        # 분류 코드 (CLASS_LABELS 순서, 이동 경로 지표 계산용)
+        df['class_code'] = np.select([is_track, is_harmful, is_safe], [0, 1, 2], default=3).astype(np.int8)
         
         return df
     
@@ -0,0 +1,222 @@
+"""
+CPU 분석 작업 프로세스 풀 모듈 (프레임은 공유 메모리로 전달)
+
+전처리/분류/통계 계산은 pandas 연산이라 GIL 때문에 한 코어에서만 실행되므로, 쌍 단위
+분석을 작업 프로세스에서 실행. 프레임을 pickle로 보내면 직렬화 비용이 이득을 상쇄하므로
+컬럼 배열은 multiprocessing.shared_memory 한 블록에 복사하고 작업 프로세스는 그 버퍼 위의
+NumPy 뷰로 프레임을 구성 (카테고리 사전 등 작은 메타데이터만 pickle로 전달)
+
+- 숫자/시각 컬럼: 버퍼 뷰 (시간대가 있는 시각 컬럼은 pandas 공개 API로 뷰를 만들 수 없어 1회 복사)
+- categorical 컬럼: 정수 코드는 버퍼 뷰, 카테고리 사전은 pickle
+- nullable 정수/실수 컬럼(Int16 등): 값과 결측 마스크 모두 버퍼 뷰
+- 그 외(object) 컬럼: pickle
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+
+# 작업 프로세스별 분석기 (초기화 시 한 번 전달)
+_worker_state = {}
+
+# 컬럼 시작 위치 정렬 단위(바이트)
+_ALIGN = 8
+
+
+def _is_masked_dtype(dtype):
+    """값 배열 + 결측 마스크로 구성되는 nullable 정수/실수 dtype 여부"""
+    return (pd.api.types.is_extension_array_dtype(dtype) and dtype.kind in 'iuf'
+            and hasattr(dtype, 'numpy_dtype'))
+
+
+def available_cpus():
+    """이 프로세스가 사용할 수 있는 CPU 코어 수 (컨테이너 CPU 제한 반영)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class SharedFrame:
+    """공유 메모리에 올린 DataFrame (생성한 프로세스가 release로 해제)"""
+
+    def __init__(self, df):
+        """
+        Args:
+            df: 공유할 DataFrame (인덱스는 유지하지 않음)
+        """
+        columns = []
+        arrays = []
+        offset = 0
+        for name in df.columns:
+            series = df[name]
+            spec = {'name': name}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.cat.codes.to_numpy()
+                spec['kind'] = 'categorical'
+                spec['categories'] = series.cat.categories.tolist()
+                spec['ordered'] = series.cat.ordered
+            elif isinstance(series.dtype, pd.DatetimeTZDtype):
+                values = series.to_numpy(dtype='datetime64[ns]')
+                spec['kind'] = 'datetime'
+                spec['tz'] = series.dt.tz
+            elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufmM':
+                values = series.to_numpy()
+                spec['kind'] = 'array'
+            elif _is_masked_dtype(series.dtype):
+                values = series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0)
+                mask = series.isna().to_numpy()
+                spec['kind'] = 'masked'
+                spec['masked_dtype'] = series.dtype
+                offset = -(-offset // _ALIGN) * _ALIGN
+                spec['mask_offset'] = offset
+                offset += mask.nbytes
+                arrays.append(({'offset': spec['mask_offset']}, mask))
+            else:
+                spec['kind'] = 'object'
+                spec['values'] = series.to_numpy(dtype=object)
+                columns.append(spec)
+                continue
+
+            offset = -(-offset // _ALIGN) * _ALIGN
+            spec.update(dtype=values.dtype.str, offset=offset, length=len(values))
+            offset += values.nbytes
+            columns.append(spec)
+            arrays.append((spec, values))
+
+        self.nbytes = offset
+        self.shm = SharedMemory(create=True, size=max(offset, 1))
+        for spec, values in arrays:
+            view = np.ndarray(len(values), dtype=values.dtype, buffer=self.shm.buf, offset=spec['offset'])
+            view[:] = values
+            del view
+
+        self.spec = {'shm_name': self.shm.name, 'rows': len(df), 'columns': columns}
+
+    def release(self):
+        """공유 메모리 해제 (작업이 끝났거나 취소된 뒤 호출)"""
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def attach_frame(spec, shm):
+    """
+    공유 메모리 버퍼 위에 DataFrame 구성
+
+    Args:
+        spec: SharedFrame.spec
+        shm: spec['shm_name']에 연결한 SharedMemory
+
+    Returns:
+        pandas.DataFrame
+    """
+    data = {}
+    for column in spec['columns']:
+        kind = column['kind']
+        if kind == 'object':
+            data[column['name']] = column['values']
+            continue
+
+        values = np.ndarray(column['length'], dtype=np.dtype(column['dtype']), buffer=shm.buf, offset=column['offset'])
+        if kind == 'categorical':
+            dtype = pd.CategoricalDtype(column['categories'], ordered=column['ordered'])
+            data[column['name']] = pd.Categorical.from_codes(values, dtype=dtype)
+        elif kind == 'datetime':
+            data[column['name']] = pd.Series(values, copy=False).dt.tz_localize('UTC').dt.tz_convert(column['tz'])
+        elif kind == 'masked':
+            mask = np.ndarray(column['length'], dtype=np.bool_, buffer=shm.buf, offset=column['mask_offset'])
+            data[column['name']] = column['masked_dtype'].construct_array_type()(values, mask)
+        else:
+            data[column['name']] = values
+
+    return pd.DataFrame(data, index=pd.RangeIndex(spec['rows']), copy=False)
+
+
+def _init_worker(pair_analysis):
+    """작업 프로세스 초기화 (분석기 보관)"""
+    _worker_state['pair_analysis'] = pair_analysis
+
+
+def _analyze_shared(spec, url, ip, cat_map):
+    """공유 메모리 프레임으로 쌍 분석 (작업 프로세스에서 실행)"""
+    shm = SharedMemory(name=spec['shm_name'])
+    try:
+        df = attach_frame(spec, shm)
+        result = _worker_state['pair_analysis'].run(df, url, ip, cat_map)
+        del df
+        return result
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            # 버퍼 뷰가 아직 참조 중이면 뷰가 회수될 때 매핑이 해제됨
+            pass
+
+
+class CPUAnalysisPool:
+    """
+    쌍 분석 작업 프로세스 풀
+
+    작업 프로세스는 spawn으로 시작 (실행기의 선조회/로그 스레드가 있는 상태에서 fork하지 않음)
+    """
+
+    def __init__(self, pair_analysis, max_workers):
+        """
+        Args:
+            pair_analysis: PairAnalysis (작업 프로세스마다 한 번 pickle로 전달)
+            max_workers: 작업 프로세스 수
+        """
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(pair_analysis,),
+        )
+        self._lock = threading.Lock()
+        self._stats = {'tasks': 0, 'rows': 0, 'shared_bytes': 0}
+
+    def submit(self, df, url, ip, cat_map):
+        """
+        쌍 분석 제출
+
+        Args:
+            df: 스키마가 적용된 원시 데이터프레임
+            cat_map: 분석 구간 호스트의 {host: category}
+
+        Returns:
+            concurrent.futures.Future: PairAnalysis.run 결과 ((결과 리스트, 건너뛴 사유, 호스트 요약))
+        """
+        shared = SharedFrame(df)
+        try:
+            future = self.executor.submit(_analyze_shared, shared.spec, url, ip, cat_map)
+        except Exception:
+            shared.release()
+            raise
+        future.add_done_callback(lambda _: shared.release())
+
+        with self._lock:
+            self._stats['tasks'] += 1
+            self._stats['rows'] += len(df)
+            self._stats['shared_bytes'] += shared.nbytes
+        return future
+
+    def get_stats(self):
+        """작업 통계 (작업 프로세스 수, 제출한 쌍/행 수, 공유 메모리로 전달한 MB)"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['workers'] = self.max_workers
+        stats['shared_mb'] = round(stats.pop('shared_bytes') / (1024 * 1024), 2)
+        return stats
+
+    def shutdown(self):
+        """풀 종료 (대기 중인 작업은 취소)"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,213 @@
+"""
+(URL, IP) 쌍 분석 단계 모듈 (전처리 → 카테고리 적용 → 분석)
+
+HIMS 조회, 결과 저장, 진행 로그 없이 원시 프레임과 카테고리 매핑만으로 동작하므로
+CPU 작업 프로세스(cpu_pool)에서도 실행기와 같은 결과를 계산
+"""
+
+import pandas as pd
+
+from .runs import RUN_COUNT, RUN_LAST_TS, collapse_runs, encode_runs
+
+
+# 전처리에서 쌍을 건너뛴 사유별 진행 로그 메시지
+SKIP_MESSAGES = {
+    'not_found': "    '{url}' not found in DataFrame for IP: {ip}",
+    'empty_subset': "    Empty subset for IP: {ip}",
+    'invalid_timestamps': "    Invalid timestamps for IP: {ip}",
+    'no_window_data': "    No data in time window for IP: {ip}",
+    'insufficient': "    Insufficient data (< {threshold} records) for IP: {ip}",
+}
+
+
+class PairAnalysis:
+    """단일 쌍 분석기 (pickle 가능, 작업 프로세스 초기화 시 전달)"""
+
+    def __init__(self, ingest_schema, analyzer, time_windows_hours, min_records_threshold,
+                 sessionize=False, session_gap_minutes=30, collapse_runs=False, keep_summaries=False):
+        """
+        Args:
+            ingest_schema: IngestSchema (카테고리 매핑/압축)
+            analyzer: URLAnalyzer
+            time_windows_hours: 시간 윈도우 리스트 (가장 긴 윈도우로 구간을 자름)
+            min_records_threshold: 분석할 최소 레코드 수
+            sessionize: 세션 분석 여부
+            session_gap_minutes: 세션 분리 간격(분)
+            collapse_runs: 연속 동일 호스트 run 압축 여부
+            keep_summaries: 분석 구간 호스트 요약(summarize) 반환 여부
+        """
+        self.ingest_schema = ingest_schema
+        self.analyzer = analyzer
+        self.time_windows_hours = sorted(set(time_windows_hours))
+        self.time_window_hours = max(self.time_windows_hours)
+        self.min_records_threshold = min_records_threshold
+        self.sessionize = sessionize
+        self.session_gap_minutes = session_gap_minutes
+        # 세션 분석은 레코드 단위 간격으로 세션을 나누므로 run 압축은 윈도우 분석에만 적용
+        self.collapse_runs = collapse_runs and not sessionize
+        self.keep_summaries = keep_summaries
+
+    def run(self, df, url, ip, cat_map):
+        """
+        원시 프레임 분석
+
+        Args:
+            df: 스키마가 적용된 원시 데이터프레임
+            cat_map: 분석 구간 호스트의 {host: category} (window_hosts 호스트를 조회한 결과)
+
+        Returns:
+            tuple: (분석 결과 리스트, 건너뛴 사유, 호스트 요약) - 건너뛰면 (None, SKIP_MESSAGES 키, None),
+                호스트 요약은 keep_summaries일 때만 반환
+        """
+        processed_df, skipped = self.preprocess(df, url)
+        if skipped:
+            return None, skipped, None
+        processed_df = self.add_categories(processed_df, cat_map)
+        summary = self.summarize(processed_df) if self.keep_summaries else None
+        return self.analyze_frame(processed_df, url, ip), None, summary
+
+    def window_hosts(self, df, url):
+        """
+        분석 구간에 들어올 수 있는 호스트 목록 (카테고리 선조회용, 실제 구간의 상위 집합)
+
+        추적 URL 첫 방문 시각 이후, 그 다음 시각 + time_window_hours까지 (세션 분석은 끝까지)
+        """
+        ts = df['@timestamp']
+        track_ts = ts[df['sHost'] == url].min()
+        if pd.isna(track_ts):
+            return []
+
+        in_window = ts >= track_ts
+        if not self.sessionize:
+            later = ts[ts > track_ts]
+            window_start = later.min() if len(later) else track_ts
+            in_window &= ts <= window_start + pd.Timedelta(hours=self.time_window_hours)
+        # 시각이 없는 레코드는 정렬 시 끝으로 가므로 세션 구간에 포함될 수 있음
+        in_window |= ts.isna()
+        return df.loc[in_window, 'sHost'].unique().tolist()
+
+    def preprocess(self, df, url):
+        """
+        데이터 전처리 (추적 URL 첫 방문 이후 시간 윈도우 구간)
+
+        Returns:
+            tuple: (전처리된 프레임, 건너뛴 사유)
+        """
+        if self.sessionize:
+            return self.preprocess_sessions(df, url)
+
+        # 정렬 및 인덱스 리셋
+        df = df.sort_values("@timestamp", kind="mergesort").reset_index(drop=True)
+
+        # 해당 URL 첫 등장 인덱스 찾기
+        m = df['sHost'].eq(url)
+        if not m.any():
+            return None, 'not_found'
+
+        start_index = m.idxmax() + 1
+        subset_df = df.iloc[start_index:].copy()
+
+        if subset_df.empty:
+            return None, 'empty_subset'
+
+        # 시간 필터링
+        subset_df, skipped = self._apply_time_filter(subset_df)
+        if skipped:
+            return None, skipped
+
+        # 최소 레코드 수 확인
+        if len(subset_df) < self.min_records_threshold:
+            return None, 'insufficient'
+
+        # 연속 동일 호스트 run 압축 (윈도우 경계에서는 run을 나눠 윈도우별 집계를 그대로 유지)
+        if self.collapse_runs:
+            subset_df = collapse_runs(subset_df, self._window_breaks(subset_df))
+
+        return subset_df, None
+
+    def _window_breaks(self, processed_df):
+        """짧은 시간 윈도우들의 끝 시각 (run을 나눌 경계)"""
+        start_time = processed_df['@timestamp'].iloc[0]
+        return [start_time + pd.Timedelta(hours=hours) for hours in self.time_windows_hours[:-1]]
+
+    def preprocess_sessions(self, df, url):
+        """세션 분석용 전처리 (첫 추적 URL 방문부터 전체 레코드 유지)"""
+        df = df.sort_values("@timestamp", kind="mergesort").reset_index(drop=True)
+
+        m = df['sHost'].eq(url)
+        if not m.any():
+            return None, 'not_found'
+
+        return df.iloc[m.idxmax():].copy(), None
+
+    def _apply_time_filter(self, subset_df):
+        """시간 윈도우 필터링"""
+        # timestamp 파싱
+        ts = pd.to_datetime(subset_df["@timestamp"], errors="coerce")
+        if ts.isna().all():
+            return None, 'invalid_timestamps'
+
+        # 시간 윈도우 적용
+        start_time = ts.iloc[0]
+        end_time = start_time + pd.Timedelta(hours=self.time_window_hours)
+
+        filtered_df = subset_df[(ts >= start_time) & (ts <= end_time)].copy()
+
+        if filtered_df.empty:
+            return None, 'no_window_data'
+
+        return filtered_df, None
+
+    def add_categories(self, df, cat_map):
+        """카테고리 정보 추가 (벡터화 적용, Int16/categorical 코드로 압축)"""
+        categories = self.ingest_schema.map_hosts(df['sHost'], cat_map)
+        df['category'] = self.ingest_schema.encode_categories(categories)
+        return df
+
+    def summary_params(self):
+        """호스트 요약을 만든 분석 설정 (설정이 같아야 요약으로 다시 분석 가능)"""
+        if self.sessionize:
+            return {'sessionize': True, 'session_gap_minutes': self.session_gap_minutes,
+                    'window_hours': self.time_window_hours}
+        return {'sessionize': False, 'windows_hours': self.time_windows_hours}
+
+    def summarize(self, processed_df):
+        """
+        분석 구간 호스트 요약 (카테고리가 적용된 전처리 프레임의 run 압축, analyze_frame에 다시 넣으면 같은 결과)
+
+        세션 분석은 레코드 간격으로 세션을 나누므로 레코드 단위 그대로 저장 (건수 1인 run)
+
+        Returns:
+            dict: runs.encode_runs 결과 + 'params'(summary_params), 구간에 유효한 시각이 없으면 None
+        """
+        if self.sessionize:
+            runs = processed_df[processed_df['@timestamp'].notna()].copy()
+            runs[RUN_COUNT] = 1
+            runs[RUN_LAST_TS] = runs['@timestamp']
+        elif RUN_COUNT in processed_df:
+            runs = processed_df
+        else:
+            runs = collapse_runs(processed_df, self._window_breaks(processed_df))
+        if runs.empty:
+            return None
+
+        summary = encode_runs(runs)
+        summary['params'] = self.summary_params()
+        return summary
+
+    def analyze_frame(self, processed_df, url, ip):
+        """
+        전처리된 프레임 분석 (윈도우가 여러 개면 가장 긴 윈도우 프레임에서 한 번에 계산)
+
+        Returns:
+            list: 분석 결과 dict 리스트
+        """
+        if self.sessionize:
+            results = self.analyzer.analyze_sessions(
+                processed_df, url, ip, self.time_window_hours, self.session_gap_minutes
+            )
+            return [r for r in results if r['총 접속 건수'] >= self.min_records_threshold]
+        if len(self.time_windows_hours) > 1:
+            results = self.analyzer.analyze_time_windows(processed_df, url, ip, self.time_windows_hours)
+            return [r for r in results if r['총 접속 건수'] >= self.min_records_threshold]
+        return [self.analyzer.analyze_url_categories(processed_df, url, ip)]
@@ -0,0 +1,100 @@
+"""
+연속 동일 호스트 접속 run-length 압축 모듈
+
+페이지 리소스, 폴링 등으로 같은 호스트가 연속으로 반복되는 구간을
+(호스트, 첫 시각, 마지막 시각, 건수) 한 행으로 압축
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# run 단위 프레임의 추가 컬럼 ('@timestamp'는 run의 첫 시각)
+RUN_COUNT = 'run_count'
+RUN_LAST_TS = 'run_last_ts'
+
+
+def collapse_runs(df, breaks=None):
+    """
+    시간순 정렬된 프레임의 연속 동일 호스트 구간을 run 한 행으로 압축
+
+    Args:
+        df: '@timestamp' 기준 정렬된 DataFrame ('@timestamp', 'sHost' 포함)
+        breaks: run을 나눌 시각 리스트 (시간 윈도우 경계). 경계 시각 이하와 초과
+            레코드는 같은 run에 넣지 않으므로 윈도우별 집계도 run 단위로 정확히 계산 가능
+
+    Returns:
+        pandas.DataFrame: run별 첫 레코드에 RUN_COUNT, RUN_LAST_TS 컬럼을 추가한 프레임
+    """
+    if df.empty:
+        runs = df.copy()
+        runs[RUN_COUNT] = pd.Series(dtype='int64')
+        runs[RUN_LAST_TS] = df['@timestamp']
+        return runs
+
+    hosts = df['sHost']
+    codes = hosts.cat.codes.to_numpy() if isinstance(hosts.dtype, pd.CategoricalDtype) else pd.factorize(hosts)[0]
+
+    new_run = np.empty(len(df), dtype=bool)
+    new_run[0] = True
+    new_run[1:] = codes[1:] != codes[:-1]
+
+    ts = df['@timestamp']
+    if breaks:
+        boundaries = pd.Series(sorted(breaks)).to_numpy(dtype='datetime64[ns]')
+        bucket = np.searchsorted(boundaries, ts.to_numpy(dtype='datetime64[ns]'), side='left')
+        new_run[1:] |= bucket[1:] != bucket[:-1]
+
+    starts = np.flatnonzero(new_run)
+    counts = np.diff(np.append(starts, len(df)))
+
+    runs = df.iloc[starts].copy()
+    runs[RUN_COUNT] = counts
+    runs[RUN_LAST_TS] = ts.iloc[starts + counts - 1].set_axis(runs.index)
+    return runs
+
+
+def encode_runs(runs):
+    """
+    run 프레임을 저장용 dict로 변환 (시각은 첫 run 시각 기준 마이크로초 오프셋)
+
+    Args:
+        runs: 'category' 컬럼이 있는 run 프레임 (시간순 정렬)
+
+    Returns:
+        dict: {'start': 첫 시각 ISO, 'runs': [[호스트, 카테고리, 첫 시각 오프셋, 마지막 시각 오프셋, 건수], ...]}
+    """
+    ts = runs['@timestamp']
+    start = ts.iloc[0]
+    unit = pd.Timedelta(microseconds=1)
+    firsts = ((ts - start) // unit).astype('int64').tolist()
+    lasts = ((runs[RUN_LAST_TS] - start) // unit).astype('int64').tolist()
+    categories = [
+        None if pd.isna(category) else str(category) for category in runs['category'].astype(object)
+    ]
+    return {
+        'start': start.isoformat(),
+        'runs': [
+            list(run) for run in zip(
+                runs['sHost'].astype(object).tolist(), categories, firsts, lasts, runs[RUN_COUNT].astype('int64').tolist()
+            )
+        ],
+    }
+
+
+def decode_runs(encoded):
+    """
+    encode_runs 결과를 run 프레임으로 복원
+
+    Returns:
+        pandas.DataFrame: '@timestamp', 'sHost', 'category', RUN_COUNT, RUN_LAST_TS 컬럼 프레임
+    """
+    start = pd.Timestamp(encoded['start'])
+    hosts, categories, firsts, lasts, counts = zip(*encoded['runs'])
+    return pd.DataFrame({
+        '@timestamp': start + pd.to_timedelta(firsts, unit='us'),
+        'sHost': list(hosts),
+        'category': list(categories),
+        RUN_COUNT: list(counts),
+        RUN_LAST_TS: start + pd.to_timedelta(lasts, unit='us'),
+    })
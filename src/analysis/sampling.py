@@ -0,0 +1,158 @@
+"""
+추적 URL별 적응형 IP 표본 추출 모듈 (층화 배치 + 신뢰구간 기반 조기 종료)
+"""
+
+import math
+import random
+from statistics import NormalDist
+
+
+class StratifiedIPSampler:
+    """
+    IP 규모(doc_count) 순위로 층을 나누고 층별 비례 배분으로 배치를 뽑는 표본 추출기
+
+    - 층 내 순서는 seed 기반 무작위 (같은 URL/날짜면 같은 순서)
+    - 유해 접속 비율은 층화 추정량 Σ W_h·p_h, 분산은 유한 모집단 보정 포함
+    - 신뢰구간은 유효 표본 크기(p(1-p)/분산)로 계산한 Wilson 구간
+    """
+
+    def __init__(self, ips, strata=4, batch_size=50, confidence=0.95, seed=None):
+        """
+        Args:
+            ips: doc_count 내림차순 IP 리스트 (모집단)
+            strata: 층 수
+            batch_size: 배치당 IP 수
+            confidence: 신뢰수준
+            seed: 층 내 순서용 난수 seed
+        """
+        self.batch_size = max(1, batch_size)
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        rng = random.Random(seed)
+        strata = max(1, min(strata, len(ips)))
+        size = math.ceil(len(ips) / strata) if ips else 0
+        self.strata = []
+        for start in range(0, len(ips), size or 1):
+            members = list(ips[start:start + size])
+            rng.shuffle(members)
+            self.strata.append({'members': members, 'next': 0, 'harmful': 0, 'observed': 0})
+
+        self.population = len(ips)
+        self._stratum_of = {
+            ip: h for h, stratum in enumerate(self.strata) for ip in stratum['members']
+        }
+
+    @property
+    def sampled(self):
+        """추출된 IP 수"""
+        return sum(stratum['next'] for stratum in self.strata)
+
+    def next_batch(self):
+        """
+        다음 배치 (남은 IP 수에 비례하여 층별 배분, 남은 IP가 있는 층은 최소 1개)
+
+        Returns:
+            list: IP 리스트 (모두 추출했으면 빈 리스트)
+        """
+        remaining = [len(s['members']) - s['next'] for s in self.strata]
+        total_remaining = sum(remaining)
+        if not total_remaining:
+            return []
+
+        budget = min(self.batch_size, total_remaining)
+        batch = []
+        for stratum, left in zip(self.strata, remaining):
+            if not left:
+                continue
+            take = min(left, max(1, round(budget * left / total_remaining)))
+            batch.extend(stratum['members'][stratum['next']:stratum['next'] + take])
+            stratum['next'] += take
+        return batch
+
+    def observe(self, ip, harmful):
+        """IP의 유해 접속 여부 관측 기록 (결과가 없는 IP는 호출하지 않음)"""
+        stratum = self.strata[self._stratum_of[ip]]
+        stratum['observed'] += 1
+        stratum['harmful'] += int(bool(harmful))
+
+    def estimate(self):
+        """
+        층화 유해 접속 비율 추정
+
+        Returns:
+            dict: rate, low, high, half_width, observed, n_eff
+        """
+        rate = 0.0
+        variance = 0.0
+        weight_total = 0.0
+        observed = 0
+        for stratum in self.strata:
+            n = stratum['observed']
+            if not n:
+                continue
+            size = len(stratum['members'])
+            weight = size / self.population
+            p = stratum['harmful'] / n
+            rate += weight * p
+            weight_total += weight
+            observed += n
+            if n > 1:
+                fpc = 1 - stratum['next'] / size
+                variance += weight * weight * p * (1 - p) / (n - 1) * fpc
+
+        if not observed:
+            return {'rate': None, 'low': 0.0, 'high': 1.0, 'half_width': 0.5, 'observed': 0, 'n_eff': 0}
+
+        # 관측된 층만으로 정규화 (아직 관측이 없는 층은 추정에서 제외)
+        rate /= weight_total
+        variance /= weight_total * weight_total
+
+        if variance > 0:
+            n_eff = rate * (1 - rate) / variance
+        elif self.sampled >= self.population:
+            n_eff = math.inf
+        else:
+            n_eff = observed
+
+        if math.isinf(n_eff):
+            low = high = rate
+        else:
+            z2 = self.z * self.z
+            denom = 1 + z2 / n_eff
+            center = (rate + z2 / (2 * n_eff)) / denom
+            spread = self.z * math.sqrt(rate * (1 - rate) / n_eff + z2 / (4 * n_eff * n_eff)) / denom
+            low, high = max(0.0, center - spread), min(1.0, center + spread)
+
+        return {
+            'rate': round(rate, 4),
+            'low': round(low, 4),
+            'high': round(high, 4),
+            'half_width': round((high - low) / 2, 4),
+            'observed': observed,
+            'n_eff': round(n_eff, 1) if not math.isinf(n_eff) else None,
+        }
+
+    def is_converged(self, target_half_width, min_ips):
+        """신뢰구간 절반 폭이 목표 이하이고 최소 IP 수 이상 추출했는지"""
+        if self.sampled >= self.population:
+            return True
+        if self.sampled < min_ips:
+            return False
+        return self.estimate()['half_width'] <= target_half_width
+
+    def weights(self):
+        """
+        IP별 표본 가중치 (층 크기 / 층 추출 수)
+
+        Returns:
+            dict: {ip: weight}
+        """
+        weights = {}
+        for stratum in self.strata:
+            taken = stratum['next']
+            if not taken:
+                continue
+            weight = round(len(stratum['members']) / taken, 4)
+            for ip in stratum['members'][:taken]:
+                weights[ip] = weight
+        return weights
@@ -0,0 +1,148 @@
+"""
+여러 날짜 분석(backfill) 실행 파일
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from config.settings import ANALYSIS_CONFIG, HIMS_CONFIG, RESILIENCE_CONFIG
+from src.data.hims_lookup import HIMSLookupService
+from src.data.resilience import ES_METHODS, HIMS_METHODS, ResilientClient
+from src.data.shared import ConcurrencyLimitedClient, SharedStateManager
+from src.url_analysis_runner import URLAnalysisRunner
+
+
+# 작업 프로세스별 상태 (프로세스 안에서 여러 날짜가 클라이언트/조회 서비스를 재사용)
+_worker_state = {}
+
+
+def _init_worker(shared_cache, es_semaphore):
+    """작업 프로세스 초기화 (공유 캐시/세마포어 연결)"""
+    _worker_state['shared_cache'] = shared_cache
+    _worker_state['es_semaphore'] = es_semaphore
+
+
+def _get_worker_clients():
+    """프로세스당 한 번만 클라이언트와 HIMS 조회 서비스 생성"""
+    if 'es_client' not in _worker_state:
+        from src.data.es_client import ESDataClient
+        from src.data.hims_client import HIMSClient
+
+        # 세마포어 대기 시간이 지연 시간/타임아웃에 포함되지 않도록 제한 래퍼 안쪽에서 래핑
+        # (헤지/재시도 요청은 원래 요청이 잡은 세마포어 슬롯 안에서 실행)
+        hims_client = ResilientClient.wrap(HIMSClient(), 'hims', HIMS_METHODS, RESILIENCE_CONFIG)
+        _worker_state['es_client'] = ConcurrencyLimitedClient(
+            ResilientClient.wrap(ESDataClient(), 'es', ES_METHODS, RESILIENCE_CONFIG),
+            _worker_state['es_semaphore']
+        )
+        _worker_state['hims_client'] = hims_client
+        _worker_state['hims_lookup'] = HIMSLookupService(
+            hims_client, HIMS_CONFIG['batch_size'], HIMS_CONFIG['max_workers'],
+            shared_cache=_worker_state['shared_cache']
+        )
+    return _worker_state['es_client'], _worker_state['hims_client'], _worker_state['hims_lookup']
+
+
+def _run_date(output_dir, date_str, urls, resume, budget_minutes):
+    """
+    단일 날짜 분석 (작업 프로세스에서 실행)
+
+    Returns:
+        dict: 날짜별 실행 요약
+    """
+    start = time.perf_counter()
+    es_client, hims_client, hims_lookup = _get_worker_clients()
+    runner = URLAnalysisRunner(output_dir, date_str, es_client, hims_client, hims_lookup)
+    # 날짜별 프로세스가 이미 코어를 나눠 쓰므로 쌍 분석용 작업 프로세스는 만들지 않음
+    runner.cpu_workers = 0
+    try:
+        results = runner.run_analysis(urls, resume=resume, budget_minutes=budget_minutes)
+    finally:
+        runner.close()
+
+    return {
+        'date': date_str,
+        'records': len(results),
+        'elapsed_sec': round(time.perf_counter() - start, 2),
+        'pid': os.getpid(),
+    }
+
+
+def date_range(start_date, end_date):
+    """시작~종료 날짜 리스트 (YYYY-MM-DD, 양끝 포함)"""
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((end - start).days + 1)]
+
+
+class BackfillRunner:
+    """
+    날짜 범위 분석 실행기
+
+    - 날짜별 분석을 프로세스 풀에서 동시에 실행 (결과/체크포인트는 단일 날짜 실행과 동일)
+    - 호스트 카테고리 캐시는 manager 프로세스에 두고 모든 작업 프로세스가 공유
+    - ES 요청은 공유 세마포어로 전체 동시 요청 수를 제한
+    - 작업 프로세스는 여러 날짜를 처리하는 동안 같은 클라이언트(연결 풀)를 재사용
+    """
+
+    def __init__(self, output_dir=None, max_processes=None, es_max_concurrency=None):
+        """
+        Args:
+            output_dir: 출력 디렉토리
+            max_processes: 동시에 분석할 날짜 수
+            es_max_concurrency: 전체 작업 프로세스의 ES 동시 요청 수 상한
+        """
+        self.output_dir = output_dir or ANALYSIS_CONFIG['default_output_dir']
+        self.max_processes = max_processes or ANALYSIS_CONFIG['backfill_processes']
+        self.es_max_concurrency = es_max_concurrency or ANALYSIS_CONFIG['es_max_concurrency']
+
+    def run(self, dates, urls, resume=True, budget_minutes=None, log=print):
+        """
+        날짜 범위 분석 실행
+
+        Args:
+            dates: 분석할 날짜 리스트
+            urls: 분석할 URL 리스트
+            resume: 날짜별 이전 진행상황에서 재시작할지 여부
+            budget_minutes: 날짜별 실행 시간 예산(분)
+            log: 진행 로그 함수
+
+        Returns:
+            list: 날짜별 실행 요약 (실패한 날짜는 'error' 포함)
+        """
+        summaries = []
+        start = time.perf_counter()
+
+        with SharedStateManager() as manager:
+            shared_cache = manager.CategoryCache()
+            es_semaphore = manager.BoundedSemaphore(self.es_max_concurrency)
+
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_processes, len(dates)) or 1,
+                initializer=_init_worker,
+                initargs=(shared_cache, es_semaphore),
+            ) as executor:
+                futures = {
+                    executor.submit(_run_date, self.output_dir, date_str, urls, resume, budget_minutes): date_str
+                    for date_str in dates
+                }
+                for future in as_completed(futures):
+                    date_str = futures[future]
+                    try:
+                        summary = future.result()
+                        log(f"✓ {date_str}: {summary['records']}건, {summary['elapsed_sec']}s (pid {summary['pid']})")
+                    except Exception as e:
+                        summary = {'date': date_str, 'error': str(e)}
+                        log(f"✗ {date_str}: {e}")
+                    summaries.append(summary)
+
+            log(f"Backfill 완료: {len(dates)}일, {time.perf_counter() - start:.1f}s, "
+                f"공유 카테고리 캐시 {shared_cache.size()}개")
+
+        return sorted(summaries, key=lambda summary: summary['date'])
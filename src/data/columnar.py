@@ -0,0 +1,215 @@
+"""
+ES 응답 페이지 컬럼 단위 디코딩 모듈
+
+행(hit)마다 dict를 만든 뒤 DataFrame으로 변환하는 대신, 응답 페이지를 필드별 컬럼
+버퍼에 모은 뒤 NumPy 배열로 한 번에 변환
+
+- ES SQL columnar 응답 ({"columns": [...], "values": [[컬럼1 값...], ...], "cursor": ...})은
+  파싱 결과가 이미 컬럼 리스트이므로 행 객체가 전혀 만들어지지 않음 (권장 경로)
+- 일반 검색 응답 (hits.hits[]._source)도 지원하며, 필드별 컬럼 리스트만 추출
+- orjson이 설치되어 있으면 사용, 없으면 표준 json 모듈 사용
+"""
+
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from .schema import CATEGORICAL_FIELDS, INGEST_FIELDS, MIN_ROW_BYTES, FrameBudgetExceeded
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+    _loads = json.loads
+
+
+# pandas 2는 첫 값의 형식으로 나머지를 파싱하므로 ISO 8601 변형(소수 초 유무, 오프셋)을 함께 허용
+_ISO_FORMAT = {'format': 'ISO8601'} if int(pd.__version__.split('.')[0]) >= 2 else {}
+
+
+def _parse_timestamps(values):
+    """
+    @timestamp 값 배열을 UTC datetime64로 변환
+
+    값마다 숫자(또는 숫자 문자열)면 epoch millis, 아니면 날짜 문자열로 파싱 (변환할 수 없는 값은 NaT)
+    """
+    numeric = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+    timestamps = pd.to_datetime(numeric, unit='ms', utc=True)
+    text = numeric.isna() & pd.notna(values)
+    if text.any():
+        timestamps[text] = pd.to_datetime(values[text.to_numpy()].astype(str), errors='coerce', utc=True, **_ISO_FORMAT)
+    return timestamps.array
+
+
+class ColumnarHitDecoder:
+    """ES 응답 페이지를 필드별 컬럼 버퍼로 누적하는 디코더"""
+
+    def __init__(self, fields=None):
+        """
+        Args:
+            fields: 추출할 필드 (기본 INGEST_FIELDS)
+        """
+        self.fields = list(fields or INGEST_FIELDS)
+        self.rows = 0
+        self.pages = 0
+        self._chunks = {field: [] for field in self.fields}
+        self._sql_columns = None
+
+    def add_page(self, page):
+        """
+        응답 페이지 추가
+
+        Args:
+            page: 응답 본문 (bytes/str 또는 이미 파싱된 dict)
+
+        Returns:
+            dict: 파싱된 응답 본문 (cursor, search_after 등 페이지 이동 정보 확인용)
+        """
+        body = _loads(page) if isinstance(page, (bytes, bytearray, memoryview, str)) else page
+        self.pages += 1
+
+        if 'values' in body or 'columns' in body:
+            # ES SQL columnar: 첫 페이지에만 columns, 이후 cursor 페이지는 values만 포함
+            if 'columns' in body:
+                self._sql_columns = [column['name'] for column in body['columns']]
+            values = body.get('values') or []
+            for name, column in zip(self._sql_columns or [], values):
+                if name in self._chunks:
+                    self._chunks[name].append(column)
+            self.rows += len(values[0]) if values else 0
+            return body
+
+        hits = body.get('hits', {}).get('hits', [])
+        sources = [hit['_source'] for hit in hits]
+        for field in self.fields:
+            self._chunks[field].append([source.get(field) for source in sources])
+        self.rows += len(sources)
+        return body
+
+    def _column(self, field, dtype=object):
+        """누적된 컬럼 조각을 하나의 NumPy 배열로 결합"""
+        chunks = self._chunks[field]
+        if not chunks:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate([np.asarray(chunk, dtype=dtype) for chunk in chunks])
+
+    def to_frame(self):
+        """
+        컬럼 버퍼로 DataFrame 생성 (IngestSchema와 같은 dtype)
+
+        - @timestamp: UTC datetime64 (_parse_timestamps)
+        - sHost, sSrcIP: categorical
+        """
+        data = {}
+        for field in self.fields:
+            if field == '@timestamp':
+                data[field] = _parse_timestamps(self._column(field))
+            elif field in CATEGORICAL_FIELDS:
+                data[field] = pd.Categorical(self._column(field))
+            else:
+                data[field] = self._column(field)
+
+        if not self.rows:
+            return pd.DataFrame(columns=self.fields)
+        # columns= 인자를 주면 DatetimeIndex가 object 배열로 변환되므로 dict 순서를 그대로 사용
+        return pd.DataFrame(data)
+
+
+def decode_pages(pages, fields=None, max_rows=None):
+    """
+    응답 페이지 iterable을 DataFrame으로 디코딩
+
+    Args:
+        pages: 응답 본문 iterable (ES 클라이언트의 iter_raw_pages 결과)
+        fields: 추출할 필드
+        max_rows: 최대 행 수 (IngestSchema.max_rows), 넘으면 남은 페이지를 조회하지 않음
+
+    Returns:
+        pandas.DataFrame
+
+    Raises:
+        FrameBudgetExceeded: 누적 행 수가 max_rows를 넘은 경우 (페이지 제너레이터는 닫아 스크롤 정리)
+    """
+    decoder = ColumnarHitDecoder(fields)
+    for page in pages:
+        decoder.add_page(page)
+        if max_rows is not None and decoder.rows > max_rows:
+            if hasattr(pages, 'close'):
+                pages.close()
+            raise FrameBudgetExceeded(decoder.rows, round(decoder.rows * MIN_ROW_BYTES / (1024 * 1024), 3))
+    return decoder.to_frame()
+
+
+def _sample_pages(rows, page_size, hosts=200, ips=1, seed=0):
+    """벤치마크용 검색/SQL 응답 페이지 생성"""
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp('2025-01-01T00:00:00Z')
+    offsets = np.sort(rng.integers(0, 86400, rows))
+    timestamps = [(base + pd.Timedelta(seconds=int(s))).strftime('%Y-%m-%dT%H:%M:%S.000Z') for s in offsets]
+    host_names = [f"host{i}.example.com" for i in rng.integers(0, hosts, rows)]
+    ip_names = [f"10.0.0.{i}" for i in rng.integers(0, ips, rows)]
+
+    search_pages = []
+    sql_pages = []
+    for start in range(0, rows, page_size):
+        end = min(start + page_size, rows)
+        search_pages.append(json.dumps({'hits': {'hits': [
+            {'_index': 'logs', '_id': str(i), '_source': {
+                '@timestamp': timestamps[i], 'sHost': host_names[i], 'sSrcIP': ip_names[i],
+            }} for i in range(start, end)
+        ]}}).encode('utf-8'))
+        page = {'values': [timestamps[start:end], host_names[start:end], ip_names[start:end]]}
+        if start == 0:
+            page['columns'] = [{'name': field, 'type': 'keyword'} for field in INGEST_FIELDS]
+        sql_pages.append(json.dumps(page).encode('utf-8'))
+    return search_pages, sql_pages
+
+
+def benchmark(rows=200000, page_size=10000, repeat=3):
+    """
+    기존 경로(hit dict → DataFrame → IngestSchema)와 컬럼 디코딩 경로 비교
+
+    Returns:
+        dict: 경로별 최소 소요 시간(초)
+    """
+    from .schema import IngestSchema
+
+    search_pages, sql_pages = _sample_pages(rows, page_size)
+    schema = IngestSchema()
+
+    def row_path():
+        hits = []
+        for page in search_pages:
+            hits.extend(hit['_source'] for hit in json.loads(page)['hits']['hits'])
+        return schema.apply(pd.DataFrame(hits))
+
+    def timed(fn):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    row_sec, expected = timed(row_path)
+    search_sec, search_df = timed(lambda: schema.apply(decode_pages(search_pages)))
+    sql_sec, sql_df = timed(lambda: schema.apply(decode_pages(sql_pages)))
+
+    pd.testing.assert_frame_equal(expected, search_df)
+    pd.testing.assert_frame_equal(expected, sql_df)
+
+    return {
+        'rows': rows,
+        'parser': 'orjson' if orjson is not None else 'json',
+        'row_dicts_sec': round(row_sec, 3),
+        'columnar_search_sec': round(search_sec, 3),
+        'columnar_sql_sec': round(sql_sec, 3),
+    }
+
+
+if __name__ == '__main__':
+    print(benchmark())
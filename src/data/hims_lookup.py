@@ -0,0 +1,173 @@
+"""
+HIMS 카테고리 조회 서비스 모듈 (배치 분할, 동시 조회, 중복 요청 병합, 실행 단위 캐시)
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class HIMSLookupService:
+    """HIMSClient 앞단의 벌크 조회 서비스"""
+
+    def __init__(self, hims_client, batch_size=500, max_workers=4, shared_cache=None):
+        """
+        Args:
+            hims_client: get_category_map(hosts)를 제공하는 HIMS 클라이언트
+            batch_size: 배치당 최대 호스트 수
+            max_workers: 동시에 실행할 배치 수
+            shared_cache: 프로세스 간 공유 캐시 (CategoryCache 프록시), 배치 조회 전에 먼저 확인
+        """
+        self.hims_client = hims_client
+        self.shared_cache = shared_cache
+        self.batch_size = max(1, batch_size)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hims-lookup')
+
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._in_flight = {}
+        self._stats = {
+            'requested_hosts': 0,
+            'cache_hits': 0,
+            'prefetched_hosts': 0,
+            'dedup_merged': 0,
+            'fetched_hosts': 0,
+            'shared_hits': 0,
+            'batches': 0,
+            'failed_batches': 0,
+            'batch_latency_total_ms': 0.0,
+            'batch_latency_max_ms': 0.0,
+        }
+
+    def get_category_map(self, hosts):
+        """
+        호스트별 카테고리 매핑 조회 (HIMSClient.get_category_map과 동일한 인터페이스)
+
+        Args:
+            hosts: 조회할 호스트 리스트
+
+        Returns:
+            dict: {host: category}
+        """
+        result, waiting = self._lookup(hosts)
+        for host, future in waiting.items():
+            result[host] = future.result()
+        return result
+
+    def prefetch(self, hosts):
+        """
+        캐시 워밍 (결과를 기다리지 않고 백그라운드 조회만 시작)
+
+        적중률 통계에는 포함하지 않으므로 hit_rate는 분석 단계 조회 기준으로 유지됨
+        """
+        self._lookup(hosts, prefetch=True)
+
+    def _lookup(self, hosts, prefetch=False):
+        """캐시/진행 중 요청을 확인하고 나머지는 배치로 조회 시작"""
+        result = {}
+        waiting = {}
+        to_fetch = []
+
+        with self._lock:
+            for host in dict.fromkeys(hosts):
+                if host in self._cache:
+                    result[host] = self._cache[host]
+                    if not prefetch:
+                        self._stats['requested_hosts'] += 1
+                        self._stats['cache_hits'] += 1
+                elif host in self._in_flight:
+                    # 다른 작업자가 조회 중인 호스트는 같은 요청을 기다림
+                    waiting[host] = self._in_flight[host]
+                    if not prefetch:
+                        self._stats['requested_hosts'] += 1
+                        self._stats['dedup_merged'] += 1
+                else:
+                    future = Future()
+                    self._in_flight[host] = future
+                    waiting[host] = future
+                    to_fetch.append(host)
+                    self._stats['prefetched_hosts' if prefetch else 'requested_hosts'] += 1
+
+        batches = self._split_batches(to_fetch)
+        for i, batch in enumerate(batches):
+            try:
+                self.executor.submit(self._fetch_batch, batch)
+            except Exception as e:
+                # 실행기가 종료된 경우 등: 보내지 못한 배치의 대기 요청이 영원히 남지 않도록 실패 전달
+                for unsent in batches[i:]:
+                    self._fail_batch(unsent, e)
+                break
+
+        return result, waiting
+
+    def _fail_batch(self, batch, error):
+        """배치의 진행 중 요청을 제거하고 대기 중인 요청에 예외 전달"""
+        with self._lock:
+            futures = [self._in_flight.pop(host) for host in batch]
+            self._stats['failed_batches'] += 1
+        for future in futures:
+            future.set_exception(error)
+
+    def _split_batches(self, hosts):
+        """batch_size 이하의 균등한 크기 배치로 분할"""
+        if not hosts:
+            return []
+
+        batch_count = math.ceil(len(hosts) / self.batch_size)
+        size = math.ceil(len(hosts) / batch_count)
+        return [hosts[i:i + size] for i in range(0, len(hosts), size)]
+
+    def _fetch_batch(self, batch):
+        """단일 배치 조회 후 대기 중인 요청에 결과 전달"""
+        start = time.perf_counter()
+        try:
+            shared = self.shared_cache.get_many(batch) if self.shared_cache is not None else {}
+            missing = [host for host in batch if host not in shared]
+            cat_map = dict(shared)
+            if missing:
+                fetched = self.hims_client.get_category_map(missing)
+                cat_map.update(fetched)
+                if self.shared_cache is not None:
+                    self.shared_cache.update({host: fetched.get(host) for host in missing})
+        except Exception as e:
+            self._fail_batch(batch, e)
+            return
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        resolved = []
+        with self._lock:
+            for host in batch:
+                category = cat_map.get(host)
+                self._cache[host] = category
+                resolved.append((self._in_flight.pop(host), category))
+
+            self._stats['fetched_hosts'] += len(missing)
+            self._stats['shared_hits'] += len(shared)
+            self._stats['batches'] += 1
+            self._stats['batch_latency_total_ms'] += elapsed_ms
+            self._stats['batch_latency_max_ms'] = max(self._stats['batch_latency_max_ms'], elapsed_ms)
+
+        for future, category in resolved:
+            future.set_result(category)
+
+    def get_stats(self):
+        """조회 통계 (적중률, 배치 지연, 중복 병합 절감량)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cache_size'] = len(self._cache)
+            stats['in_flight'] = len(self._in_flight)
+
+        requested = stats['requested_hosts']
+        batches = stats['batches']
+        stats['hit_rate'] = round(stats['cache_hits'] / requested, 4) if requested else 0.0
+        stats['dedup_rate'] = round(stats['dedup_merged'] / requested, 4) if requested else 0.0
+        stats['batch_latency_avg_ms'] = round(stats['batch_latency_total_ms'] / batches, 2) if batches else 0.0
+        stats['batch_latency_total_ms'] = round(stats['batch_latency_total_ms'], 2)
+        stats['batch_latency_max_ms'] = round(stats['batch_latency_max_ms'], 2)
+        return stats
+
+    def clear(self):
+        """실행 단위 캐시 초기화"""
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,435 @@
+"""
+ES/HIMS 요청 지연 꼬리(tail latency) 제어 모듈
+
+- 적응형 타임아웃: 메서드별 최근 지연 시간의 상위 백분위수 × 배수 (최소/최대 범위 제한)
+- 헤지 요청: 지연 상위 백분위수를 넘긴 요청은 같은 요청을 한 번 더 보내 먼저 끝난 결과 사용
+- 재시도: 지수 백오프 + full jitter, 전체 요청 수에 비례하는 재시도 예산 안에서만 재시도
+- 서킷 브레이커: 연속 실패 시 일정 시간 백엔드 요청을 즉시 실패 처리한 뒤 한 번 시험 요청
+
+IP 전체를 스크롤하는 메서드는 지연 시간이 IP의 문서 수에 비례하므로 (문서 수가 많아 먼저
+처리되는 IP일수록 느림) 적응형 타임아웃/헤지를 적용하지 않고 호출 스레드에서 실행하며,
+오류만 재시도. 페이지 제너레이터도 스크롤이므로 같은 방식으로 첫 페이지 조회만 재시도하고
+나머지 페이지는 그대로 스트리밍 (포기한 첫 페이지 요청이 스크롤 컨텍스트를 남기지 않음)
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# 래핑할 클라이언트 메서드 (모두 읽기 전용 요청이므로 헤지/재시도 가능)
+ES_METHODS = (
+    'get_aggregated_ips', 'get_raw_data', 'iter_raw_pages', 'get_aggregated_ips_between', 'get_raw_data_between'
+)
+HIMS_METHODS = ('get_category_map',)
+
+# 페이지를 순차로 반환하는 제너레이터 메서드 (첫 페이지 조회만 제어)
+GENERATOR_METHODS = ('iter_raw_pages',)
+
+# IP 전체를 스크롤하는 메서드 (지연 시간이 문서 수에 비례, 타임아웃/헤지 없이 오류만 재시도)
+SCROLL_METHODS = ('get_raw_data', 'get_raw_data_between', 'iter_raw_pages')
+
+# 빈 제너레이터 표시
+_NO_PAGE = object()
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 요청을 보내지 않음"""
+
+
+class StalledBackendError(CircuitOpenError):
+    """
+    타임아웃으로 포기했지만 아직 실행 중인 요청이 상한에 도달해 새 요청을 보내지 않음
+
+    요청을 보내지 않았으므로 서킷이 열린 경우와 같이 쌍 실패 횟수에 포함하지 않음
+    """
+
+
+def find_resilient(client):
+    """클라이언트 래퍼 체인(_client)에서 ResilientClient 찾기 (없으면 None)"""
+    while client is not None:
+        if isinstance(client, ResilientClient):
+            return client
+        client = client.__dict__.get('_client') if hasattr(client, '__dict__') else None
+    return None
+
+
+class LatencyTracker:
+    """최근 요청 지연 시간 백분위수 계산 (스레드 안전)"""
+
+    def __init__(self, window=500, min_samples=20):
+        """
+        Args:
+            window: 보관할 최근 지연 시간 수
+            min_samples: 백분위수를 계산하기 위한 최소 표본 수
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        """지연 시간 관측 추가"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q):
+        """
+        q 백분위수 지연 시간(초)
+
+        Returns:
+            float: 표본이 min_samples 미만이면 None
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class CircuitBreaker:
+    """
+    서킷 브레이커
+
+    closed → (연속 실패 failure_threshold회) → open → (reset_timeout_sec 경과) → half_open
+    half_open에서는 시험 요청 하나만 허용하고, 성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout_sec=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_sec = reset_timeout_sec
+        self.state = self.CLOSED
+        self.opened_count = 0
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """요청을 보내도 되는지 여부"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout_sec:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        """요청 성공"""
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release(self):
+        """허용받았지만 요청을 보내지 않음 (half_open 시험 요청 슬롯 반환, 실패로 세지 않음)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """요청 실패"""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened_count += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+
+class RetryBudget:
+    """
+    재시도 예산 (토큰 버킷)
+
+    요청마다 ratio개 토큰이 쌓이고 재시도마다 1개를 사용하므로, 장애 시에도 재시도는
+    전체 요청의 ratio 비율(+ 초기 여유분) 이하로 제한됨
+    """
+
+    def __init__(self, ratio=0.1, max_tokens=10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """요청 1건 발생"""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """재시도 1회 허용 여부 (허용하면 토큰 사용)"""
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class ResilientClient:
+    """
+    데이터 클라이언트 래퍼 (적응형 타임아웃, 헤지 요청, 재시도 예산, 서킷 브레이커)
+
+    지정한 메서드만 제어하고 나머지 속성은 그대로 위임. 동기 클라이언트 호출은 취소할 수
+    없으므로 타임아웃/헤지로 포기한 요청은 작업 스레드에서 끝날 때까지 실행되며, 끝나면
+    지연 시간 관측에 반영됨. 포기했지만 아직 실행 중인 요청이 max_abandoned개에 이르면
+    (백엔드 정지) 헤지하지 않고 새 요청은 StalledBackendError로 즉시 실패 처리
+    """
+
+    def __init__(self, client, name, methods, timeout_percentile=99, timeout_multiplier=2.0,
+                 min_timeout_sec=1.0, max_timeout_sec=30.0, hedge=True, hedge_percentile=95,
+                 min_samples=20, max_retries=2, retry_base_delay_sec=0.2, retry_max_delay_sec=5.0,
+                 retry_budget_ratio=0.1, breaker_failure_threshold=5, breaker_reset_sec=30.0,
+                 max_threads=16, max_abandoned=None):
+        """
+        Args:
+            client: 원래 클라이언트
+            name: 백엔드 이름 (통계/오류 메시지용)
+            methods: 제어할 메서드 이름
+            timeout_percentile: 타임아웃 기준 지연 백분위수
+            timeout_multiplier: 타임아웃 = 백분위수 지연 × 배수
+            min_timeout_sec, max_timeout_sec: 타임아웃 범위 (표본이 부족하면 max_timeout_sec)
+            hedge: 헤지 요청 사용 여부
+            hedge_percentile: 이 백분위수 지연을 넘긴 요청을 헤지
+            min_samples: 백분위수 계산 최소 표본 수
+            max_retries: 요청당 최대 재시도 수
+            retry_base_delay_sec, retry_max_delay_sec: 백오프 기본/최대 대기(초)
+            retry_budget_ratio: 요청당 적립되는 재시도 토큰
+            breaker_failure_threshold: 서킷을 여는 연속 실패 수
+            breaker_reset_sec: 서킷을 연 뒤 시험 요청까지 대기(초)
+            max_threads: 요청 실행 스레드 수
+            max_abandoned: 포기했지만 실행 중인 요청 상한 (None이면 max_threads의 절반)
+        """
+        self._client = client
+        self.name = name
+        self.methods = tuple(methods)
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout_sec = min_timeout_sec
+        self.max_timeout_sec = max_timeout_sec
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.max_retries = max_retries
+        self.retry_base_delay_sec = retry_base_delay_sec
+        self.retry_max_delay_sec = retry_max_delay_sec
+
+        self.max_abandoned = max(1, max_threads // 2) if max_abandoned is None else max_abandoned
+
+        # 메서드별 지연 시간 (조회 종류마다 지연 분포가 다름)
+        self.latency = {method: LatencyTracker(min_samples=min_samples) for method in self.methods}
+        self.breaker = CircuitBreaker(breaker_failure_threshold, breaker_reset_sec)
+        self.retry_budget = RetryBudget(retry_budget_ratio)
+        self.executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix=f"{name}-request")
+
+        self._lock = threading.Lock()
+        self._abandoned = 0
+        self._stats = {
+            'calls': 0,
+            'successes': 0,
+            'failures': 0,
+            'timeouts': 0,
+            'retries': 0,
+            'retries_denied': 0,
+            'hedges': 0,
+            'hedge_wins': 0,
+            'short_circuited': 0,
+            'stalled': 0,
+        }
+
+    @classmethod
+    def wrap(cls, client, name, methods, config):
+        """
+        설정(RESILIENCE_CONFIG)에 따라 클라이언트 래핑
+
+        이미 래핑된 클라이언트(다른 래퍼 안쪽 포함)나 비활성화 설정이면 그대로 반환
+        """
+        if client is None or find_resilient(client) is not None or not config.get('enabled', True):
+            return client
+        options = {key: value for key, value in config.items() if key not in ('enabled', 'max_pair_failures')}
+        return cls(client, name, methods, **options)
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in self.methods:
+            return attr
+
+        if name in GENERATOR_METHODS:
+            def call_pages(*args, **kwargs):
+                def first_page():
+                    pages = iter(attr(*args, **kwargs))
+                    return pages, next(pages, _NO_PAGE)
+
+                # 첫 페이지 전에는 다시 시작해도 되므로 첫 페이지 조회만 재시도 (호출 스레드에서 실행)
+                pages, page = self.call(name, first_page)
+                if page is not _NO_PAGE:
+                    yield page
+                    yield from pages
+            return call_pages
+
+        def call(*args, **kwargs):
+            return self.call(name, lambda: attr(*args, **kwargs))
+        return call
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self._stats[key] += value
+
+    def timeout(self, method):
+        """메서드의 현재 적응형 타임아웃(초)"""
+        latency = self.latency[method].percentile(self.timeout_percentile)
+        if latency is None:
+            return self.max_timeout_sec
+        return min(self.max_timeout_sec, max(self.min_timeout_sec, latency * self.timeout_multiplier))
+
+    def hedge_delay(self, method):
+        """메서드의 헤지 요청을 보내기 전 대기(초), 헤지하지 않으면 None"""
+        if not self.hedge:
+            return None
+        return self.latency[method].percentile(self.hedge_percentile)
+
+    def call(self, method, fn):
+        """
+        요청 실행 (서킷 확인 → 헤지/타임아웃 → 예산 안에서 재시도)
+
+        스크롤 메서드(SCROLL_METHODS)는 타임아웃/헤지 없이 호출 스레드에서 실행
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있음
+            TimeoutError: 적응형 타임아웃 초과 (재시도 후에도)
+        """
+        self._count('calls')
+        self.retry_budget.deposit()
+        attempt = 0
+
+        while True:
+            if not self.breaker.allow():
+                self._count('short_circuited')
+                raise CircuitOpenError(f"{self.name} circuit open")
+
+            try:
+                if method in SCROLL_METHODS:
+                    result = self._timed(method, fn)
+                else:
+                    result = self._attempt(method, fn)
+            except CircuitOpenError:
+                # 요청을 보내지 않았거나(백엔드 정지) 안쪽 서킷이 열린 경우는 백엔드 실패로 세지 않음
+                self.breaker.release()
+                self._count('failures')
+                raise
+            except Exception:
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+                if not self.retry_budget.withdraw():
+                    self._count('retries_denied')
+                    self._count('failures')
+                    raise
+                attempt += 1
+                self._count('retries')
+                # full jitter 지수 백오프
+                ceiling = min(self.retry_max_delay_sec, self.retry_base_delay_sec * 2 ** attempt)
+                time.sleep(random.uniform(0, ceiling))
+                continue
+
+            self.breaker.record_success()
+            self._count('successes')
+            return result
+
+    def _timed(self, method, fn):
+        """요청 실행 후 성공한 요청의 지연 시간 기록"""
+        start = time.monotonic()
+        result = fn()
+        self.latency[method].add(time.monotonic() - start)
+        return result
+
+    def _abandon(self, future):
+        """포기한 요청 기록 (끝나면 상한 계산에서 제외)"""
+        if future.cancel():
+            return
+        with self._lock:
+            self._abandoned += 1
+        future.add_done_callback(self._release_abandoned)
+
+    def _release_abandoned(self, _):
+        with self._lock:
+            self._abandoned -= 1
+
+    def _is_stalled(self):
+        """포기한 요청이 상한에 도달했는지 여부"""
+        with self._lock:
+            return self._abandoned >= self.max_abandoned
+
+    def _attempt(self, method, fn):
+        """요청 1회 시도 (느리면 헤지 요청 추가, 타임아웃 안에 먼저 성공한 결과 반환)"""
+        if self._is_stalled():
+            self._count('stalled')
+            raise StalledBackendError(
+                f"{self.name} has {self.max_abandoned} abandoned requests still running"
+            )
+
+        timeout = self.timeout(method)
+        start = time.monotonic()
+        primary = self.executor.submit(self._timed, method, fn)
+        pending = {primary}
+
+        hedge_delay = self.hedge_delay(method)
+        if hedge_delay is not None and hedge_delay < timeout:
+            done, _ = wait(pending, timeout=hedge_delay)
+            if not done and not self._is_stalled():
+                pending.add(self.executor.submit(self._timed, method, fn))
+                self._count('hedges')
+
+        error = None
+        while pending:
+            remaining = timeout - (time.monotonic() - start)
+            done, pending = wait(pending, timeout=max(0.0, remaining), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self._count('hedge_wins')
+                    for other in pending:
+                        self._abandon(other)
+                    return future.result()
+                error = future.exception()
+
+        if not pending and error is not None:
+            raise error
+        for future in pending:
+            self._abandon(future)
+        self._count('timeouts')
+        raise TimeoutError(f"{self.name} request exceeded adaptive timeout {timeout:.2f}s")
+
+    def get_stats(self):
+        """요청 통계 (성공/실패/타임아웃/재시도/헤지, 메서드별 지연 백분위수, 서킷 상태)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['abandoned_running'] = self._abandoned
+
+        stats['methods'] = {}
+        for method, tracker in self.latency.items():
+            if tracker.percentile(50) is None:
+                continue
+            method_stats = {}
+            for q in (50, 95, 99):
+                method_stats[f"p{q}_ms"] = round(tracker.percentile(q) * 1000, 1)
+            if method not in SCROLL_METHODS:
+                hedge_delay = self.hedge_delay(method)
+                method_stats['timeout_sec'] = round(self.timeout(method), 3)
+                method_stats['hedge_delay_sec'] = round(hedge_delay, 3) if hedge_delay is not None else None
+            stats['methods'][method] = method_stats
+        stats['breaker_state'] = self.breaker.state
+        stats['breaker_opened'] = self.breaker.opened_count
+        return stats
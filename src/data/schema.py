@@ -0,0 +1,117 @@
+"""
+수집 데이터 스키마 모듈 (필드 투영, dtype 압축, 프레임 메모리 예산)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# 파이프라인에서 실제로 사용하는 ES 필드
+INGEST_FIELDS = ['@timestamp', 'sHost', 'sSrcIP']
+
+# 문자열 반복이 많은 컬럼은 categorical(정수 코드 + 사전)로 저장
+CATEGORICAL_FIELDS = ['sHost', 'sSrcIP']
+
+# 스키마 적용 후 프레임의 행당 최소 메모리 (datetime64 8바이트 + categorical 코드 2개 최소 1바이트씩)
+MIN_ROW_BYTES = 10
+
+
+class FrameBudgetExceeded(Exception):
+    """디코딩 중 행 수만으로 프레임 메모리 예산 초과가 확실해 조회를 중단함"""
+
+    def __init__(self, rows, min_usage_mb):
+        super().__init__(f"{rows} rows need at least {min_usage_mb} MB")
+        self.rows = rows
+        self.min_usage_mb = min_usage_mb
+
+
+class IngestSchema:
+    """ES 원시 데이터프레임 스키마 적용기"""
+
+    def __init__(self, max_frame_memory_mb=0):
+        """
+        Args:
+            max_frame_memory_mb: 프레임당 메모리 상한(MB), 0이면 제한 없음
+        """
+        self.max_frame_memory_mb = max_frame_memory_mb
+
+    def apply(self, df):
+        """
+        필드 투영 및 dtype 변환
+
+        - 사용하지 않는 ES 필드 제거
+        - @timestamp -> datetime64
+        - sHost, sSrcIP -> categorical
+        """
+        columns = [c for c in INGEST_FIELDS if c in df.columns]
+        df = df[columns].copy()
+
+        if '@timestamp' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['@timestamp']):
+            df['@timestamp'] = pd.to_datetime(df['@timestamp'], errors='coerce')
+
+        for column in CATEGORICAL_FIELDS:
+            if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype('category')
+
+        return df
+
+    def map_hosts(self, hosts, mapping):
+        """
+        호스트 시리즈에 매핑 적용 (categorical이면 고유 카테고리 단위로 1회만 매핑)
+
+        Returns:
+            pandas.Series: 매핑 결과 (없는 호스트는 NaN)
+        """
+        if not isinstance(hosts.dtype, pd.CategoricalDtype):
+            return hosts.map(mapping)
+
+        mapped = pd.Series(hosts.cat.categories, dtype=object).map(mapping).to_numpy(dtype=object)
+        codes = hosts.cat.codes.to_numpy()
+        values = np.where(codes >= 0, mapped[codes], None)
+        return pd.Series(values, index=hosts.index, dtype=object)
+
+    def encode_categories(self, categories):
+        """
+        HIMS 카테고리 코드 압축
+
+        모든 코드가 정수 문자열로 손실 없이 왕복되면 Int16, 아니면 categorical
+        """
+        present = categories.dropna()
+        numeric = pd.to_numeric(present, errors='coerce')
+
+        if (
+            numeric.notna().all()
+            and (numeric % 1 == 0).all()
+            and numeric.between(np.iinfo(np.int16).min, np.iinfo(np.int16).max).all()
+            and (numeric.astype('int64').astype(str) == present.astype(str)).all()
+        ):
+            return pd.to_numeric(categories, errors='coerce').astype('Int16')
+
+        return categories.astype('category')
+
+    def memory_usage_mb(self, df):
+        """프레임 메모리 사용량 (MB)"""
+        return round(df.memory_usage(deep=True).sum() / (1024 * 1024), 3)
+
+    def max_rows(self):
+        """
+        디코딩 중 허용할 최대 행 수 (행당 최소 메모리 기준, 넘으면 예산 초과가 확실함)
+
+        Returns:
+            int: 최대 행 수 (예산이 없으면 None)
+        """
+        if not self.max_frame_memory_mb:
+            return None
+        return int(self.max_frame_memory_mb * 1024 * 1024 // MIN_ROW_BYTES)
+
+    def within_budget(self, df):
+        """
+        메모리 예산 확인
+
+        Returns:
+            tuple: (예산 이내 여부, 사용량 MB)
+        """
+        usage_mb = self.memory_usage_mb(df)
+        if not self.max_frame_memory_mb:
+            return True, usage_mb
+        return usage_mb <= self.max_frame_memory_mb, usage_mb
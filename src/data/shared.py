@@ -0,0 +1,84 @@
+"""
+프로세스 간 공유 상태 모듈 (카테고리 캐시, ES 동시 요청 제한)
+"""
+
+import threading
+from multiprocessing.managers import SyncManager
+
+
+class CategoryCache:
+    """
+    호스트 카테고리 공유 캐시 (manager 서버 프로세스에 위치)
+
+    프록시 호출마다 프로세스 간 통신이 발생하므로 배치 단위로 조회/저장
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, hosts):
+        """캐시에 있는 호스트만 {host: category}로 반환"""
+        with self._lock:
+            return {host: self._data[host] for host in hosts if host in self._data}
+
+    def update(self, mapping):
+        """카테고리 저장"""
+        with self._lock:
+            self._data.update(mapping)
+
+    def size(self):
+        """캐시 크기"""
+        with self._lock:
+            return len(self._data)
+
+
+class SharedStateManager(SyncManager):
+    """CategoryCache를 제공하는 multiprocessing manager"""
+
+
+SharedStateManager.register('CategoryCache', CategoryCache)
+
+
+class ConcurrencyLimitedClient:
+    """
+    ES 클라이언트 래퍼 (프로세스 간 공유 세마포어로 동시 요청 수 제한)
+
+    지정한 메서드만 세마포어 안에서 실행하고 나머지 속성은 그대로 위임
+    """
+
+    LIMITED_METHODS = ('get_aggregated_ips', 'get_raw_data', 'get_aggregated_ips_between', 'get_raw_data_between')
+    # 페이지를 순차로 반환하는 제너레이터 메서드 (반복이 끝날 때까지 세마포어 유지)
+    LIMITED_GENERATORS = ('iter_raw_pages',)
+
+    def __init__(self, client, semaphore):
+        """
+        Args:
+            client: ESDataClient
+            semaphore: 공유 세마포어 (SyncManager.BoundedSemaphore 프록시)
+        """
+        self._client = client
+        self._semaphore = semaphore
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name in self.LIMITED_GENERATORS:
+            def limited_pages(*args, **kwargs):
+                self._semaphore.acquire()
+                try:
+                    yield from attr(*args, **kwargs)
+                finally:
+                    self._semaphore.release()
+
+            return limited_pages
+        if name not in self.LIMITED_METHODS:
+            return attr
+
+        def limited(*args, **kwargs):
+            self._semaphore.acquire()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self._semaphore.release()
+
+        return limited
@@ -0,0 +1,292 @@
+"""
+상주 서비스 실행 파일 (일별 자동 실행 + 수동 트리거 + 당일 증분 갱신, 클라이언트/캐시 유지)
+"""
+
+import glob
+import importlib
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import config.settings as settings
+from src.url_analysis_runner import URLAnalysisRunner
+from src.utils.incremental import incremental_state_file
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 변경 시 설정을 다시 로드할 파일
+WATCHED_FILES = [
+    os.path.join(PROJECT_ROOT, 'config.ini'),
+    os.path.join(PROJECT_ROOT, 'config', 'settings.py'),
+]
+
+
+def reload_settings():
+    """
+    config.settings 다시 로드
+
+    `from config.settings import X`로 가져간 이름도 로드된 src 모듈에서 새 값으로 교체
+
+    Returns:
+        tuple: (이전 settings 값 dict, 새 settings 모듈)
+    """
+    global settings
+    old_values = {name: value for name, value in vars(settings).items() if name.isupper()}
+    settings = importlib.reload(settings)
+
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not module_name.startswith('src.'):
+            continue
+        for name, old_value in old_values.items():
+            if getattr(module, name, None) is old_value and hasattr(settings, name):
+                setattr(module, name, getattr(settings, name))
+
+    return old_values, settings
+
+
+def trigger_dir(output_dir):
+    """수동 실행 요청 파일 디렉토리"""
+    return os.path.join(output_dir, 'triggers')
+
+
+def request_run(output_dir, date_str=None, fresh=False):
+    """
+    서비스에 수동 실행 요청 (트리거 파일 생성)
+
+    Returns:
+        str: 생성한 트리거 파일 경로
+    """
+    os.makedirs(trigger_dir(output_dir), exist_ok=True)
+    trigger_file = os.path.join(trigger_dir(output_dir), f"{time.time_ns()}.json")
+    with open(f"{trigger_file}.tmp", 'w', encoding='utf-8') as f:
+        json.dump({'date': date_str, 'fresh': fresh}, f)
+    os.replace(f"{trigger_file}.tmp", trigger_file)
+    return trigger_file
+
+
+class AnalysisService:
+    """
+    URLAnalysisRunner 상주 서비스
+
+    - 매일 run_at 시각에 run_offset_days일 전(기본 전날) 분석 실행, 트리거 파일/SIGUSR1로 즉시 실행
+    - refresh_minutes > 0이면 당일은 증분 갱신만 사용하고, 증분 상태가 있는 날짜의 실행도 증분 실행으로
+      마무리 (같은 날짜를 전체 실행과 증분 실행이 함께 기록하지 않음)
+    - ES/HIMS 클라이언트(연결 풀)와 HIMS 카테고리 캐시를 실행 간 유지
+    - config.ini 또는 config/settings.py가 바뀌면 다음 실행 전에 설정 다시 로드
+      (TRACK_URL, 카테고리 분류, 분석 설정 반영, 접속 설정이 바뀌면 클라이언트 재생성)
+    """
+
+    def __init__(self, output_dir=None, run_at=None, poll_seconds=None, run_offset_days=None, log=print):
+        """
+        Args:
+            output_dir: 출력 디렉토리
+            run_at: 일별 실행 시각 (HH:MM)
+            poll_seconds: 트리거/설정 변경 확인 주기(초)
+            run_offset_days: 일별 실행의 분석 날짜 (실행일 기준 며칠 전)
+            log: 로그 함수
+        """
+        service_config = settings.SERVICE_CONFIG
+        self.output_dir = output_dir or settings.ANALYSIS_CONFIG['default_output_dir']
+        self.run_at = run_at or service_config['run_at']
+        self.run_offset_days = service_config['run_offset_days'] if run_offset_days is None else run_offset_days
+        self.poll_seconds = poll_seconds or service_config['poll_seconds']
+        self.cache_max_hosts = service_config['cache_max_hosts']
+        self.refresh_minutes = service_config['refresh_minutes']
+        self.log = log
+
+        self._es_client = None
+        self._hims_client = None
+        self._hims_lookup = None
+        self._config_mtimes = self._get_config_mtimes()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._signal_requested = False
+        self.last_run_date = None
+        self.last_refresh_date = None
+        self.runs = []
+
+    def _get_config_mtimes(self):
+        """설정 파일 수정 시각"""
+        return {path: os.path.getmtime(path) for path in WATCHED_FILES if os.path.exists(path)}
+
+    def reload_config_if_changed(self):
+        """설정 파일이 바뀌었으면 다시 로드 (접속 설정이 바뀌면 클라이언트 재생성)"""
+        mtimes = self._get_config_mtimes()
+        if mtimes == self._config_mtimes:
+            return False
+
+        self._config_mtimes = mtimes
+        try:
+            old_values, new_settings = reload_settings()
+        except Exception as e:
+            self.log(f"설정 다시 로드 실패 (이전 설정 유지): {e}")
+            return False
+
+        if (old_values.get('ES_CONFIG') != new_settings.ES_CONFIG
+                or old_values.get('INDEX_PATTERN') != new_settings.INDEX_PATTERN):
+            self._es_client = None
+        if old_values.get('HIMS_CONFIG') != new_settings.HIMS_CONFIG:
+            self._hims_client = None
+            self._hims_lookup = None
+
+        self.log(f"설정 다시 로드: TRACK_URL {len(new_settings.TRACK_URL)}개")
+        return True
+
+    def uses_incremental(self, date_str):
+        """
+        날짜의 실행 방식 (증분 갱신을 사용하는 날짜는 전체 실행 대신 증분 실행)
+
+        당일, 또는 증분 상태 파일이 있는 날짜 (전체 실행은 증분 실행이 닫은 쌍을 다시 기록하므로)
+        """
+        if self.refresh_minutes <= 0:
+            return False
+        return (date_str == datetime.now().strftime('%Y-%m-%d')
+                or os.path.exists(incremental_state_file(os.path.join(self.output_dir, date_str))))
+
+    def run_once(self, date_str=None, fresh=False, incremental=None):
+        """
+        단일 날짜 분석 실행 (유지 중인 클라이언트/캐시 재사용)
+
+        Args:
+            date_str: 분석 날짜 (기본 오늘)
+            fresh: 이전 진행상황을 무시하고 새로 시작
+            incremental: 워터마크 이후 구간만 반영하는 증분 실행, None이면 uses_incremental로 결정
+
+        Returns:
+            dict: 실행 요약
+        """
+        self.reload_config_if_changed()
+        date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+        if incremental is None:
+            incremental = self.uses_incremental(date_str)
+        start = time.perf_counter()
+
+        runner = URLAnalysisRunner(
+            self.output_dir, date_str, self._es_client, self._hims_client, self._hims_lookup
+        )
+        summary = {'date': date_str, 'started_at': datetime.now().isoformat(), 'incremental': incremental}
+        try:
+            if incremental:
+                refresh = runner.run_incremental(settings.TRACK_URL, resume=not fresh)
+                summary['records'] = refresh['results_written']
+                summary['open_pairs'] = refresh['open']
+            else:
+                results = runner.run_analysis(settings.TRACK_URL, resume=not fresh)
+                summary['records'] = len(results)
+        except Exception as e:
+            summary['error'] = str(e)
+            self.log(f"✗ {date_str} 분석 오류: {e}")
+        finally:
+            runner.close()
+
+        # 첫 실행에서 생성된 클라이언트/조회 서비스를 다음 실행에 재사용
+        self._es_client, self._hims_client, self._hims_lookup = runner.get_clients()
+        if self._hims_lookup is not None and self._hims_lookup.get_stats()['cache_size'] > self.cache_max_hosts:
+            self._hims_lookup.clear()
+
+        summary['elapsed_sec'] = round(time.perf_counter() - start, 2)
+        self.runs = (self.runs + [summary])[-100:]
+        self.log(f"✓ {date_str} 분석 완료: {summary.get('records', 0)}건, {summary['elapsed_sec']}s")
+        return summary
+
+    def _pop_triggers(self):
+        """대기 중인 트리거 파일을 읽고 삭제"""
+        triggers = []
+        for trigger_file in sorted(glob.glob(os.path.join(trigger_dir(self.output_dir), '*.json'))):
+            try:
+                with open(trigger_file, 'r', encoding='utf-8') as f:
+                    triggers.append(json.load(f))
+            except (json.JSONDecodeError, OSError) as e:
+                self.log(f"트리거 파일 오류 ({trigger_file}): {e}")
+            os.remove(trigger_file)
+        if self._signal_requested:
+            self._signal_requested = False
+            triggers.append({'date': None, 'fresh': False})
+        return triggers
+
+    def next_scheduled_run(self, now=None):
+        """다음 일별 실행 시각"""
+        now = now or datetime.now()
+        hour, minute = (int(part) for part in self.run_at.split(':'))
+        scheduled = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if scheduled <= now or self.last_run_date == scheduled.strftime('%Y-%m-%d'):
+            scheduled += timedelta(days=1)
+        return scheduled
+
+    def scheduled_date(self, run_time):
+        """일별 실행 시각의 분석 날짜 (run_offset_days일 전)"""
+        return (run_time - timedelta(days=self.run_offset_days)).strftime('%Y-%m-%d')
+
+    def _refresh_today(self):
+        """
+        당일 증분 갱신 (날짜가 바뀌었으면 이전 날짜를 먼저 한 번 더 갱신해 남은 윈도우를 닫음)
+
+        Returns:
+            datetime: 다음 갱신 시각
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        if self.last_refresh_date and self.last_refresh_date != today:
+            self.run_once(self.last_refresh_date, incremental=True)
+        self.run_once(today, incremental=True)
+        self.last_refresh_date = today
+        return datetime.now() + timedelta(minutes=self.refresh_minutes)
+
+    def trigger(self):
+        """즉시 실행 요청 (SIGUSR1 핸들러 등에서 사용)"""
+        self._signal_requested = True
+        self._wake.set()
+
+    def stop(self, *_):
+        """서비스 종료 요청 (진행 중인 실행은 끝난 뒤 종료)"""
+        self._stop.set()
+        self._wake.set()
+
+    def serve_forever(self, run_now=False):
+        """
+        서비스 루프 실행
+
+        Args:
+            run_now: 시작 직후 당일 분석 1회 실행 여부
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, lambda *_: self.trigger())
+
+        if run_now:
+            self.trigger()
+
+        next_run = self.next_scheduled_run()
+        next_refresh = datetime.now()
+        self.log(f"서비스 시작: 다음 자동 실행 {next_run:%Y-%m-%d %H:%M}")
+
+        while not self._stop.is_set():
+            for request in self._pop_triggers():
+                if self._stop.is_set():
+                    break
+                self.run_once(request.get('date'), request.get('fresh', False))
+
+            if not self._stop.is_set() and datetime.now() >= next_run:
+                self.last_run_date = next_run.strftime('%Y-%m-%d')
+                self.run_once(self.scheduled_date(next_run))
+                next_run = self.next_scheduled_run()
+                self.log(f"다음 자동 실행 {next_run:%Y-%m-%d %H:%M}")
+
+            if not self._stop.is_set() and self.refresh_minutes > 0 and datetime.now() >= next_refresh:
+                next_refresh = self._refresh_today()
+
+            wait = min(self.poll_seconds, max(0.0, (next_run - datetime.now()).total_seconds()))
+            if self.refresh_minutes > 0:
+                wait = min(wait, max(0.0, (next_refresh - datetime.now()).total_seconds()))
+            self._wake.wait(wait)
+            self._wake.clear()
+
+        self.log("서비스 종료")
@@ -4,56 +4,196 @@
 
 import sys
 import os
+import json
+import threading
+import time
 import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # 프로젝트 루트를 Python path에 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from config.settings import ANALYSIS_CONFIG
-from src.data.es_client import ESDataClient
-from src.data.hims_client import HIMSClient
+from config.settings import ANALYSIS_CONFIG, HIMS_CONFIG, RESILIENCE_CONFIG
+from src.data.columnar import decode_pages
+from src.data.hims_lookup import HIMSLookupService
+from src.data.resilience import ES_METHODS, HIMS_METHODS, CircuitOpenError, ResilientClient, find_resilient
+from src.data.schema import FrameBudgetExceeded, IngestSchema
 from src.analysis.analyzer import URLAnalyzer
+from src.analysis.cpu_pool import CPUAnalysisPool, available_cpus
+from src.analysis.pipeline import SKIP_MESSAGES, PairAnalysis
+from src.analysis.runs import RUN_COUNT, RUN_LAST_TS, collapse_runs, decode_runs
+from src.analysis.sampling import StratifiedIPSampler
 from src.utils.file_manager import FileManager
 from src.utils.checkpoint import CheckpointManager
+from src.utils.incremental import IncrementalState
+from src.utils.pair_summary import PairSummaryStore
+from src.utils.results import AnalysisResults
+from src.utils.scheduler import CostModel, PairScheduler
+from src.utils.status import RunStatus, StatusServer
 
 
 class URLAnalysisRunner:
     """URL 분석 실행기 (날짜별 관리)"""
     
-    def __init__(self, output_dir=None, analysis_date=None):
+    def __init__(self, output_dir=None, analysis_date=None, es_client=None, hims_client=None, hims_lookup=None):
         """
         Args:
             output_dir: 출력 디렉토리 
             analysis_date: 분석 날짜 (YYYY-MM-DD), None이면 오늘 날짜
+            es_client: 재사용할 ES 클라이언트 (없으면 첫 사용 시 생성)
+            hims_client: 재사용할 HIMS 클라이언트 (없으면 첫 사용 시 생성)
+            hims_lookup: 재사용할 HIMS 조회 서비스 (여러 날짜 실행 간 캐시 공유)
         """
         self.output_dir = output_dir or ANALYSIS_CONFIG['default_output_dir']
         self.analysis_date = analysis_date or datetime.now().strftime('%Y-%m-%d')
         
+        # ES/HIMS 클라이언트는 첫 사용 시 생성 (조회 전용 작업은 백엔드 연결 불필요)
+        # 요청은 적응형 타임아웃/헤지/재시도 예산/서킷 브레이커를 거침
+        self._es_client = ResilientClient.wrap(es_client, 'es', ES_METHODS, RESILIENCE_CONFIG)
+        self._hims_client = ResilientClient.wrap(hims_client, 'hims', HIMS_METHODS, RESILIENCE_CONFIG)
+        self._hims_lookup = hims_lookup
+        self._client_lock = threading.Lock()
+        
         # 각 모듈 초기화 (날짜별)
-        self.es_client = ESDataClient()
-        self.hims_client = HIMSClient()
+        self.ingest_schema = IngestSchema(ANALYSIS_CONFIG['max_frame_memory_mb'])
         self.analyzer = URLAnalyzer()
-        self.file_manager = FileManager(self.output_dir, self.analysis_date)
+        self.file_manager = FileManager(
+            self.output_dir, self.analysis_date, ANALYSIS_CONFIG['progress_interval_sec']
+        )
         self.checkpoint_manager = CheckpointManager(self.output_dir, self.analysis_date)
+        self.results = AnalysisResults(
+            self.output_dir, self.analysis_date, self.file_manager, self.checkpoint_manager
+        )
+        self.rollup_manager = self.results.rollup_manager
+        self.incremental_state = IncrementalState(self.output_dir, self.analysis_date)
+        self.pair_summaries = PairSummaryStore(self.file_manager)
         
         # 설정값들
         self.max_ips_per_url = ANALYSIS_CONFIG['max_ips_per_url']
         self.min_records_threshold = ANALYSIS_CONFIG['min_records_threshold']
-        self.time_window_hours = ANALYSIS_CONFIG['time_window_hours']
+        self.time_windows_hours = sorted(set(ANALYSIS_CONFIG['time_windows_hours']))
+        self.time_window_hours = max(self.time_windows_hours)
+        self.prefetch_ips = ANALYSIS_CONFIG['prefetch_ips']
+        self.sessionize = ANALYSIS_CONFIG['sessionize']
+        self.session_gap_minutes = ANALYSIS_CONFIG['session_gap_minutes']
+        self.time_budget_minutes = ANALYSIS_CONFIG['time_budget_minutes']
+        self.schedule_history_days = ANALYSIS_CONFIG['schedule_history_days']
+        self.adaptive_sampling = ANALYSIS_CONFIG['adaptive_sampling']
+        self.sampling_batch_size = ANALYSIS_CONFIG['sampling_batch_size']
+        self.sampling_strata = ANALYSIS_CONFIG['sampling_strata']
+        self.sampling_min_ips = ANALYSIS_CONFIG['sampling_min_ips']
+        self.sampling_ci_half_width = ANALYSIS_CONFIG['sampling_ci_half_width']
+        
+        self.max_pair_failures = RESILIENCE_CONFIG['max_pair_failures']
+        self.incremental_lag_minutes = ANALYSIS_CONFIG['incremental_lag_minutes']
+        # 쌍별 호스트 요약 저장 여부 (reclassify로 ES 재조회 없이 결과 재계산)
+        self.store_pair_summaries = ANALYSIS_CONFIG['store_pair_summaries']
+        
+        # 쌍 단위 분석 단계 (전처리 → 카테고리 적용 → 분석, CPU 작업 프로세스에서도 실행)
+        self.pair_analysis = PairAnalysis(
+            self.ingest_schema, self.analyzer, self.time_windows_hours, self.min_records_threshold,
+            self.sessionize, self.session_gap_minutes, ANALYSIS_CONFIG['collapse_runs'],
+            keep_summaries=self.store_pair_summaries
+        )
+        # CPU 작업 프로세스 수 (0이면 사용 안 함, 음수면 사용 가능한 코어 수), 풀은 첫 사용 시 생성
+        cpu_workers = ANALYSIS_CONFIG['cpu_workers']
+        self.cpu_workers = available_cpus() if cpu_workers < 0 else cpu_workers
+        self._cpu_pool = None
+        
+        self.status_host = ANALYSIS_CONFIG['status_host']
+        self.status_port = ANALYSIS_CONFIG['status_port']
+        
+        # 실패한 쌍 기록과 재시도 한도를 넘어 이번 실행에서 건너뛸 쌍
+        self.failed_pairs = {}
+        self.given_up_pairs = set()
+        
+        # 시간 예산 실행 중일 때만 설정되는 스케줄러
+        self.scheduler = None
+        
+        # 쌍 처리 시간 모델 (스케줄러와 ETA 계산에 공유, 실행 간 유지)
+        self.cost_model = CostModel(os.path.join(self.output_dir, 'scheduler_history.json'))
+        self.run_status = RunStatus(self.cost_model)
+        
+        # 다음 IP들의 원시 데이터를 미리 조회하는 스레드 풀
+        self.fetch_executor = ThreadPoolExecutor(
+            max_workers=max(1, self.prefetch_ips), thread_name_prefix='es-prefetch'
+        )
+    
+    @property
+    def es_client(self):
+        """ES 클라이언트 (지연 생성)"""
+        if self._es_client is None:
+            with self._client_lock:
+                if self._es_client is None:
+                    from src.data.es_client import ESDataClient
+                    self._es_client = ResilientClient.wrap(ESDataClient(), 'es', ES_METHODS, RESILIENCE_CONFIG)
+        return self._es_client
+    
+    @property
+    def hims_client(self):
+        """HIMS 클라이언트 (지연 생성)"""
+        if self._hims_client is None:
+            with self._client_lock:
+                if self._hims_client is None:
+                    from src.data.hims_client import HIMSClient
+                    self._hims_client = ResilientClient.wrap(
+                        HIMSClient(), 'hims', HIMS_METHODS, RESILIENCE_CONFIG
+                    )
+        return self._hims_client
+    
+    @property
+    def cpu_pool(self):
+        """CPU 분석 작업 프로세스 풀 (cpu_workers가 0이면 None)"""
+        if self._cpu_pool is None and self.cpu_workers > 0:
+            with self._client_lock:
+                if self._cpu_pool is None:
+                    self._cpu_pool = CPUAnalysisPool(self.pair_analysis, self.cpu_workers)
+        return self._cpu_pool
     
-    def run_analysis(self, urls, resume=True):
+    @property
+    def hims_lookup(self):
+        """HIMS 조회 서비스 (지연 생성)"""
+        if self._hims_lookup is None:
+            client = self.hims_client
+            with self._client_lock:
+                if self._hims_lookup is None:
+                    self._hims_lookup = HIMSLookupService(
+                        client, HIMS_CONFIG['batch_size'], HIMS_CONFIG['max_workers']
+                    )
+        return self._hims_lookup
+    
+    def run_analysis(self, urls, resume=True, budget_minutes=None, status_port=None):
         """
         URL 분석 실행 (날짜별 관리)
         
         Args:
             urls: 분석할 URL 리스트
             resume: 이전 진행상황에서 재시작할지 여부
+            budget_minutes: 실행 시간 예산(분), None이면 설정값 사용 (0이면 예산 없이 순서대로 처리)
+            status_port: 상태 조회 HTTP 포트, None이면 설정값 사용 (0이면 서버 없음)
         
         Returns:
             pandas.DataFrame: 분석 결과
         """
-        self.file_manager.log_progress(f"=== {self.analysis_date} 날짜 분석 시작 ===")
+        run_start = time.perf_counter()
+        self.file_manager.log_progress(f"=== {self.analysis_date} 날짜 분석 시작 ===", event='run_start')
+        
+        if budget_minutes is None:
+            budget_minutes = self.time_budget_minutes
+        if status_port is None:
+            status_port = self.status_port
+        
+        self.run_status.reset(self.analysis_date, len(urls), 'scheduled' if budget_minutes else 'sequential')
+        status_server = None
+        if status_port:
+            try:
+                status_server = StatusServer(self.get_status, self.status_host, status_port).start()
+                host, port = status_server.address[:2]
+                self.file_manager.log_progress(f"상태 조회: http://{host}:{port}/status")
+            except OSError as e:
+                self.file_manager.log_progress(f"상태 조회 서버 시작 실패: {e}")
         
         # 체크포인트 확인
         checkpoint = None
@@ -69,29 +209,337 @@ class URLAnalysisRunner:
         else:
             self.file_manager.log_progress("이전 진행상황을 무시하고 새로 시작합니다.")
         
+        # 이전 실행에서 실패한 쌍: 한도 미만은 재시도, 한도 이상은 건너뛰기
+        # (서킷이 열려 보내지 못한 요청은 쌍 자체의 실패 횟수에 포함하지 않음)
+        self.failed_pairs = self.checkpoint_manager.load_failed_pairs() if resume else {}
+        if not resume:
+            self.checkpoint_manager.save_failed_pairs(self.failed_pairs)
+        self.given_up_pairs = {
+            pair for pair, entry in self.failed_pairs.items() if entry['attempts'] >= self.max_pair_failures
+        }
+        if self.failed_pairs:
+            self.file_manager.log_progress(
+                f"이전 실패 쌍 {len(self.failed_pairs)}개: 재시도 {len(self.failed_pairs) - len(self.given_up_pairs)}개, "
+                f"한도({self.max_pair_failures}회) 초과로 건너뛰기 {len(self.given_up_pairs)}개",
+                event='failed_pairs', retry=len(self.failed_pairs) - len(self.given_up_pairs),
+                given_up=len(self.given_up_pairs)
+            )
+        
+        # 예산 실행의 체크포인트는 URL/IP 순서가 아니므로 처리된 쌍으로만 재시작
+        if checkpoint and checkpoint.get('scheduled'):
+            checkpoint = None
+        
         # 시작 인덱스 설정
         start_url_index = checkpoint['url_index'] if checkpoint else 0
         
         try:
-            for url_idx, url in enumerate(urls[start_url_index:], start_url_index):
-                self._process_url(url, url_idx, len(urls), checkpoint, processed_pairs)
+            if budget_minutes:
+                self._run_scheduled(urls, processed_pairs, budget_minutes * 60)
+            else:
+                if not self.adaptive_sampling:
+                    self._retry_failed_pairs(processed_pairs)
+                for url_idx, url in enumerate(urls[start_url_index:], start_url_index):
+                    self._process_url(url, url_idx, len(urls), checkpoint, processed_pairs)
                 
         except KeyboardInterrupt:
             self.file_manager.log_progress("사용자에 의해 중단됨")
         except Exception as e:
             self.file_manager.log_progress(f"예상치 못한 오류: {str(e)}")
+        finally:
+            if self.scheduler is not None:
+                self._write_schedule_ledger()
+            self.run_status.finish()
+            if status_server is not None:
+                status_server.stop()
+        
+        try:
+            self.cost_model.save()
+        except OSError as e:
+            self.file_manager.log_progress(f"비용 모델 저장 오류: {str(e)}")
+        
+        self.file_manager.log_progress(f"HIMS 조회 통계: {self.hims_lookup.get_stats()}")
+        for name, stats in self._get_backend_stats().items():
+            self.file_manager.log_progress(f"{name.upper()} 요청 통계: {stats}", event='backend_stats', backend=name)
+        if self._cpu_pool is not None:
+            self.file_manager.log_progress(f"CPU 분석 풀 통계: {self._cpu_pool.get_stats()}", event='cpu_pool_stats')
+        
+        # 일별 집계(rollup) 갱신
+        try:
+            self.rollup_manager.write_rollup(self.analysis_date)
+        except Exception as e:
+            self.file_manager.log_progress(f"Rollup 생성 오류: {str(e)}")
         
-        self.file_manager.log_progress(f"=== {self.analysis_date} 날짜 분석 완료 ===")
+        # 집계 중인 쌍 단위 로그 기록 및 로깅 비용 측정값 기록
+        self.file_manager.flush_progress()
+        run_seconds = time.perf_counter() - run_start
+        overhead = self.file_manager.log_overhead_sec
+        self.file_manager.log_progress(
+            f"Logging overhead: {overhead * 1000:.1f} ms ({overhead * 100 / run_seconds:.3f}% of run)",
+            event='logging_overhead', overhead_sec=round(overhead, 4), run_sec=round(run_seconds, 2)
+        )
+        
+        self.file_manager.log_progress(f"=== {self.analysis_date} 날짜 분석 완료 ===", event='run_end')
         return self.file_manager.load_all_results()
     
+    def run_incremental(self, urls, resume=True):
+        """
+        증분 실행: 워터마크 이후 이벤트만 조회해 열린 윈도우를 갱신하고 닫힌 윈도우를 확정
+        
+        - 새 워터마크 = min(현재 - incremental_lag_minutes, 분석 날짜 종료), UTC 기준
+        - 조회 대상 IP: 열린 쌍의 IP + 구간 안에 추적 URL 방문이 새로 생긴 IP
+          (URL별 열린/닫힌 쌍은 max_ips_per_url개까지, 먼저 관측된 IP 우선)
+        - 윈도우가 닫힌 쌍의 최종 결과만 결과 파일에 추가하고, 열린 쌍의 잠정 결과는
+          open_windows_<date>.jsonl에 다시 기록 (이벤트가 추가된 쌍만 다시 분석)
+        - 날짜가 끝난 뒤의 실행은 모든 윈도우를 닫으므로 전체 실행과 같은 결과
+        - ES 클라이언트가 구간 조회(get_aggregated_ips_between, get_raw_data_between)를
+          제공하지 않으면 날짜 전체를 조회한 뒤 구간으로 걸러냄
+        
+        Args:
+            urls: 분석할 URL 리스트
+            resume: False면 증분 상태를 지우고 날짜 시작부터 다시 실행
+        
+        Returns:
+            dict: 실행 요약 (워터마크, 조회 IP/행 수, 열림/갱신/닫힘 쌍 수, 기록한 결과 수)
+        """
+        if self.sessionize:
+            raise ValueError("증분 실행은 세션 분석(sessionize)을 지원하지 않습니다.")
+        
+        state = self.incremental_state
+        if not resume:
+            state.clear()
+        elif state.load() and state.windows_hours != self.time_windows_hours:
+            raise ValueError(
+                f"증분 상태의 시간 윈도우({state.windows_hours})가 현재 설정({self.time_windows_hours})과 "
+                "다릅니다. --fresh로 다시 시작하세요."
+            )
+        state.windows_hours = self.time_windows_hours
+        
+        day_start = pd.Timestamp(self.analysis_date, tz='UTC')
+        day_end = day_start + pd.Timedelta(days=1)
+        watermark = pd.Timestamp(state.watermark) if state.watermark else day_start
+        lag = pd.Timedelta(minutes=self.incremental_lag_minutes)
+        new_watermark = min(pd.Timestamp.now(tz='UTC') - lag, day_end)
+        
+        summary = {
+            'analysis_date': self.analysis_date,
+            'watermark': watermark.isoformat(),
+            'new_watermark': new_watermark.isoformat(),
+            'ips_fetched': 0,
+            'ips_failed': 0,
+            'rows_fetched': 0,
+            'opened': 0,
+            'updated': 0,
+            'closed': 0,
+            'results_written': 0,
+        }
+        if new_watermark <= watermark:
+            self.file_manager.log_progress(f"{self.analysis_date} 증분 실행: 새 구간 없음 (워터마크 {watermark})")
+            summary['open'] = state.open_pair_count()
+            return summary
+        
+        self.run_status.reset(self.analysis_date, len(urls), 'incremental')
+        self.file_manager.log_progress(
+            f"=== {self.analysis_date} 증분 실행: {watermark} → {new_watermark} ===",
+            event='incremental_start', watermark=summary['watermark'], new_watermark=summary['new_watermark']
+        )
+        if not hasattr(self.es_client, 'get_raw_data_between'):
+            self.file_manager.log_progress("ES 클라이언트가 구간 조회를 지원하지 않아 날짜 전체 조회 후 구간으로 거릅니다.")
+        
+        # 조회 대상 IP별 URL (열린 쌍, 이전 실행에서 조회 실패한 IP, 새로 추적 URL을 방문한 IP)
+        ip_urls = {}
+        for url, ip, _ in state.iter_open_pairs():
+            ip_urls.setdefault(ip, []).append(url)
+        for ip, retry in state.retry_ips.items():
+            for url in retry['urls']:
+                if url not in ip_urls.setdefault(ip, []):
+                    ip_urls[ip].append(url)
+        for url in urls:
+            pending = sum(1 for ip, retry in state.retry_ips.items()
+                          if url in retry['urls'] and not state.is_tracked(url, ip))
+            capacity = self.max_ips_per_url - state.tracked_count(url) - pending
+            if capacity <= 0:
+                continue
+            try:
+                source_ips = self._get_aggregated_ips_between(url, watermark, new_watermark)
+            except Exception as e:
+                self.file_manager.log_progress(f"✗ Error processing URL {url}: {str(e)}")
+                continue
+            for d in source_ips:
+                if capacity <= 0:
+                    break
+                ip = d['sSrcIP']
+                if not state.is_tracked(url, ip) and url not in ip_urls.get(ip, ()):
+                    ip_urls.setdefault(ip, []).append(url)
+                    capacity -= 1
+        
+        # IP별로 마지막 반영 시각 이후 이벤트를 한 번만 조회해 해당 IP의 모든 쌍 갱신
+        def fetch(ip):
+            since = state.retry_ips[ip]['since'] if ip in state.retry_ips else None
+            return self._fetch_events_between(ip, pd.Timestamp(since) if since else watermark, new_watermark)
+        
+        try:
+            for (ip,), future in self._iter_prefetched_pairs([(ip,) for ip in ip_urls], set(), fetch):
+                try:
+                    events = future.result() if future is not None else fetch(ip)
+                except Exception as e:
+                    self.file_manager.log_pair('error', f"    ✗ Error fetching events for IP {ip}: {str(e)}", ip=ip)
+                    retry = state.retry_ips.setdefault(ip, {'since': watermark.isoformat(), 'urls': []})
+                    retry['urls'] = list(dict.fromkeys(retry['urls'] + ip_urls[ip]))
+                    summary['ips_failed'] += 1
+                    continue
+                
+                state.retry_ips.pop(ip, None)
+                summary['ips_fetched'] += 1
+                summary['rows_fetched'] += len(events)
+                for url in ip_urls[ip]:
+                    self._update_incremental_pair(state, url, ip, events, new_watermark, day_end, summary)
+        except KeyboardInterrupt:
+            # 중단 시 상태를 저장하지 않음 (다음 실행이 같은 워터마크부터 다시 처리)
+            self.file_manager.log_progress("사용자에 의해 중단됨")
+            self.run_status.finish()
+            raise
+        
+        state.watermark = new_watermark.isoformat()
+        summary['open'] = state.open_pair_count()
+        summary['closed_total'] = state.closed_pair_count()
+        state.refreshes.append(dict(summary, finished_at=datetime.now().isoformat()))
+        state.write_open_results()
+        state.save()
+        self.run_status.finish()
+        
+        self.file_manager.flush_progress()
+        self.file_manager.log_progress(
+            f"=== {self.analysis_date} 증분 실행 완료: IP {summary['ips_fetched']}개, 행 {summary['rows_fetched']}개, "
+            f"열림 {summary['opened']} / 갱신 {summary['updated']} / 닫힘 {summary['closed']}, "
+            f"열린 쌍 {summary['open']}개 ===",
+            event='incremental_end', **{key: value for key, value in summary.items() if key != 'analysis_date'}
+        )
+        return summary
+    
+    def _update_incremental_pair(self, state, url, ip, events, watermark, day_end, summary):
+        """
+        증분 실행에서 단일 쌍 갱신 (추적 URL 첫 방문 시 열기, 윈도우 이벤트 추가, 윈도우가 닫히면 확정)
+        
+        윈도우는 전체 실행과 같이 추적 URL 첫 방문 다음 레코드부터 time_window_hours 동안
+        """
+        pair = state.get_pair(url, ip)
+        new = events
+        if pair is None:
+            is_track = events['sHost'].eq(url).to_numpy()
+            if not is_track.any():
+                return
+            first = int(is_track.argmax())
+            pair = state.open_pair(url, ip, events['@timestamp'].iloc[first].isoformat())
+            new = events.iloc[first + 1:]
+            summary['opened'] += 1
+        
+        if pair['window_start'] is None and len(new):
+            pair['window_start'] = new['@timestamp'].iloc[0].isoformat()
+        
+        changed = False
+        window_end = None
+        if pair['window_start'] is not None:
+            window_start = pd.Timestamp(pair['window_start'])
+            window_end = window_start + pd.Timedelta(hours=self.time_window_hours)
+            new = new[new['@timestamp'] <= window_end]
+            if len(new):
+                breaks = [window_start + pd.Timedelta(hours=hours) for hours in self.time_windows_hours[:-1]]
+                runs = self._add_category_info(collapse_runs(new, breaks))
+                pair['runs'].extend(self._encode_runs(runs))
+                changed = True
+        
+        if watermark >= day_end or (window_end is not None and watermark >= self._as_utc(window_end)):
+            results = self._analyze_runs(url, ip, pair) if changed or pair['results'] is None else pair['results']
+            if self.store_pair_summaries and results:
+                self.pair_summaries.save(url, ip, self.pair_analysis.summarize(self._runs_frame(pair['runs'])))
+            for result in results:
+                self.file_manager.save_result(result)
+            state.close_pair(url, ip)
+            summary['closed'] += 1
+            summary['results_written'] += len(results)
+            self.file_manager.log_pair('completed', f"    ✓ Window closed for {url} - {ip}", url, ip)
+        elif changed:
+            pair['results'] = self._analyze_runs(url, ip, pair)
+            summary['updated'] += 1
+    
+    def _encode_runs(self, runs):
+        """run 프레임을 상태 저장용 리스트로 변환 ([호스트, 카테고리, 첫 시각, 마지막 시각, 건수])"""
+        return [
+            [host, None if pd.isna(category) else str(category), first.isoformat(), last.isoformat(), int(count)]
+            for host, category, first, last, count in zip(
+                runs['sHost'].astype(object), runs['category'].astype(object),
+                runs['@timestamp'], runs[RUN_LAST_TS], runs[RUN_COUNT]
+            )
+        ]
+    
+    def _analyze_runs(self, url, ip, pair):
+        """
+        저장된 윈도우 run으로 쌍 분석 (레코드 단위 분석과 같은 결과)
+        
+        Returns:
+            list: 분석 결과 (윈도우 레코드 수가 최소 기준 미만이면 빈 리스트)
+        """
+        runs = pair['runs']
+        if not runs or sum(run[4] for run in runs) < self.min_records_threshold:
+            return []
+        return self.pair_analysis.analyze_frame(self._runs_frame(runs), url, ip)
+    
+    def _runs_frame(self, runs):
+        """상태에 저장된 run 리스트를 run 프레임으로 변환"""
+        hosts, categories, firsts, lasts, counts = zip(*runs)
+        return pd.DataFrame({
+            '@timestamp': pd.to_datetime(list(firsts)),
+            'sHost': list(hosts),
+            'category': list(categories),
+            RUN_COUNT: list(counts),
+            RUN_LAST_TS: pd.to_datetime(list(lasts)),
+        })
+    
+    def _get_aggregated_ips_between(self, url, start, end):
+        """구간 안에 URL을 방문한 IP 목록 (구간 조회를 지원하지 않으면 날짜 전체)"""
+        if hasattr(self.es_client, 'get_aggregated_ips_between'):
+            return self.es_client.get_aggregated_ips_between(url, start, end)
+        return self.es_client.get_aggregated_ips(url)
+    
+    def _fetch_events_between(self, ip, start, end):
+        """
+        IP의 (start, end] 구간 이벤트 조회 (스키마 적용, 시간순 정렬)
+        
+        구간 조회를 지원하지 않는 클라이언트는 날짜 전체를 조회한 뒤 구간으로 거름
+        """
+        self.run_status.fetch_started()
+        try:
+            if hasattr(self.es_client, 'get_raw_data_between'):
+                df = self.es_client.get_raw_data_between(ip, start, end)
+            else:
+                df = self.es_client.get_raw_data(ip)
+        finally:
+            self.run_status.fetch_finished()
+        if df.empty:
+            return df
+        
+        df = self.ingest_schema.apply(df)
+        ts = df['@timestamp']
+        tz = ts.dt.tz
+        start = start.tz_convert(tz) if tz is not None else start.tz_convert('UTC').tz_localize(None)
+        end = end.tz_convert(tz) if tz is not None else end.tz_convert('UTC').tz_localize(None)
+        df = df[(ts > start) & (ts <= end)]
+        return df.sort_values('@timestamp', kind='mergesort').reset_index(drop=True)
+    
+    def _as_utc(self, ts):
+        """시각을 UTC 기준으로 (시간대 없는 시각은 UTC로 간주)"""
+        return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+    
     def _process_url(self, url, url_idx, total_urls, checkpoint, processed_pairs):
         """단일 URL 처리"""
-        self.file_manager.log_progress(f"Processing URL {url_idx+1}/{total_urls}: {url}")
+        self.file_manager.log_progress(f"Processing URL {url_idx+1}/{total_urls}: {url}", event='url_start', url=url)
         
         try:
             # IP 목록 조회
             source_ips = self.es_client.get_aggregated_ips(url)
-            self.file_manager.log_progress(f"Found {len(source_ips)} source IPs for {url}")
+            self.file_manager.log_progress(
+                f"Found {len(source_ips)} source IPs for {url}", event='url_ips', url=url, ips=len(source_ips)
+            )
             
             if not source_ips:
                 self.file_manager.log_progress(f"No IPs found for {url}")
@@ -104,203 +552,503 @@ class URLAnalysisRunner:
             
             # 상위 N개 IP만 처리
             ip_list = [d['sSrcIP'] for d in source_ips[:self.max_ips_per_url]]
+            self.run_status.add_pairs(url, [
+                (d['sSrcIP'], d.get('doc_count', 0)) for d in source_ips[start_ip_index:self.max_ips_per_url]
+            ])
             
-            for ip_idx, ip in enumerate(ip_list[start_ip_index:], start_ip_index):
-                self._process_ip(url, ip, url_idx, ip_idx, total_urls, len(ip_list), processed_pairs)
+            if self.adaptive_sampling:
+                self._process_url_sampled(url, url_idx, total_urls, ip_list, processed_pairs)
+                return
+            
+            # 원시 데이터/카테고리 선조회와 함께 순서대로 처리
+            prefetched = self._iter_prefetched(url, ip_list[start_ip_index:], processed_pairs)
+            for ip_idx, (ip, raw_future) in enumerate(prefetched, start_ip_index):
+                self._process_ip(
+                    url, ip, url_idx, ip_idx, total_urls, len(ip_list), processed_pairs, raw_future
+                )
                 
         except Exception as e:
             self.file_manager.log_progress(f"✗ Error processing URL {url}: {str(e)}")
+        finally:
+            self.run_status.finish_url(url)
     
-    def _process_ip(self, url, ip, url_idx, ip_idx, total_urls, total_ips, processed_pairs):
-        """단일 IP 처리"""
-        # 이미 처리된 쌍은 건너뛰기
-        if (url, ip) in processed_pairs:
-            self.file_manager.log_progress(f"Skipping already processed: {url} - {ip}")
+    def _process_url_sampled(self, url, url_idx, total_urls, ip_list, processed_pairs):
+        """
+        적응형 표본 추출로 URL 처리
+        
+        층화 배치 단위로 IP를 처리하면서 유해 접속 비율의 신뢰구간이 목표 폭 이하가 되면
+        조기 종료하고, URL의 결과를 표본 가중치('표본 가중치')와 함께 한 번에 저장
+        (가중치가 마지막 배치 이후에 확정되므로 중단 시 해당 URL은 처음부터 다시 추출)
+        """
+        if any((url, ip) in processed_pairs for ip in ip_list):
+            self.file_manager.log_progress(f"Skipping already sampled URL: {url}")
             return
         
-        self.file_manager.log_progress(f"  Processing IP {ip_idx+1}/{total_ips}: {ip}")
+        sampler = StratifiedIPSampler(
+            ip_list, self.sampling_strata, self.sampling_batch_size,
+            seed=f"{self.analysis_date}:{url}"
+        )
+        buffered = []
+        ip_idx = 0
         
-        try:
-            # 원시 데이터 조회
-            df = self.es_client.get_raw_data(ip)
-            if df.empty:
-                self.file_manager.log_progress(f"    Empty DataFrame for IP: {ip}")
-                return
-            
-            # 데이터 전처리
-            processed_df = self._preprocess_data(df, url, ip)
-            if processed_df is None:
-                return
-            
-            # 카테고리 정보 추가
-            processed_df = self._add_category_info(processed_df)
+        while not sampler.is_converged(self.sampling_ci_half_width, self.sampling_min_ips):
+            batch = sampler.next_batch()
+            if not batch:
+                break
+            for ip, raw_future in self._iter_prefetched(url, batch, processed_pairs):
+                start = len(buffered)
+                completed = self._process_ip(
+                    url, ip, url_idx, ip_idx, total_urls, len(ip_list), processed_pairs,
+                    raw_future, buffer=buffered
+                )
+                results = buffered[start:]
+                if completed and results:
+                    sampler.observe(ip, any(r.get('유해 접속 여부') == 1 for r in results))
+                ip_idx += 1
             
-            # 분석 실행
-            result = self.analyzer.analyze_url_categories(processed_df, url, ip)
-            
-            # 결과 저장
-            self.file_manager.save_result(result)
-            processed_pairs.add((url, ip))
-            
-            self.file_manager.log_progress(f"    ✓ Analysis completed for {url} - {ip}")
-            
-        except Exception as e:
-            self.file_manager.log_progress(f"    ✗ Error processing IP {ip}: {str(e)}")
-        finally:
-            # 체크포인트 저장
-            self.checkpoint_manager.save_checkpoint(
-                url_idx, ip_idx, total_urls, total_ips, url
+            estimate = sampler.estimate()
+            self.file_manager.log_progress(
+                f"  Sampling {url}: {sampler.sampled}/{len(ip_list)} IPs, "
+                f"harmful rate {estimate['rate']} [{estimate['low']}, {estimate['high']}]"
             )
+        
+        weights = sampler.weights()
+        for result in buffered:
+            result['표본 가중치'] = weights.get(result['사용자 IP'], 1.0)
+            self.file_manager.save_result(result)
+        
+        self.file_manager.log_progress(
+            f"Sampled {sampler.sampled}/{len(ip_list)} IPs for {url} "
+            f"(saved {len(ip_list) - sampler.sampled} IP lookups)"
+        )
     
-    def _preprocess_data(self, df, url, ip):
-        """데이터 전처리"""
-        # 정렬 및 인덱스 리셋
-        df = df.sort_values("@timestamp", kind="mergesort").reset_index(drop=True)
+    def _run_scheduled(self, urls, processed_pairs, budget_seconds):
+        """
+        시간 예산 실행: 전체 (URL, IP) 쌍을 기대 가치/비용 순으로 처리하고
+        예산 안에 끝나지 않을 쌍은 연기 목록(ledger)에 기록
+        """
+        self.scheduler = PairScheduler(budget_seconds, self.cost_model, self._get_harmful_history())
         
-        # 해당 URL 첫 등장 인덱스 찾기
-        m = df['sHost'].eq(url)
-        if not m.any():
-            self.file_manager.log_progress(f"    '{url}' not found in DataFrame for IP: {ip}")
-            return None
+        pairs = []
+        for url in urls:
+            try:
+                source_ips = self.es_client.get_aggregated_ips(url)
+            except Exception as e:
+                self.file_manager.log_progress(f"✗ Error processing URL {url}: {str(e)}")
+                continue
+            for d in source_ips[:self.max_ips_per_url]:
+                if (url, d['sSrcIP']) not in processed_pairs and (url, d['sSrcIP']) not in self.given_up_pairs:
+                    pairs.append({'url': url, 'ip': d['sSrcIP'], 'doc_count': d.get('doc_count', 0)})
         
-        start_index = m.idxmax() + 1
-        subset_df = df.iloc[start_index:].copy()
+        for url in urls:
+            self.run_status.add_pairs(url, [(p['ip'], p['doc_count']) for p in pairs if p['url'] == url])
+        self.scheduler.add_pairs(pairs)
+        self.file_manager.log_progress(
+            f"Scheduled {len(pairs)} pairs within {budget_seconds / 60:.1f} min budget "
+            f"(planning {self.scheduler.elapsed():.1f}s)"
+        )
         
-        if subset_df.empty:
-            self.file_manager.log_progress(f"    Empty subset for IP: {ip}")
-            return None
+        prefetched = self._iter_prefetched_pairs(
+            ((entry['url'], entry['ip']) for entry in self.scheduler), processed_pairs
+        )
+        for pair_idx, ((url, ip), raw_future) in enumerate(prefetched):
+            # 선조회로 미리 꺼낸 쌍도 마감 이후에는 시작하지 않음
+            if self.scheduler.remaining() <= 0:
+                break
+            if self._process_ip(url, ip, 0, pair_idx, 1, len(pairs), processed_pairs, raw_future):
+                self.scheduler.record(url, ip)
+            else:
+                self.scheduler.release(url, ip)
+    
+    def _get_harmful_history(self):
+        """최근 schedule_history_days일의 추적 URL별 (유해 건수, 전체 건수)"""
+        dates = [
+            d for d in self.file_manager.get_available_dates() if d < self.analysis_date
+        ][-self.schedule_history_days:]
+        if not dates:
+            return {}
         
-        # 시간 필터링
-        subset_df = self._apply_time_filter(subset_df, ip)
-        if subset_df is None:
-            return None
+        per_url = self.rollup_manager.summarize(dates, per_url=True).get('per_url', {})
+        return {
+            url: (url_summary['harmful_records'], url_summary['records'])
+            for url, url_summary in per_url.items()
+        }
+    
+    def _write_schedule_ledger(self):
+        """연기된 쌍 목록 저장 (deferred_<date>.json)"""
+        ledger = self.scheduler.finish()
+        ledger['analysis_date'] = self.analysis_date
+        self.scheduler = None
         
-        # 최소 레코드 수 확인
-        if len(subset_df) < self.min_records_threshold:
-            self.file_manager.log_progress(
-                f"    Insufficient data (< {self.min_records_threshold} records) for IP: {ip}"
-            )
-            return None
+        ledger_file = os.path.join(self.file_manager.date_dir, f"deferred_{self.analysis_date}.json")
+        with open(f"{ledger_file}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(ledger, f, ensure_ascii=False, indent=2)
+        os.replace(f"{ledger_file}.tmp", ledger_file)
         
-        return subset_df
+        self.file_manager.log_progress(
+            f"Schedule: {ledger['completed']}/{ledger['planned']} pairs completed in "
+            f"{ledger['elapsed_seconds']}s, {ledger['deferred_count']} deferred → {ledger_file}"
+        )
     
-    def _apply_time_filter(self, subset_df, ip):
-        """시간 윈도우 필터링"""
-        # timestamp 파싱
-        ts = pd.to_datetime(subset_df["@timestamp"], errors="coerce")
-        if ts.isna().all():
-            self.file_manager.log_progress(f"    Invalid timestamps for IP: {ip}")
-            return None
+    def _iter_prefetched(self, url, ips, processed_pairs):
+        """
+        IP 목록을 순서대로 반환하면서 다음 prefetch_ips개 IP의 원시 데이터를 미리 조회
         
-        # 시간 윈도우 적용
-        start_time = ts.iloc[0]
-        end_time = start_time + pd.Timedelta(hours=self.time_window_hours)
+        Yields:
+            tuple: (ip, _fetch_pair 결과 Future 또는 None)
+        """
+        for (_, ip), future in self._iter_prefetched_pairs(((url, ip) for ip in ips), processed_pairs):
+            yield ip, future
+    
+    def _iter_prefetched_pairs(self, pairs, processed_pairs, fetch=None):
+        """
+        (URL, IP) 쌍을 순서대로 반환하면서 다음 prefetch_ips개 쌍의 원시 데이터를 미리 조회
         
-        filtered_df = subset_df[(ts >= start_time) & (ts <= end_time)].copy()
+        Args:
+            fetch: 조회 함수 (기본 _fetch_pair), 쌍 튜플을 인자로 받음
+        
+        Yields:
+            tuple: ((url, ip), 조회 결과 Future 또는 None)
+        """
+        fetch = fetch or self._fetch_pair
+        if self.prefetch_ips <= 0:
+            for pair in pairs:
+                yield pair, None
+            return
         
-        if filtered_df.empty:
-            self.file_manager.log_progress(f"    No data in time window for IP: {ip}")
-            return None
+        window = deque()
+        remaining = iter(pairs)
         
-        return filtered_df
+        def fill():
+            while len(window) <= self.prefetch_ips:
+                pair = next(remaining, None)
+                if pair is None:
+                    return
+                future = None
+                if pair not in processed_pairs and pair not in self.given_up_pairs:
+                    future = self.fetch_executor.submit(fetch, *pair)
+                window.append((pair, future))
+        
+        try:
+            fill()
+            while window:
+                pair, future = window.popleft()
+                fill()
+                yield pair, future
+        finally:
+            # 중단 시 아직 시작되지 않은 조회 취소
+            for _, future in window:
+                if future is not None:
+                    future.cancel()
     
-    def _add_category_info(self, df):
-        """카테고리 정보 추가"""
-        # 고유 호스트에 대해서만 HIMS 조회
-        unique_hosts = df['sHost'].unique().tolist()
-        cat_map = self.hims_client.get_category_map(unique_hosts)
+    def _fetch_raw_data(self, url, ip):
+        """
+        원시 데이터 조회 및 스키마 적용
         
-        # 벡터화 적용
-        df['category'] = df['sHost'].map(cat_map)
+        추적 URL 이후 시간 윈도우에 들어올 수 있는 호스트들의 카테고리 조회를
+        백그라운드로 시작하여 분석 단계에서는 캐시에서 바로 찾도록 함
+        
+        ES 클라이언트가 원시 응답 페이지(iter_raw_pages)를 제공하면 hit별 dict 없이
+        컬럼 단위로 디코딩 (스키마 적용은 dtype이 이미 맞으므로 거의 비용 없음)
+        디코딩 중 행 수만으로 메모리 예산을 넘으면 남은 페이지를 조회하지 않고 FrameBudgetExceeded
+        """
+        self.run_status.fetch_started()
+        try:
+            if hasattr(self.es_client, 'iter_raw_pages'):
+                df = decode_pages(self.es_client.iter_raw_pages(ip), max_rows=self.ingest_schema.max_rows())
+            else:
+                df = self.es_client.get_raw_data(ip)
+        finally:
+            self.run_status.fetch_finished()
+        if df.empty:
+            return df
+        
+        df = self.ingest_schema.apply(df)
+        
+        window_hosts = self.pair_analysis.window_hosts(df, url)
+        if window_hosts:
+            self.hims_lookup.prefetch(window_hosts)
         
         return df
     
-    def get_analysis_summary(self, date_range=None):
+    def _fetch_pair(self, url, ip):
+        """
+        원시 데이터 조회 후 CPU 작업 프로세스 풀이 있으면 분석까지 제출
+        
+        분석 구간 호스트의 카테고리를 먼저 조회해 매핑과 함께 보내므로 작업 프로세스는
+        HIMS에 접근하지 않음. 선조회 스레드에서 실행되면 선조회 중인 쌍들이 여러 작업
+        프로세스에서 동시에 분석됨 (동시 분석 쌍 수는 최대 prefetch_ips + 1)
+        
+        Returns:
+            tuple: (원시 데이터프레임, PairAnalysis.run 결과 Future 또는 None)
+        """
+        df = self._fetch_raw_data(url, ip)
+        if self.cpu_pool is None or df.empty or not self.ingest_schema.within_budget(df)[0]:
+            return df, None
+        
+        cat_map = self.hims_lookup.get_category_map(self.pair_analysis.window_hosts(df, url))
+        return df, self.cpu_pool.submit(df, url, ip, cat_map)
+    
+    def _process_ip(self, url, ip, url_idx, ip_idx, total_urls, total_ips, processed_pairs,
+                    raw_future=None, buffer=None, save_checkpoint=True):
         """
-        분석 결과 요약 (날짜별)
+        단일 IP 처리
         
         Args:
-            date_range: 조회할 날짜 범위 리스트, None이면 현재 날짜만
+            buffer: 지정하면 결과를 저장하지 않고 리스트에 추가 (적응형 표본 추출용)
+            save_checkpoint: False면 체크포인트 위치를 갱신하지 않음 (실패 쌍 재시도용)
+        
+        Returns:
+            bool: 분석 결과를 저장(또는 buffer에 추가)했으면 True, 건너뛰었거나 실패하면 False
         """
-        df = self.file_manager.load_all_results(date_range)
-        if df.empty:
-            return "분석 결과가 없습니다."
+        # 이미 처리된 쌍은 건너뛰기
+        if (url, ip) in processed_pairs:
+            self.file_manager.log_pair('skipped', f"Skipping already processed: {url} - {ip}", url, ip)
+            self.run_status.skip_pair(url, ip)
+            return False
+        if (url, ip) in self.given_up_pairs:
+            self.file_manager.log_pair(
+                'given_up', f"Skipping pair failed {self.failed_pairs[(url, ip)]['attempts']} times: {url} - {ip}", url, ip
+            )
+            self.run_status.skip_pair(url, ip)
+            return False
         
-        summary = {
-            "분석 날짜": date_range or [self.analysis_date],
-            "총 분석 건수": len(df),
-            "고유 URL 수": df['추적 URL'].nunique() if '추적 URL' in df.columns else 0,
-            "고유 IP 수": df['사용자 IP'].nunique() if '사용자 IP' in df.columns else 0,
-            "유해 접속 건수": (df['유해 접속 여부'] == 1).sum() if '유해 접속 여부' in df.columns else 0,
-        }
+        self.file_manager.log_pair('started', f"  Processing IP {ip_idx+1}/{total_ips}: {ip}", url, ip)
+        self.run_status.start_pair(url, ip)
+        rows = 0
         
-        # 날짜별 세부 정보 추가
-        if '분석_날짜' in df.columns:
-            daily_counts = df['분석_날짜'].value_counts().to_dict()
-            summary["날짜별 건수"] = daily_counts
+        try:
+            # 원시 데이터 조회 (선조회된 경우 결과 대기)
+            df, analysis = raw_future.result() if raw_future is not None else self._fetch_pair(url, ip)
+            rows = len(df)
+            if df.empty:
+                self.file_manager.log_pair('empty', f"    Empty DataFrame for IP: {ip}", url, ip)
+                return False
+            
+            # 메모리 예산 확인
+            within_budget, usage_mb = self.ingest_schema.within_budget(df)
+            if not within_budget:
+                self.file_manager.log_pair(
+                    'memory_exceeded', f"    Frame memory budget exceeded ({usage_mb} MB > "
+                    f"{self.ingest_schema.max_frame_memory_mb} MB) for IP: {ip}", url, ip,
+                    memory_mb=usage_mb, rows=len(df)
+                )
+                return False
+            
+            # 전처리 → 카테고리 정보 추가 → 분석 (작업 프로세스에 제출된 경우 결과 대기)
+            if analysis is not None:
+                results, skipped, summary = analysis.result()
+            else:
+                processed_df, skipped = self.pair_analysis.preprocess(df, url)
+                if not skipped:
+                    processed_df = self._add_category_info(processed_df)
+                    results = self.pair_analysis.analyze_frame(processed_df, url, ip)
+                    summary = self.pair_analysis.summarize(processed_df) if self.store_pair_summaries else None
+            if skipped:
+                self.file_manager.log_pair(
+                    skipped, SKIP_MESSAGES[skipped].format(url=url, ip=ip, threshold=self.min_records_threshold),
+                    url, ip
+                )
+                return False
+            
+            # 호스트 요약 저장 (결과보다 먼저 기록해 처리된 쌍은 요약이 있도록 함)
+            if summary is not None:
+                self.pair_summaries.save(url, ip, summary)
+            
+            # 결과 저장
+            if buffer is not None:
+                buffer.extend(results)
+            else:
+                for result in results:
+                    self.file_manager.save_result(result)
+            processed_pairs.add((url, ip))
+            if self.failed_pairs.pop((url, ip), None) is not None:
+                self.checkpoint_manager.save_failed_pairs(self.failed_pairs)
+            
+            self.file_manager.log_pair(
+                'completed', f"    ✓ Analysis completed for {url} - {ip}", url, ip,
+                memory_mb=usage_mb, rows=len(df)
+            )
+            return True
+            
+        except FrameBudgetExceeded as e:
+            rows = e.rows
+            self.file_manager.log_pair(
+                'memory_exceeded', f"    Frame memory budget exceeded while decoding ({e.rows} rows, "
+                f">= {e.min_usage_mb} MB > {self.ingest_schema.max_frame_memory_mb} MB) for IP: {ip}", url, ip,
+                memory_mb=e.min_usage_mb, rows=e.rows
+            )
+        except Exception as e:
+            self.file_manager.log_pair('error', f"    ✗ Error processing IP {ip}: {str(e)}", url, ip)
+            self._record_failure(url, ip, e)
+        finally:
+            self.run_status.finish_pair(url, ip, rows)
+            # 체크포인트 저장
+            if save_checkpoint:
+                self.checkpoint_manager.save_checkpoint(
+                    url_idx, ip_idx, total_urls, total_ips, url, scheduled=self.scheduler is not None
+                )
+        return False
+    
+    def _retry_failed_pairs(self, processed_pairs):
+        """
+        이전 실행에서 실패한 쌍을 먼저 재시도 (체크포인트 위치 이전의 쌍도 포함)
         
-        return summary
+        다시 실패한 쌍은 이번 실행에서 더 시도하지 않음
+        """
+        retry = [
+            pair for pair in self.failed_pairs
+            if pair not in self.given_up_pairs and pair not in processed_pairs
+        ]
+        if not retry:
+            return
+        
+        self.file_manager.log_progress(f"Retrying {len(retry)} previously failed pairs", event='retry_failed')
+        for (url, ip), raw_future in self._iter_prefetched_pairs(retry, processed_pairs):
+            self._process_ip(url, ip, 0, 0, 1, 1, processed_pairs, raw_future, save_checkpoint=False)
+        self.given_up_pairs.update(pair for pair in retry if pair in self.failed_pairs)
     
-    def clear_data(self, specific_date=None, clear_all=False):
+    def _record_failure(self, url, ip, error):
+        """실패한 쌍 기록 (다음 재시작 시 재시도 여부 판단)"""
+        entry = self.failed_pairs.setdefault((url, ip), {'attempts': 0, 'circuit_open': 0})
+        if isinstance(error, CircuitOpenError):
+            entry['circuit_open'] += 1
+        else:
+            entry['attempts'] += 1
+        entry['error_type'] = type(error).__name__
+        entry['error'] = str(error)
+        entry['timestamp'] = datetime.now().isoformat()
+        try:
+            self.checkpoint_manager.save_failed_pairs(self.failed_pairs)
+        except OSError as e:
+            self.file_manager.log_progress(f"실패 쌍 기록 저장 오류: {str(e)}")
+    
+    def _add_category_info(self, df):
+        """카테고리 정보 추가 (고유 호스트에 대해서만 HIMS 조회)"""
+        cat_map = self.hims_lookup.get_category_map(df['sHost'].unique().tolist())
+        return self.pair_analysis.add_categories(df, cat_map)
+    
+    def reclassify(self, refresh_categories=False):
         """
-        데이터 초기화
+        저장된 쌍별 호스트 요약으로 분석 날짜의 결과 재계산 (ES 조회 없음)
+        
+        현재 카테고리 규칙(HARMFUL_CATEGORIES/SAFE_CATEGORIES)으로 다시 분류하며, 요약이 없는 쌍과
+        분석 설정(시간 윈도우/세션)이 지금과 다른 요약의 쌍은 기존 결과를 그대로 유지.
+        적응형 표본 추출의 표본 가중치는 기존 결과 값을 유지
         
         Args:
-            specific_date: 특정 날짜만 삭제 (YYYY-MM-DD)
-            clear_all: 모든 날짜 삭제 여부
+            refresh_categories: True면 요약에 저장된 카테고리 대신 HIMS에서 호스트 카테고리를 다시 조회
+        
+        Returns:
+            dict: 재계산 통계
         """
-        if clear_all:
-            self.file_manager.clear_all_results()
-            print("모든 날짜의 데이터가 삭제되었습니다.")
-        else:
-            target_date = specific_date or self.analysis_date
-            self.file_manager.clear_results(target_date)
-            self.checkpoint_manager.clear_checkpoint(target_date)
-            print(f"{target_date} 날짜의 데이터가 삭제되었습니다.")
+        summaries = self.pair_summaries.load(self.analysis_date)
+        params = self.pair_analysis.summary_params()
+        usable = {pair: summary for pair, summary in summaries.items() if summary['params'] == params}
+        stats = {
+            'analysis_date': self.analysis_date,
+            'summaries': len(summaries),
+            'params_mismatch': len(summaries) - len(usable),
+            'reclassified_pairs': len(usable),
+            'kept_pairs': 0,
+            'results': 0,
+            'harmful_before': 0,
+            'harmful_after': 0,
+        }
+        if not usable:
+            self.file_manager.log_progress(f"재분류할 쌍 요약이 없습니다: {self.analysis_date}")
+            return stats
+        
+        start = time.perf_counter()
+        cat_map = None
+        if refresh_categories:
+            hosts = {run[0] for summary in usable.values() for run in summary['runs']}
+            cat_map = self.hims_lookup.get_category_map(list(hosts))
+        
+        # 요약이 없는 쌍의 결과는 유지, 재계산할 쌍은 표본 가중치만 보관
+        records = []
+        kept_pairs = set()
+        weights = {}
+        for record in self.file_manager.iter_records([self.analysis_date]):
+            pair = (record['추적 URL'], record['사용자 IP'])
+            if pair in usable:
+                stats['harmful_before'] += record.get('유해 접속 여부') == 1
+                if '표본 가중치' in record:
+                    weights[pair] = record['표본 가중치']
+            else:
+                records.append(record)
+                kept_pairs.add(pair)
+        
+        for (url, ip), summary in usable.items():
+            df = decode_runs(summary)
+            if cat_map is not None:
+                df = self.pair_analysis.add_categories(df, cat_map)
+            for result in self.pair_analysis.analyze_frame(df, url, ip):
+                if (url, ip) in weights:
+                    result['표본 가중치'] = weights[(url, ip)]
+                stats['harmful_after'] += result['유해 접속 여부'] == 1
+                records.append(result)
+        
+        stats['kept_pairs'] = len(kept_pairs)
+        stats['results'] = self.file_manager.replace_results(self.analysis_date, records)
+        stats['seconds'] = round(time.perf_counter() - start, 2)
+        
+        try:
+            self.rollup_manager.write_rollup(self.analysis_date)
+        except Exception as e:
+            self.file_manager.log_progress(f"Rollup 생성 오류: {str(e)}")
+        
+        self.file_manager.log_progress(
+            f"=== {self.analysis_date} 재분류 완료: 쌍 {stats['reclassified_pairs']}개 재계산, "
+            f"{stats['kept_pairs']}개 유지, 유해 결과 {stats['harmful_before']} → {stats['harmful_after']}건 ===",
+            event='reclassify', **{key: value for key, value in stats.items() if key != 'analysis_date'}
+        )
+        return stats
+    
+    def get_status(self):
+        """실행 상태 (처리량, 진행 중 요청, 대기열, 캐시 적중률, ETA)"""
+        hims_stats = self._hims_lookup.get_stats() if self._hims_lookup is not None else None
+        status = self.run_status.snapshot(hims_stats)
+        status['backends'] = self._get_backend_stats()
+        return status
+    
+    def _get_backend_stats(self):
+        """ES/HIMS 요청 통계 (지연 백분위수, 타임아웃, 헤지, 재시도, 서킷 상태)"""
+        resilient = {
+            name: find_resilient(client)
+            for name, client in (('es', self._es_client), ('hims', self._hims_client))
+        }
+        return {name: client.get_stats() for name, client in resilient.items() if client is not None}
+    
+    def get_clients(self):
+        """생성된 클라이언트/조회 서비스 (아직 생성되지 않은 것은 None)"""
+        return self._es_client, self._hims_client, self._hims_lookup
+    
+    def close(self):
+        """선조회 스레드 풀과 CPU 작업 프로세스 풀 종료 (클라이언트/조회 서비스는 재사용할 수 있도록 유지)"""
+        self.fetch_executor.shutdown(wait=True, cancel_futures=True)
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown()
+            self._cpu_pool = None
+    
+    def get_analysis_summary(self, date_range=None, exact=False):
+        """분석 결과 요약 (AnalysisResults.get_analysis_summary 참고)"""
+        return self.results.get_analysis_summary(date_range, exact)
+    
+    def clear_data(self, specific_date=None, clear_all=False):
+        """데이터 초기화 (AnalysisResults.clear_data 참고)"""
+        self.results.clear_data(specific_date, clear_all)
+        if clear_all or (specific_date or self.analysis_date) == self.analysis_date:
+            self.incremental_state.reset()
+    
+    def compact_results(self, date_range=None):
+        """결과 압축 및 인덱스 생성 (AnalysisResults.compact_results 참고)"""
+        return self.results.compact_results(date_range)
     
     def get_available_dates(self):
         """분석 가능한 날짜 목록 반환"""
-        return {
-            'analysis_dates': self.file_manager.get_available_dates(),
-            'checkpoint_dates': self.checkpoint_manager.get_available_checkpoint_dates()
-        }
+        return self.results.get_available_dates()
     
     def get_daily_summary(self):
         """날짜별 요약 정보"""
-        file_summary = self.file_manager.get_daily_summary()
-        checkpoint_summary = self.checkpoint_manager.get_all_checkpoints_summary()
-        
-        # 날짜별로 병합
-        combined = {}
-        
-        # 파일 정보 추가
-        for item in file_summary:
-            date = item['date']
-            combined[date] = {
-                'date': date,
-                'records': item['records'],
-                'size_mb': item['size_mb'],
-                'has_checkpoint': False,
-                'progress': 0,
-                'status': 'completed' if item['records'] > 0 else 'no_data'
-            }
-        
-        # 체크포인트 정보 추가
-        for item in checkpoint_summary:
-            date = item['date']
-            if date in combined:
-                combined[date]['has_checkpoint'] = True
-                combined[date]['progress'] = item['progress']
-                combined[date]['status'] = 'in_progress' if item['progress'] < 100 else 'completed'
-            else:
-                combined[date] = {
-                    'date': date,
-                    'records': 0,
-                    'size_mb': 0,
-                    'has_checkpoint': True,
-                    'progress': item['progress'],
-                    'status': 'in_progress'
-                }
-        
-        return sorted(combined.values(), key=lambda x: x['date'], reverse=True)
-
+        return self.results.get_daily_summary()
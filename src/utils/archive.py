@@ -0,0 +1,157 @@
+"""
+결과 아카이브 압축(compaction) 및 보조 인덱스 모듈
+"""
+
+import gzip
+import json
+import os
+
+
+# 중복 판정 키 (윈도우/세션 분석 결과는 윈도우/세션별로 구분)
+RECORD_KEY_FIELDS = ['추적 URL', '사용자 IP', '시간 윈도우(시간)', '세션 번호']
+
+# 보조 인덱스 대상 필드
+INDEX_FIELDS = ['사용자 IP', '추적 URL', '유해 접속 여부']
+
+
+def record_key(record):
+    """중복 판정 키 (같은 키의 레코드는 나중 레코드가 유효)"""
+    return tuple(record.get(field) for field in RECORD_KEY_FIELDS)
+
+
+def _sort_key(record):
+    """정렬 키 (None은 앞쪽)"""
+    values = [record.get(field) for field in RECORD_KEY_FIELDS]
+    return tuple((value is not None, value if value is not None else 0) for value in values)
+
+
+class ResultArchive:
+    """
+    날짜별 압축 결과 파일 관리자
+
+    압축 파일은 블록(기본 1000건)마다 독립된 gzip 멤버로 기록하므로 파일 전체는
+    일반 gzip으로 읽을 수 있고, 인덱스의 (오프셋, 길이)로 특정 블록만 읽을 수도 있음
+    """
+
+    def __init__(self, output_dir, block_size=1000):
+        """
+        Args:
+            output_dir: 결과 디렉토리
+            block_size: 블록당 레코드 수
+        """
+        self.output_dir = output_dir
+        self.block_size = block_size
+
+    def compacted_file(self, date_str):
+        """날짜별 압축 결과 파일 경로"""
+        return os.path.join(self.output_dir, date_str, f"analysis_results_{date_str}.jsonl.gz")
+
+    def index_file(self, date_str):
+        """날짜별 인덱스 파일 경로"""
+        return os.path.join(self.output_dir, date_str, f"analysis_index_{date_str}.json")
+
+    def compact(self, date_str, records, encode=None):
+        """
+        레코드 중복 제거, 정렬, 블록 압축 및 인덱스 생성
+
+        같은 키의 레코드는 마지막 레코드만 유지 (재시작으로 추가된 중복 제거)
+
+        Args:
+            date_str: 분석 날짜
+            records: 해당 날짜의 전체 레코드 iterable (호스트 문자열로 디코딩된 레코드)
+            encode: 기록 전에 레코드에 적용할 함수 (호스트 사전 인코딩, 인덱스는 디코딩된 값 기준)
+
+        Returns:
+            dict: 압축 통계 (입력/출력 레코드 수, 블록 수)
+        """
+        latest = {}
+        input_records = 0
+        for record in records:
+            input_records += 1
+            record.pop('분석_날짜', None)
+            latest[record_key(record)] = record
+
+        sorted_records = sorted(latest.values(), key=_sort_key)
+
+        blocks = []
+        keys = {field: {} for field in INDEX_FIELDS}
+        compacted_file = self.compacted_file(date_str)
+        tmp_file = f"{compacted_file}.tmp"
+
+        with open(tmp_file, 'wb') as f:
+            for block_id, start in enumerate(range(0, len(sorted_records), self.block_size)):
+                block = sorted_records[start:start + self.block_size]
+                payload = ''.join(
+                    json.dumps(encode(record) if encode else record, ensure_ascii=False, default=str) + '\n'
+                    for record in block
+                ).encode('utf-8')
+                data = gzip.compress(payload)
+
+                blocks.append([f.tell(), len(data), len(block)])
+                f.write(data)
+
+                for record in block:
+                    for field in INDEX_FIELDS:
+                        value = record.get(field)
+                        if value is None:
+                            continue
+                        block_ids = keys[field].setdefault(str(value), [])
+                        if not block_ids or block_ids[-1] != block_id:
+                            block_ids.append(block_id)
+
+        index = {
+            'analysis_date': date_str,
+            'records': len(sorted_records),
+            'block_size': self.block_size,
+            'blocks': blocks,
+            'keys': keys,
+        }
+        index_file = self.index_file(date_str)
+        with open(f"{index_file}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+
+        os.replace(tmp_file, compacted_file)
+        os.replace(f"{index_file}.tmp", index_file)
+
+        return {
+            'analysis_date': date_str,
+            'input_records': input_records,
+            'output_records': len(sorted_records),
+            'blocks': len(blocks),
+            'size_mb': round(os.path.getsize(compacted_file) / (1024 * 1024), 2),
+        }
+
+    def load_index(self, date_str):
+        """인덱스 로드 (없으면 None)"""
+        index_file = self.index_file(date_str)
+        if not os.path.exists(index_file):
+            return None
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def candidate_blocks(self, index, criteria):
+        """
+        조건을 만족할 수 있는 블록 번호 목록 (인덱스 교집합)
+
+        Args:
+            index: load_index 결과
+            criteria: {필드: 값} (INDEX_FIELDS 중 일부)
+        """
+        candidates = None
+        for field, value in criteria.items():
+            block_ids = set(index['keys'].get(field, {}).get(str(value), []))
+            candidates = block_ids if candidates is None else candidates & block_ids
+        if candidates is None:
+            return list(range(len(index['blocks'])))
+        return sorted(candidates)
+
+    def read_blocks(self, date_str, index, block_ids):
+        """지정한 블록의 레코드만 읽어 반환 (호스트 필드는 저장된 그대로, HostDictionary.decode로 변환)"""
+        with open(self.compacted_file(date_str), 'rb') as f:
+            for block_id in block_ids:
+                offset, length, _ = index['blocks'][block_id]
+                f.seek(offset)
+                payload = gzip.decompress(f.read(length)).decode('utf-8')
+                for line in payload.splitlines():
+                    if line:
+                        yield json.loads(line)
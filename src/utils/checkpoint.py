@@ -22,12 +22,17 @@ class CheckpointManager:
         # 날짜별 서브디렉토리
         self.date_dir = os.path.join(output_dir, self.analysis_date)
         self.checkpoint_file = os.path.join(self.date_dir, f"checkpoint_{self.analysis_date}.json")
+        self.failed_pairs_file = os.path.join(self.date_dir, f"failed_pairs_{self.analysis_date}.json")
         
         # 디렉토리 생성
         os.makedirs(self.date_dir, exist_ok=True)
     
-    def save_checkpoint(self, url_index, ip_index, total_urls, total_ips_for_current_url, current_url=None):
-        """체크포인트 저장 (날짜별)"""
+    def save_checkpoint(self, url_index, ip_index, total_urls, total_ips_for_current_url, current_url=None, scheduled=False):
+        """
+        체크포인트 저장 (날짜별)
+        
+        scheduled=True면 시간 예산 실행의 체크포인트 (인덱스는 우선순위 순서 기준)
+        """
         checkpoint = {
             'analysis_date': self.analysis_date,
             'url_index': url_index,
@@ -35,6 +40,7 @@ class CheckpointManager:
             'total_urls': total_urls,
             'total_ips_for_current_url': total_ips_for_current_url,
             'current_url': current_url,
+            'scheduled': scheduled,
             'timestamp': datetime.now().isoformat(),
             'last_processed': f"URL {url_index+1}/{total_urls}, IP {ip_index+1}/{total_ips_for_current_url}",
             'progress_percentage': round(((url_index * 100) + (ip_index * 100 / total_ips_for_current_url)) / total_urls, 2)
@@ -43,6 +49,35 @@ class CheckpointManager:
         with open(self.checkpoint_file, 'w', encoding='utf-8') as f:
             json.dump(checkpoint, f, ensure_ascii=False, indent=2)
     
+    def load_failed_pairs(self):
+        """
+        실패한 (URL, IP) 쌍 기록 로드
+        
+        Returns:
+            dict: {(url, ip): {'attempts', 'circuit_open', 'error_type', 'error', 'timestamp'}}
+        """
+        if not os.path.exists(self.failed_pairs_file):
+            return {}
+        try:
+            with open(self.failed_pairs_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"실패 쌍 기록 파싱 오류: {e}")
+            return {}
+        return {(entry['url'], entry['ip']): entry for entry in entries}
+    
+    def save_failed_pairs(self, failed_pairs):
+        """실패한 (URL, IP) 쌍 기록 저장 (비어 있으면 파일 삭제)"""
+        if not failed_pairs:
+            if os.path.exists(self.failed_pairs_file):
+                os.remove(self.failed_pairs_file)
+            return
+        
+        entries = [dict(entry, url=url, ip=ip) for (url, ip), entry in failed_pairs.items()]
+        with open(f"{self.failed_pairs_file}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        os.replace(f"{self.failed_pairs_file}.tmp", self.failed_pairs_file)
+    
     def load_checkpoint(self, specific_date=None):
         """
         체크포인트 로드
@@ -73,21 +108,22 @@ class CheckpointManager:
     
     def clear_checkpoint(self, specific_date=None):
         """
-        체크포인트 파일 삭제
+        체크포인트 파일과 실패한 쌍 기록 삭제
         
         Args:
             specific_date: 특정 날짜 체크포인트 삭제 (YYYY-MM-DD), None이면 현재 날짜
         """
-        if specific_date:
-            checkpoint_file = os.path.join(self.output_dir, specific_date, f"checkpoint_{specific_date}.json")
-            target_date = specific_date
-        else:
-            checkpoint_file = self.checkpoint_file
-            target_date = self.analysis_date
+        target_date = specific_date or self.analysis_date
+        date_dir = os.path.join(self.output_dir, target_date)
+        checkpoint_file = os.path.join(date_dir, f"checkpoint_{target_date}.json")
+        failed_pairs_file = os.path.join(date_dir, f"failed_pairs_{target_date}.json")
             
         if os.path.exists(checkpoint_file):
             os.remove(checkpoint_file)
             print(f"{target_date} 날짜의 체크포인트가 삭제되었습니다.")
+        if os.path.exists(failed_pairs_file):
+            os.remove(failed_pairs_file)
+            print(f"{target_date} 날짜의 실패한 쌍 기록이 삭제되었습니다.")
     
     def get_available_checkpoint_dates(self):
         """체크포인트가 있는 날짜 목록 반환"""
@@ -2,82 +2,339 @@
 파일 저장/로드 관리 모듈
 """
 
+import gzip
 import json
+import logging
+import multiprocessing
 import os
-import pandas as pd
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import glob
 import shutil
+from .archive import ResultArchive, record_key
+from .host_dictionary import HostDictionary, host_dictionary_file
+from .pair_summary import pair_summaries_file
+from .rollup import ROLLUP_COLUMNS, iter_pair_records
 from .logger import get_logger
 
+# pandas는 DataFrame을 반환하는 메서드에서만 지연 로드 (조회 전용 CLI 시작 시간 단축)
+
+
+def _open_result_file(file_path):
+    """결과 파일 열기 (압축 파일은 gzip으로)"""
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, 'rt', encoding='utf-8')
+    return open(file_path, 'r', encoding='utf-8')
+
+
+def _iter_result_records(file_path, columns=None, errors=None, decode=True, dictionary=None):
+    """
+    결과 파일 레코드를 한 줄씩 읽어 반환 (컬럼 투영 적용)
+    
+    Args:
+        file_path: 결과 파일 경로
+        columns: 유지할 컬럼 리스트, None이면 전체
+        errors: 파싱 오류 (라인 번호, 메시지)를 추가할 리스트
+        decode: False면 호스트 필드를 날짜별 호스트 사전 id 그대로 반환
+        dictionary: 사용할 HostDictionary, None이면 결과 파일 옆의 사전 파일을 읽음
+    """
+    analysis_date = os.path.basename(os.path.dirname(file_path))
+    if decode and dictionary is None:
+        dictionary = HostDictionary(host_dictionary_file(os.path.dirname(file_path)))
+    with _open_result_file(file_path) as f:
+        for line_num, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError as e:
+                if errors is not None:
+                    errors.append((line_num, str(e)))
+                continue
+            
+            # 분석 날짜 정보 추가
+            result['분석_날짜'] = analysis_date
+            if columns is not None:
+                result = {column: result.get(column) for column in columns}
+            if decode:
+                dictionary.decode(result)
+            yield result
+
+
+def _load_result_frame(file_path, columns=None, decode=True):
+    """단일 날짜 결과 파일을 DataFrame으로 로드 (프로세스 풀 작업 단위)"""
+    import pandas as pd
+    
+    errors = []
+    records = list(_iter_result_records(file_path, columns, errors, decode))
+    return pd.DataFrame(records, columns=columns), errors
+
+
+def _process_pool(max_workers):
+    """
+    결과 파일 파싱용 프로세스 풀
+
+    작업 프로세스는 spawn으로 시작 (로그 QueueListener 등 스레드가 있는 상태에서 fork하지 않음)
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def _summarize_result_files(file_paths):
+    """
+    단일 날짜 결과 파일들의 요약 집계 (프로세스 풀 작업 단위)
+
+    rollup과 같이 (URL, IP) 쌍 단위로 집계 (쌍마다 가장 긴 윈도우의 결과를 한 번)
+    날짜의 파일들(압축, 압축 중, 압축 이후 추가)을 기록된 순서로 함께 읽어 파일 간 중복도 제거
+    """
+    partial = {
+        'date': os.path.basename(os.path.dirname(file_paths[0])),
+        'records': 0,
+        'urls': set(),
+        'ips': set(),
+        'harmful': 0,
+    }
+    records = (
+        record for file_path in file_paths for record in _iter_result_records(file_path, ROLLUP_COLUMNS)
+    )
+    for url, ip, harmful, _ in iter_pair_records(records):
+        partial['records'] += 1
+        if url is not None:
+            partial['urls'].add(url)
+        if ip is not None:
+            partial['ips'].add(ip)
+        if harmful:
+            partial['harmful'] += 1
+    return partial
+
 
 class FileManager:
     """분석 결과 파일 관리자 (날짜별 관리)"""
     
-    def __init__(self, output_dir, analysis_date=None):
+    # 집계하지 않고 바로 기록하는 쌍 단위 이벤트
+    IMMEDIATE_PAIR_EVENTS = ('error', 'memory_exceeded')
+    
+    def __init__(self, output_dir, analysis_date=None, progress_interval_sec=10):
         """
         Args:
             output_dir: 결과 파일을 저장할 디렉토리
             analysis_date: 분석 날짜 (YYYY-MM-DD), None이면 오늘 날짜
+            progress_interval_sec: 쌍 단위 진행 로그 요약 주기(초)
         """
         self.output_dir = output_dir
         self.analysis_date = analysis_date or datetime.now().strftime('%Y-%m-%d')
         self.logger = get_logger()
         
+        # 쌍 단위 진행 로그 집계 (주기적으로 요약 한 줄만 기록)
+        self.progress_interval_sec = progress_interval_sec
+        self._pair_events = Counter()
+        self._pair_events_total = Counter()
+        self._last_pair = None
+        self._last_summary = time.monotonic()
+        self.log_overhead_sec = 0.0
+        
         # 날짜별 서브디렉토리 생성
         self.date_dir = os.path.join(output_dir, self.analysis_date)
         self.results_file = os.path.join(self.date_dir, f"analysis_results_{self.analysis_date}.jsonl")
         self.progress_file = os.path.join(self.date_dir, f"progress_{self.analysis_date}.txt")
+        self.archive = ResultArchive(output_dir)
+        self._host_dictionaries = {}
         
         # 디렉토리 생성
         os.makedirs(self.date_dir, exist_ok=True)
     
     def save_result(self, result_dict):
-        """단일 분석 결과를 파일에 저장"""
+        """단일 분석 결과를 파일에 저장 (호스트 문자열은 날짜별 호스트 사전 id로 저장)"""
+        record = self.get_host_dictionary().encode(result_dict)
         with open(self.results_file, 'a', encoding='utf-8') as f:
-            json.dump(result_dict, f, ensure_ascii=False, default=str)
+            json.dump(record, f, ensure_ascii=False, default=str)
             f.write('\n')
     
-    def load_all_results(self, date_range=None):
+    def get_host_dictionary(self, date_str=None):
+        """
+        날짜별 호스트 사전 (None이면 현재 날짜)
+        
+        decode=False로 읽은 레코드의 호스트 id는 get_host_dictionary(날짜).hosts[id]로 변환
+        """
+        date_str = date_str or self.analysis_date
+        if date_str not in self._host_dictionaries:
+            self._host_dictionaries[date_str] = HostDictionary(
+                host_dictionary_file(os.path.join(self.output_dir, date_str))
+            )
+        dictionary = self._host_dictionaries[date_str]
+        dictionary.refresh()
+        return dictionary
+    
+    def _file_date(self, file_path):
+        """결과 파일의 분석 날짜"""
+        return os.path.basename(os.path.dirname(file_path))
+    
+    def _get_result_files(self, date_range=None):
+        """
+        날짜 범위에 해당하는 결과 파일 목록 (None이면 현재 날짜만)
+        
+        압축된 날짜는 압축 파일, 압축 중인 결과 파일, 압축 이후 추가된 결과 파일 순서 (기록된 순서)
+        """
+        dates = [self.analysis_date] if date_range is None else date_range
+        files = []
+        for date_str in dates:
+            for file_path in (
+                self.archive.compacted_file(date_str),
+                self.get_compacting_file(date_str),
+                self.get_results_file(date_str),
+            ):
+                if os.path.exists(file_path):
+                    files.append(file_path)
+        return files
+    
+    def get_results_signature(self, date_str=None):
+        """날짜별 결과 파일 크기 합계 (결과 변경 감지용, 결과가 없으면 0)"""
+        date_str = date_str or self.analysis_date
+        return sum(os.path.getsize(file_path) for file_path in self._get_result_files([date_str]))
+    
+    def get_results_file(self, date_str=None):
+        """날짜별 결과 파일 경로 (None이면 현재 날짜)"""
+        if date_str is None:
+            return self.results_file
+        return os.path.join(self.output_dir, date_str, f"analysis_results_{date_str}.jsonl")
+    
+    def get_compacting_file(self, date_str=None):
+        """압축 중인 결과 파일 경로 (압축 시작 시 결과 파일을 이 이름으로 옮김)"""
+        return f"{self.get_results_file(date_str)}.compacting"
+    
+    def iter_records(self, date_range=None, columns=None, decode=True):
+        """
+        분석 결과 레코드(dict)를 파일 순서대로 순회
+        
+        Args:
+            date_range: 날짜 범위 리스트 또는 None (현재 날짜만)
+            columns: 유지할 컬럼 리스트, None이면 전체
+            decode: False면 호스트 필드를 날짜별 호스트 사전 id 그대로 반환
+        """
+        for file_path in self._get_result_files(date_range):
+            errors = []
+            dictionary = self.get_host_dictionary(self._file_date(file_path)) if decode else None
+            yield from _iter_result_records(file_path, columns, errors, decode, dictionary)
+            self._log_parse_errors(file_path, errors)
+    
+    def load_all_results(self, date_range=None, columns=None, decode=True):
         """
         저장된 분석 결과를 로드하여 DataFrame으로 반환
         
         Args:
             date_range: 날짜 범위 리스트 ['2025-01-01', '2025-01-02'] 또는 None (현재 날짜만)
+            columns: 로드할 컬럼 리스트, None이면 전체
+            decode: False면 호스트 필드를 날짜별 호스트 사전 id 그대로 반환 ('분석_날짜'별 사전 사용)
         """
-        results = []
+        import pandas as pd
         
-        if date_range is None:
-            # 현재 날짜만 로드
-            files_to_load = [self.results_file] if os.path.exists(self.results_file) else []
+        chunks = list(self.iter_results(date_range, columns=columns, decode=decode))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    
+    def iter_results(self, date_range=None, columns=None, chunk_size=50000, max_workers=None, decode=True):
+        """
+        분석 결과를 청크 단위 DataFrame으로 순회 (메모리 사용량 제한)
+        
+        Args:
+            date_range: 날짜 범위 리스트 또는 None (현재 날짜만)
+            columns: 로드할 컬럼 리스트, None이면 전체
+            chunk_size: 청크당 최대 레코드 수
+            max_workers: 1보다 크면 날짜별 파일을 프로세스 풀에서 병렬 파싱
+                (동시에 메모리에 올라가는 날짜 수는 max_workers개로 제한)
+            decode: False면 호스트 필드를 날짜별 호스트 사전 id 그대로 반환
+        
+        Yields:
+            pandas.DataFrame: 최대 chunk_size 행의 결과 청크
+        """
+        import pandas as pd
+        
+        files = self._get_result_files(date_range)
+        
+        if max_workers and max_workers > 1 and len(files) > 1:
+            for frame in self._iter_parallel_frames(files, columns, max_workers, decode):
+                for start in range(0, len(frame), chunk_size):
+                    yield frame.iloc[start:start + chunk_size].reset_index(drop=True)
+            return
+        
+        records = []
+        for result in self.iter_records(date_range, columns, decode):
+            records.append(result)
+            if len(records) >= chunk_size:
+                yield pd.DataFrame(records, columns=columns)
+                records = []
+        if records:
+            yield pd.DataFrame(records, columns=columns)
+    
+    def _iter_parallel_frames(self, files, columns, max_workers, decode=True):
+        """날짜별 파일을 프로세스 풀에서 파싱하여 날짜 순서대로 반환"""
+        with _process_pool(min(max_workers, len(files))) as executor:
+            pending = deque()
+            remaining = iter(files)
+            
+            for file_path in remaining:
+                pending.append((file_path, executor.submit(_load_result_frame, file_path, columns, decode)))
+                if len(pending) >= max_workers:
+                    break
+            
+            while pending:
+                file_path, future = pending.popleft()
+                next_file = next(remaining, None)
+                if next_file is not None:
+                    pending.append((next_file, executor.submit(_load_result_frame, next_file, columns, decode)))
+                
+                frame, errors = future.result()
+                self._log_parse_errors(file_path, errors)
+                if not frame.empty:
+                    yield frame
+    
+    def _log_parse_errors(self, file_path, errors):
+        """JSON 파싱 오류 로그"""
+        for line_num, message in errors:
+            self.logger.warning(f"JSON 파싱 오류 ({file_path}, 라인 {line_num}): {message}")
+    
+    def summarize_results(self, date_range=None, max_workers=None):
+        """
+        분석 결과 요약 집계 (레코드를 DataFrame으로 올리지 않고 스트리밍 집계)
+        
+        날짜별 결과는 프로세스 풀에서 병렬로 집계한 뒤 병합함
+        
+        고유 URL/IP는 정확한 집합으로 세므로 메모리가 범위 내 고유 개수에 비례함
+        (고유 IP 1천만 개에 약 1GB). 긴 범위는 rollup의 HyperLogLog 요약(RollupManager.summarize) 사용
+        
+        Args:
+            date_range: 날짜 범위 리스트 또는 None (현재 날짜만)
+            max_workers: 프로세스 수, None이면 CPU 수
+        
+        Returns:
+            dict: 총 레코드 수, 고유 URL/IP 수, 유해 접속 건수, 날짜별 건수
+        """
+        dates = [self.analysis_date] if date_range is None else date_range
+        date_files = [files for files in (self._get_result_files([date_str]) for date_str in dates) if files]
+        
+        if len(date_files) > 1:
+            workers = min(max_workers or os.cpu_count() or 1, len(date_files))
+            with _process_pool(workers) as executor:
+                partials = list(executor.map(_summarize_result_files, date_files))
         else:
-            # 지정된 날짜 범위의 파일들 로드
-            files_to_load = []
-            for date_str in date_range:
-                date_file = os.path.join(self.output_dir, date_str, f"analysis_results_{date_str}.jsonl")
-                if os.path.exists(date_file):
-                    files_to_load.append(date_file)
-        
-        for file_path in files_to_load:
-            results.extend(self._load_single_file(file_path))
-        
-        return pd.DataFrame(results) if results else pd.DataFrame()
-    
-    def _load_single_file(self, file_path):
-        """단일 파일에서 결과 로드"""
-        results = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                if line.strip():
-                    try:
-                        result = json.loads(line.strip())
-                        # 분석 날짜 정보 추가
-                        result['분석_날짜'] = os.path.basename(os.path.dirname(file_path))
-                        results.append(result)
-                    except json.JSONDecodeError as e:
-                        self.logger.warning(f"JSON 파싱 오류 ({file_path}, 라인 {line_num}): {e}")
-                        continue
-        return results
+            partials = [_summarize_result_files(files) for files in date_files]
+        
+        urls = set()
+        ips = set()
+        daily_counts = {}
+        for partial in partials:
+            urls |= partial['urls']
+            ips |= partial['ips']
+            if partial['records']:
+                daily_counts[partial['date']] = daily_counts.get(partial['date'], 0) + partial['records']
+        
+        return {
+            'total_records': sum(partial['records'] for partial in partials),
+            'unique_urls': len(urls),
+            'unique_ips': len(ips),
+            'harmful_records': sum(partial['harmful'] for partial in partials),
+            'daily_counts': daily_counts,
+        }
     
     def get_available_dates(self):
         """분석 결과가 있는 날짜 목록 반환"""
@@ -86,8 +343,7 @@ class FileManager:
             for item in os.listdir(self.output_dir):
                 date_path = os.path.join(self.output_dir, item)
                 if os.path.isdir(date_path) and self._is_valid_date_format(item):
-                    result_file = os.path.join(date_path, f"analysis_results_{item}.jsonl")
-                    if os.path.exists(result_file):
+                    if self._get_result_files([item]):
                         dates.append(item)
         return sorted(dates)
     
@@ -103,71 +359,76 @@ class FileManager:
         """이미 처리된 (URL, IP) 쌍들을 반환"""
         processed = set()
         
-        if date_range is None:
-            # 현재 날짜만 확인
-            files_to_check = [self.results_file] if os.path.exists(self.results_file) else []
-        else:
-            # 지정된 날짜 범위 확인
-            files_to_check = []
-            for date_str in date_range:
-                date_file = os.path.join(self.output_dir, date_str, f"analysis_results_{date_str}.jsonl")
-                if os.path.exists(date_file):
-                    files_to_check.append(date_file)
-        
-        for file_path in files_to_check:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            result = json.loads(line.strip())
-                            url = result.get('추적 URL')
-                            ip = result.get('사용자 IP')
-                            if url and ip:
-                                processed.add((url, ip))
-                        except json.JSONDecodeError:
-                            continue
+        for file_path in self._get_result_files(date_range):
+            dictionary = self.get_host_dictionary(self._file_date(file_path))
+            for result in _iter_result_records(file_path, ['추적 URL', '사용자 IP'], dictionary=dictionary):
+                url = result['추적 URL']
+                ip = result['사용자 IP']
+                if url and ip:
+                    processed.add((url, ip))
         
         return processed
     
-    def clear_results(self, specific_date=None):
-        """
-        결과 파일들 초기화
-        
-        Args:
-            specific_date: 특정 날짜만 삭제 (YYYY-MM-DD), None이면 현재 날짜
-        """
-        if specific_date:
-            date_dir = os.path.join(self.output_dir, specific_date)
-            files_to_remove = [
-                os.path.join(date_dir, f"analysis_results_{specific_date}.jsonl"),
-                os.path.join(date_dir, f"progress_{specific_date}.txt")
-            ]
-        else:
-            files_to_remove = [self.results_file, self.progress_file]
-        
-        for file_path in files_to_remove:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                self.logger.info(f"Removed: {file_path}")
-        
-        target_date = specific_date or self.analysis_date
-        self.logger.info(f"{target_date} 날짜의 분석 결과가 초기화되었습니다.")
-    
     def clear_all_results(self):
         """모든 날짜의 결과 파일 초기화"""
         if os.path.exists(self.output_dir):
             shutil.rmtree(self.output_dir)
             os.makedirs(self.output_dir, exist_ok=True)
+            self._host_dictionaries.clear()
             self.logger.info("모든 분석 결과가 초기화되었습니다.")
     
-    def log_progress(self, message):
-        """진행상황 로그 (날짜별)"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_message = f"[{timestamp}] {message}\n"
+    def log_progress(self, message, **fields):
+        """
+        진행상황 로그 (날짜별 진행 파일 + 구조화 로그, 기록은 백그라운드 스레드에서 처리)
         
-        with open(self.progress_file, 'a', encoding='utf-8') as f:
-            f.write(log_message)
-        self.logger.info(message)
+        Args:
+            message: 로그 메시지
+            fields: 구조화 필드 (event, url, ip 등)
+        """
+        start = time.perf_counter()
+        self.logger.info(
+            message, progress_file=self.progress_file, analysis_date=self.analysis_date, **fields
+        )
+        self.log_overhead_sec += time.perf_counter() - start
+    
+    def log_pair(self, event, message, url=None, ip=None, **fields):
+        """
+        쌍(URL, IP) 단위 진행 로그
+        
+        오류 등 IMMEDIATE_PAIR_EVENTS는 바로 기록하고, 나머지는 이벤트별 건수로 집계하여
+        progress_interval_sec마다 요약 한 줄만 기록 (DEBUG 레벨이면 개별 메시지도 기록)
+        """
+        if event in self.IMMEDIATE_PAIR_EVENTS:
+            self.log_progress(message, event=event, url=url, ip=ip, **fields)
+        
+        start = time.perf_counter()
+        self._pair_events[event] += 1
+        self._last_pair = (url, ip)
+        if self.logger.is_enabled_for(logging.DEBUG):
+            self.logger.debug(message, analysis_date=self.analysis_date, event=event, url=url, ip=ip, **fields)
+        due = time.monotonic() - self._last_summary >= self.progress_interval_sec
+        self.log_overhead_sec += time.perf_counter() - start
+        
+        if due:
+            self.flush_progress()
+    
+    def flush_progress(self):
+        """집계된 쌍 단위 진행 로그를 요약 한 줄로 기록"""
+        self._last_summary = time.monotonic()
+        if not self._pair_events:
+            return
+        
+        self._pair_events_total.update(self._pair_events)
+        counts = dict(self._pair_events)
+        self._pair_events.clear()
+        
+        pairs = self._pair_events_total['started'] + self._pair_events_total['skipped']
+        detail = ', '.join(f"{event} {count}" for event, count in sorted(counts.items()))
+        url, ip = self._last_pair or (None, None)
+        self.log_progress(
+            f"Progress: {pairs} pairs ({detail}) | last: {url} - {ip}",
+            event='progress_summary', pairs=pairs, counts=counts, url=url, ip=ip
+        )
     
     def clear_results(self, specific_date=None):
         """
@@ -176,21 +437,24 @@ class FileManager:
         Args:
             specific_date: 특정 날짜만 삭제 (YYYY-MM-DD), None이면 현재 날짜
         """
-        if specific_date:
-            date_dir = os.path.join(self.output_dir, specific_date)
-            files_to_remove = [
-                os.path.join(date_dir, f"analysis_results_{specific_date}.jsonl"),
-                os.path.join(date_dir, f"progress_{specific_date}.txt")
-            ]
-        else:
-            files_to_remove = [self.results_file, self.progress_file]
+        target_date = specific_date or self.analysis_date
+        date_dir = os.path.join(self.output_dir, target_date)
+        files_to_remove = [
+            os.path.join(date_dir, f"analysis_results_{target_date}.jsonl"),
+            self.get_compacting_file(target_date),
+            os.path.join(date_dir, f"progress_{target_date}.txt"),
+            self.archive.compacted_file(target_date),
+            self.archive.index_file(target_date),
+            host_dictionary_file(date_dir),
+            pair_summaries_file(date_dir)
+        ]
         
         for file_path in files_to_remove:
             if os.path.exists(file_path):
                 os.remove(file_path)
                 self.logger.info(f"Removed: {file_path}")
+        self._host_dictionaries.pop(target_date, None)
         
-        target_date = specific_date or self.analysis_date
         self.logger.info(f"{target_date} 날짜의 분석 결과가 초기화되었습니다.")
     
     def get_file_info(self, date_range=None):
@@ -205,25 +469,23 @@ class FileManager:
             'current_date_dir': self.date_dir,
             'results_file': self.results_file,
             'progress_file': self.progress_file,
-            'results_exists': os.path.exists(self.results_file),
+            'results_exists': bool(self._get_result_files()),
             'progress_exists': os.path.exists(self.progress_file),
             'available_dates': self.get_available_dates()
         }
         
         if date_range is None:
             # 현재 날짜만 확인
-            info.update(self._get_single_date_info(self.results_file))
+            info.update(self.get_date_info(self.analysis_date))
         else:
             # 여러 날짜 확인
             total_records = 0
             total_size = 0
             
             for date_str in date_range:
-                date_file = os.path.join(self.output_dir, date_str, f"analysis_results_{date_str}.jsonl")
-                if os.path.exists(date_file):
-                    single_info = self._get_single_date_info(date_file)
-                    total_records += single_info.get('total_records', 0)
-                    total_size += single_info.get('file_size_mb', 0)
+                single_info = self.get_date_info(date_str)
+                total_records += single_info.get('total_records', 0)
+                total_size += single_info.get('file_size_mb', 0)
             
             info.update({
                 'total_records': total_records,
@@ -233,11 +495,27 @@ class FileManager:
         
         return info
     
+    def get_date_info(self, date_str):
+        """단일 날짜 결과 정보 (압축 파일 포함)"""
+        total_records = 0
+        total_size = 0
+        for file_path in self._get_result_files([date_str]):
+            single_info = self._get_single_date_info(file_path)
+            if 'error' in single_info:
+                return single_info
+            total_records += single_info['total_records']
+            total_size += single_info['file_size_mb']
+        
+        return {
+            'total_records': total_records,
+            'file_size_mb': round(total_size, 2)
+        }
+    
     def _get_single_date_info(self, file_path):
         """단일 날짜 파일 정보"""
         if os.path.exists(file_path):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
+                with _open_result_file(file_path) as f:
                     line_count = sum(1 for line in f if line.strip())
                 return {
                     'total_records': line_count,
@@ -261,8 +539,7 @@ class FileManager:
         summary = []
         
         for date_str in available_dates:
-            date_file = os.path.join(self.output_dir, date_str, f"analysis_results_{date_str}.jsonl")
-            file_info = self._get_single_date_info(date_file)
+            file_info = self.get_date_info(date_str)
             
             summary.append({
                 'date': date_str,
@@ -270,4 +547,142 @@ class FileManager:
                 'size_mb': file_info['file_size_mb']
             })
         
-        return summary
\ No newline at end of file
+        return summary
+    
+    def compact_results(self, date_str=None):
+        """
+        날짜별 결과 압축 (중복 제거, 정렬, 블록 gzip 압축, 보조 인덱스 생성)
+        
+        시작할 때 결과 JSONL을 압축 중 파일(.compacting)로 옮기므로 압축 중에 추가되는 결과는
+        새 JSONL에 쌓여 다음 압축 때 병합되고, 압축이 끝나면 압축한 부분만 삭제됨
+        (이전 압축이 중단되어 압축 중 파일이 남아 있으면 그 파일만 압축)
+        
+        Returns:
+            dict: 압축 통계, 결과가 없으면 None
+        """
+        date_str = date_str or self.analysis_date
+        results_file = self.get_results_file(date_str)
+        compacting_file = self.get_compacting_file(date_str)
+        if not os.path.exists(compacting_file) and os.path.exists(results_file):
+            os.replace(results_file, compacting_file)
+        
+        sources = [
+            file_path for file_path in (self.archive.compacted_file(date_str), compacting_file)
+            if os.path.exists(file_path)
+        ]
+        if not sources:
+            return None
+        compacted_size = os.path.getsize(compacting_file) if os.path.exists(compacting_file) else 0
+        
+        dictionary = self.get_host_dictionary(date_str)
+        errors = []
+        records = (
+            record for file_path in sources
+            for record in _iter_result_records(file_path, errors=errors, dictionary=dictionary)
+        )
+        stats = self.archive.compact(date_str, records, dictionary.encode)
+        self._log_parse_errors(compacting_file, errors)
+        
+        if compacted_size:
+            self._drop_compacted(compacting_file, compacted_size)
+        
+        self.logger.info(
+            f"{date_str} 결과 압축 완료: {stats['input_records']}건 → {stats['output_records']}건 "
+            f"({stats['blocks']}개 블록, {stats['size_mb']} MB)"
+        )
+        return stats
+    
+    def _drop_compacted(self, compacting_file, compacted_size):
+        """
+        압축한 부분만 삭제 (이름을 옮기기 직전에 열린 쓰기가 압축 중에 덧붙인 뒷부분은 남김)
+        """
+        if os.path.getsize(compacting_file) <= compacted_size:
+            os.remove(compacting_file)
+            return
+        
+        with open(compacting_file, 'rb') as src, open(f"{compacting_file}.tmp", 'wb') as dst:
+            src.seek(compacted_size)
+            shutil.copyfileobj(src, dst)
+        os.replace(f"{compacting_file}.tmp", compacting_file)
+    
+    def replace_results(self, date_str, records):
+        """
+        날짜별 결과 전체 교체 (임시 파일에 쓴 뒤 교체, 압축 파일/인덱스는 삭제)
+        
+        Args:
+            records: 새 결과 레코드 (디코딩된 dict, iter_records가 붙인 '분석_날짜'는 제외하고 저장)
+        
+        Returns:
+            int: 저장한 레코드 수
+        """
+        dictionary = self.get_host_dictionary(date_str)
+        results_file = self.get_results_file(date_str)
+        tmp_file = f"{results_file}.tmp"
+        count = 0
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for record in records:
+                record = dictionary.encode(record)
+                record.pop('분석_날짜', None)
+                json.dump(record, f, ensure_ascii=False, default=str)
+                f.write('\n')
+                count += 1
+        os.replace(tmp_file, results_file)
+        
+        for file_path in (
+            self.archive.compacted_file(date_str),
+            self.archive.index_file(date_str),
+            self.get_compacting_file(date_str),
+        ):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        return count
+    
+    def find(self, ip=None, url=None, harmful=None, dates=None):
+        """
+        조건에 맞는 분석 결과 조회 (압축된 날짜는 인덱스로 필요한 블록만 읽음)
+        
+        압축과 같은 키(record_key)로 중복을 제거하며 나중에 기록된 레코드가 유효
+        (압축 이후 추가된 결과는 조건과 관계없이 먼저 읽어 압축 파일의 이전 레코드를 가림)
+        
+        Args:
+            ip: 사용자 IP
+            url: 추적 URL
+            harmful: 유해 접속 여부 (0/1)
+            dates: 날짜 리스트, None이면 결과가 있는 전체 날짜
+        
+        Returns:
+            pandas.DataFrame: 조회 결과
+        """
+        import pandas as pd
+        
+        criteria = {
+            field: value for field, value in (
+                ('사용자 IP', ip), ('추적 URL', url), ('유해 접속 여부', harmful)
+            ) if value is not None
+        }
+        
+        def matches(record):
+            return all(record.get(field) == value for field, value in criteria.items())
+        
+        records = []
+        for date_str in (dates if dates is not None else self.get_available_dates()):
+            dictionary = self.get_host_dictionary(date_str)
+            
+            # 압축 이후 추가된 결과 (또는 압축되지 않은 날짜), 키별 마지막 레코드
+            latest = {}
+            for file_path in (self.get_compacting_file(date_str), self.get_results_file(date_str)):
+                if os.path.exists(file_path):
+                    for record in _iter_result_records(file_path, dictionary=dictionary):
+                        latest[record_key(record)] = record
+            
+            index = self.archive.load_index(date_str)
+            if index is not None and os.path.exists(self.archive.compacted_file(date_str)):
+                block_ids = self.archive.candidate_blocks(index, criteria)
+                for record in self.archive.read_blocks(date_str, index, block_ids):
+                    if matches(dictionary.decode(record)) and record_key(record) not in latest:
+                        record['분석_날짜'] = date_str
+                        records.append(record)
+            
+            records.extend(record for record in latest.values() if matches(record))
+        
+        return pd.DataFrame(records) if records else pd.DataFrame()
@@ -0,0 +1,135 @@
+"""
+결과 레코드 호스트 사전 인코딩 모듈 (날짜별 관리)
+
+결과 레코드의 호스트 문자열(추적 URL, 접속 Top URL, 유해 URL 리스트)을 날짜별 호스트
+사전(hosts_<date>.txt, 한 줄에 호스트 하나, 줄 번호가 id)의 정수 id로 저장
+(쌍별 호스트 요약(pair_summary)도 같은 사전 사용)
+
+- 사전은 추가 전용이며 새 호스트는 그 호스트를 참조하는 레코드보다 먼저 기록됨
+- 디코딩은 정수 값만 변환하므로 문자열로 저장된 이전 레코드도 그대로 읽힘
+- 날짜당 결과를 기록하는 프로세스는 하나라고 가정 (체크포인트와 동일)
+"""
+
+import os
+
+
+# 호스트 하나를 저장하는 필드
+HOST_FIELDS = ['추적 URL', '접속 Top URL']
+
+# 호스트 리스트를 저장하는 필드
+HOST_LIST_FIELDS = ['유해 URL 리스트']
+
+
+def host_dictionary_file(date_dir):
+    """날짜 디렉토리의 호스트 사전 파일 경로"""
+    return os.path.join(date_dir, f"hosts_{os.path.basename(os.path.normpath(date_dir))}.txt")
+
+
+class HostDictionary:
+    """날짜별 호스트 사전 (파일에 추가된 호스트는 필요할 때 다시 읽음)"""
+
+    def __init__(self, file_path):
+        """
+        Args:
+            file_path: 호스트 사전 파일 경로
+        """
+        self.file_path = file_path
+        self.hosts = []
+        self.ids = {}
+        self._offset = 0
+
+    def refresh(self):
+        """파일에 새로 추가된 호스트 읽기 (끝이 잘린 마지막 줄은 제외)"""
+        try:
+            size = os.path.getsize(self.file_path)
+        except FileNotFoundError:
+            size = 0
+        if size < self._offset:
+            # 결과 초기화로 사전이 지워졌으면 처음부터 다시 읽음
+            self.hosts, self.ids, self._offset = [], {}, 0
+        if size == self._offset:
+            return
+
+        with open(self.file_path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        end = data.rfind(b'\n') + 1
+        for host in data[:end].decode('utf-8').split('\n')[:-1]:
+            self.ids.setdefault(host, len(self.hosts))
+            self.hosts.append(host)
+        self._offset += end
+
+    def host(self, host_id):
+        """id에 해당하는 호스트"""
+        if host_id >= len(self.hosts):
+            self.refresh()
+            if host_id >= len(self.hosts):
+                raise ValueError(f"호스트 사전에 없는 id {host_id}: {self.file_path}")
+        return self.hosts[host_id]
+
+    def encode(self, record):
+        """
+        레코드의 호스트 문자열을 id로 바꾼 복사본 반환 (새 호스트는 사전 파일에 먼저 기록)
+
+        Returns:
+            dict: 인코딩된 레코드
+        """
+        self.refresh()
+        new_hosts = []
+
+        encoded = dict(record)
+        for field in HOST_FIELDS:
+            if field in encoded:
+                encoded[field] = self._host_id(encoded[field], new_hosts)
+        for field in HOST_LIST_FIELDS:
+            if isinstance(encoded.get(field), list):
+                encoded[field] = [self._host_id(host, new_hosts) for host in encoded[field]]
+
+        if new_hosts:
+            self._append(new_hosts)
+        return encoded
+
+    def encode_hosts(self, hosts):
+        """호스트 리스트를 id 리스트로 변환 (새 호스트는 사전 파일에 먼저 기록)"""
+        self.refresh()
+        new_hosts = []
+        ids = [self._host_id(host, new_hosts) for host in hosts]
+        if new_hosts:
+            self._append(new_hosts)
+        return ids
+
+    def _host_id(self, host, new_hosts):
+        """호스트 id (처음 보는 호스트는 사전에 추가하고 new_hosts에 기록, 문자열이 아니면 그대로)"""
+        if not isinstance(host, str):
+            return host
+        if host not in self.ids:
+            self.ids[host] = len(self.hosts)
+            self.hosts.append(host)
+            new_hosts.append(host)
+        return self.ids[host]
+
+    def _append(self, hosts):
+        """사전 파일에 호스트 추가 (중단으로 끝이 잘린 줄이 있으면 먼저 잘라냄)"""
+        data = ''.join(f"{host}\n" for host in hosts).encode('utf-8')
+        with open(self.file_path, 'ab') as f:
+            if f.tell() != self._offset:
+                f.truncate(self._offset)
+            f.write(data)
+        self._offset += len(data)
+
+    def decode(self, record):
+        """
+        레코드의 호스트 id를 문자열로 변환 (레코드를 직접 수정, 문자열 값은 그대로)
+
+        Returns:
+            dict: 디코딩된 레코드
+        """
+        for field in HOST_FIELDS:
+            value = record.get(field)
+            if isinstance(value, int):
+                record[field] = self.host(value)
+        for field in HOST_LIST_FIELDS:
+            value = record.get(field)
+            if value and isinstance(value, list):
+                record[field] = [self.host(host) if isinstance(host, int) else host for host in value]
+        return record
@@ -0,0 +1,136 @@
+"""
+증분(intraday) 실행 상태 관리 모듈 (날짜별 관리)
+
+- 워터마크: 이 시각 이하의 이벤트는 모두 반영됨
+- 열린 쌍: 추적 URL 방문 이후 윈도우가 아직 닫히지 않은 (URL, IP) 쌍의 윈도우 이벤트를
+  run 단위((호스트, 카테고리, 첫 시각, 마지막 시각, 건수))로 압축해 보관하고,
+  마지막 잠정 결과를 함께 보관 (바뀐 쌍만 다시 분석)
+- 닫힌 쌍: 최종 결과를 결과 파일에 기록한 쌍 (다시 열지 않음)
+- 재조회 IP: 조회에 실패한 IP와 그 IP의 이벤트를 마지막으로 반영한 시각
+  (다음 실행에서 그 시각 이후부터 다시 조회하므로 이벤트가 누락되지 않음)
+"""
+
+import json
+import os
+from datetime import datetime
+
+
+def incremental_state_file(date_dir):
+    """날짜 디렉토리의 증분 상태 파일 경로"""
+    return os.path.join(date_dir, f"incremental_{os.path.basename(os.path.normpath(date_dir))}.json")
+
+
+class IncrementalState:
+    """증분 실행 상태 관리자 (날짜별 관리)"""
+
+    def __init__(self, output_dir, analysis_date):
+        """
+        Args:
+            output_dir: 출력 디렉토리
+            analysis_date: 분석 날짜 (YYYY-MM-DD)
+        """
+        self.analysis_date = analysis_date
+        self.date_dir = os.path.join(output_dir, analysis_date)
+        self.state_file = incremental_state_file(self.date_dir)
+        self.open_results_file = os.path.join(self.date_dir, f"open_windows_{analysis_date}.jsonl")
+        os.makedirs(self.date_dir, exist_ok=True)
+        self.reset()
+
+    def reset(self, windows_hours=None):
+        """빈 상태로 초기화"""
+        self.watermark = None
+        self.windows_hours = windows_hours
+        self.pairs = {}
+        self.closed = {}
+        self.retry_ips = {}
+        self.refreshes = []
+
+    def load(self):
+        """
+        상태 파일 로드
+
+        Returns:
+            bool: 상태 파일이 있었는지 여부
+        """
+        if not os.path.exists(self.state_file):
+            return False
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.watermark = state.get('watermark')
+        self.windows_hours = state.get('windows_hours')
+        self.pairs = state.get('pairs', {})
+        self.closed = {url: set(ips) for url, ips in state.get('closed', {}).items()}
+        self.retry_ips = state.get('retry_ips', {})
+        self.refreshes = state.get('refreshes', [])
+        return True
+
+    def save(self):
+        """상태 파일 저장 (원자적 교체)"""
+        state = {
+            'analysis_date': self.analysis_date,
+            'watermark': self.watermark,
+            'windows_hours': self.windows_hours,
+            'updated_at': datetime.now().isoformat(),
+            'pairs': self.pairs,
+            'closed': {url: sorted(ips) for url, ips in self.closed.items()},
+            'retry_ips': self.retry_ips,
+            'refreshes': self.refreshes[-100:],
+        }
+        with open(f"{self.state_file}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(f"{self.state_file}.tmp", self.state_file)
+
+    def clear(self):
+        """상태 파일과 열린 윈도우 결과 파일 삭제"""
+        for file_path in (self.state_file, self.open_results_file):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        self.reset()
+
+    def get_pair(self, url, ip):
+        """열린 쌍 상태 (없으면 None)"""
+        return self.pairs.get(url, {}).get(ip)
+
+    def open_pair(self, url, ip, tracker_ts):
+        """추적 URL 첫 방문으로 쌍 열기"""
+        pair = {'tracker_ts': tracker_ts, 'window_start': None, 'runs': [], 'results': None}
+        self.pairs.setdefault(url, {})[ip] = pair
+        return pair
+
+    def close_pair(self, url, ip):
+        """쌍 닫기 (최종 결과 기록 후)"""
+        self.pairs.get(url, {}).pop(ip, None)
+        if url in self.pairs and not self.pairs[url]:
+            del self.pairs[url]
+        self.closed.setdefault(url, set()).add(ip)
+
+    def is_tracked(self, url, ip):
+        """열렸거나 닫힌 쌍인지 여부"""
+        return ip in self.pairs.get(url, {}) or ip in self.closed.get(url, ())
+
+    def tracked_count(self, url):
+        """URL별 열린/닫힌 쌍 수"""
+        return len(self.pairs.get(url, {})) + len(self.closed.get(url, ()))
+
+    def iter_open_pairs(self):
+        """열린 쌍 순회 ((url, ip, 상태))"""
+        for url, ips in self.pairs.items():
+            for ip, pair in ips.items():
+                yield url, ip, pair
+
+    def write_open_results(self):
+        """열린 쌍들의 잠정 결과를 열린 윈도우 결과 파일에 다시 기록"""
+        with open(f"{self.open_results_file}.tmp", 'w', encoding='utf-8') as f:
+            for _, _, pair in self.iter_open_pairs():
+                for result in pair.get('results') or []:
+                    json.dump(result, f, ensure_ascii=False, default=str)
+                    f.write('\n')
+        os.replace(f"{self.open_results_file}.tmp", self.open_results_file)
+
+    def open_pair_count(self):
+        """열린 쌍 수"""
+        return sum(len(ips) for ips in self.pairs.values())
+
+    def closed_pair_count(self):
+        """닫힌 쌍 수"""
+        return sum(len(ips) for ips in self.closed.values())
@@ -2,82 +2,160 @@
 로깅 설정 모듈 - 날짜별 로그 파일 관리
 """
 
+import atexit
+import json
 import logging
 import os
+import queue
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+# LogRecord 기본 속성 (이외의 속성은 extra로 전달된 구조화 필드)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 형식 로그 포매터 (extra 필드 포함)"""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != 'progress_file':
+                data[key] = value
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class ProgressFileHandler(logging.Handler):
+    """progress_file 필드가 있는 레코드를 날짜별 진행 파일에 기록"""
+
+    def __init__(self):
+        super().__init__()
+        self._files = {}
+
+    def emit(self, record):
+        path = getattr(record, 'progress_file', None)
+        if not path:
+            return
+        try:
+            f = self._files.get(path)
+            # 결과 초기화 등으로 파일이 지워졌으면 다시 열기
+            if f is None or not os.path.exists(path):
+                if f is not None:
+                    f.close()
+                f = self._files[path] = open(path, 'a', encoding='utf-8')
+            timestamp = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"[{timestamp}] {record.getMessage()}\n")
+            f.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+        super().close()
 
 
 class DateBasedLogger:
-    """날짜별 로그 파일을 생성하는 로거"""
-    
+    """
+    날짜별 로그 파일을 생성하는 로거
+
+    호출 스레드는 QueueHandler로 레코드를 넣기만 하고, 파일(JSON)/콘솔/진행 파일 기록은
+    백그라운드 QueueListener 스레드가 처리
+    """
+
     def __init__(self, name="url_analysis", log_dir="logs"):
         self.name = name
         self.log_dir = log_dir
         self.logger = None
+        self.listener = None
+        self.pid = os.getpid()
         self._setup_logger()
-    
+
     def _setup_logger(self):
         """로거 설정"""
         # 로그 디렉토리 생성
         os.makedirs(self.log_dir, exist_ok=True)
-        
-        # 오늘 날짜로 로그 파일명 생성
+
+        # 오늘 날짜로 로그 파일명 생성 (한 줄 JSON 레코드)
         today = datetime.now().strftime('%Y-%m-%d')
-        log_file = os.path.join(self.log_dir, f"{self.name}_{today}.log")
-        
+        log_file = os.path.join(self.log_dir, f"{self.name}_{today}.jsonl")
+
         # 로거 생성
         self.logger = logging.getLogger(f"{self.name}_{today}")
-        
+
         # 이미 핸들러가 있으면 제거 (중복 방지)
         if self.logger.handlers:
             self.logger.handlers.clear()
-        
+
         self.logger.setLevel(logging.INFO)
-        
+        self.logger.propagate = False
+
         # 파일 핸들러 설정 (최대 10MB, 5개 백업 파일)
         file_handler = RotatingFileHandler(
-            log_file, 
+            log_file,
             maxBytes=10*1024*1024,  # 10MB
             backupCount=5,
             encoding='utf-8'
         )
-        
+        file_handler.setFormatter(JsonFormatter())
+
         # 콘솔 핸들러 설정
         console_handler = logging.StreamHandler()
-        
-        # 포매터 설정
-        formatter = logging.Formatter(
+        console_handler.setFormatter(logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+
+        # 호출 스레드에서는 큐에 넣기만 함
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(log_queue))
+        self.listener = QueueListener(
+            log_queue, file_handler, console_handler, ProgressFileHandler(),
+            respect_handler_level=True
         )
-        
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # 핸들러 추가
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-    
-    def info(self, message):
-        """정보 레벨 로그"""
-        self.logger.info(message)
-    
-    def error(self, message):
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """대기 중인 로그를 모두 기록하고 백그라운드 기록 스레드 종료"""
+        if self.listener is not None and self.pid == os.getpid():
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+
+    def is_enabled_for(self, level):
+        """해당 레벨 로그가 기록되는지 여부"""
+        return self.logger.isEnabledFor(level)
+
+    def info(self, message, **fields):
+        """정보 레벨 로그 (fields는 구조화 필드로 기록)"""
+        self.logger.info(message, extra=fields)
+
+    def error(self, message, **fields):
         """에러 레벨 로그"""
-        self.logger.error(message)
-    
-    def warning(self, message):
+        self.logger.error(message, extra=fields)
+
+    def warning(self, message, **fields):
         """경고 레벨 로그"""
-        self.logger.warning(message)
-    
-    def debug(self, message):
+        self.logger.warning(message, extra=fields)
+
+    def debug(self, message, **fields):
         """디버그 레벨 로그"""
-        self.logger.debug(message)
-    
-    def critical(self, message):
+        self.logger.debug(message, extra=fields)
+
+    def critical(self, message, **fields):
         """크리티컬 레벨 로그"""
-        self.logger.critical(message)
+        self.logger.critical(message, extra=fields)
 
 
 # 전역 로거 인스턴스
@@ -85,9 +163,9 @@ _global_logger = None
 
 
 def get_logger(name="url_analysis", log_dir="logs"):
-    """전역 로거 인스턴스 반환"""
+    """전역 로거 인스턴스 반환 (fork된 작업 프로세스에서는 새 기록 스레드로 다시 생성)"""
     global _global_logger
-    if _global_logger is None:
+    if _global_logger is None or _global_logger.pid != os.getpid():
         _global_logger = DateBasedLogger(name, log_dir)
     return _global_logger
 
@@ -95,5 +173,7 @@ def get_logger(name="url_analysis", log_dir="logs"):
 def setup_logging(log_dir="logs"):
     """로깅 초기 설정"""
     global _global_logger
+    if _global_logger is not None:
+        _global_logger.stop()
     _global_logger = DateBasedLogger("url_analysis", log_dir)
-    return _global_logger
\ No newline at end of file
+    return _global_logger
@@ -0,0 +1,77 @@
+"""
+쌍별 호스트 요약 저장 모듈 (날짜별 관리)
+
+(URL, IP) 쌍의 분석 구간을 연속 동일 호스트 run((호스트 id, 카테고리, 첫 시각, 마지막 시각, 건수))으로
+압축해 pair_summaries_<date>.jsonl에 한 줄씩 저장. URLAnalyzer는 run 단위 프레임으로 레코드 단위와
+같은 결과를 계산하므로, 카테고리 규칙(HARMFUL_CATEGORIES/SAFE_CATEGORIES)이나 HIMS 카테고리가
+바뀌어도 ES를 다시 조회하지 않고 결과를 다시 계산할 수 있음
+
+- 호스트는 결과 파일과 같은 날짜별 호스트 사전(host_dictionary) id로 저장
+- 같은 쌍이 여러 번 저장되면 마지막 줄이 유효 (재시작으로 다시 분석된 쌍)
+"""
+
+import json
+import os
+
+
+def pair_summaries_file(date_dir):
+    """날짜 디렉토리의 쌍별 호스트 요약 파일 경로"""
+    return os.path.join(date_dir, f"pair_summaries_{os.path.basename(os.path.normpath(date_dir))}.jsonl")
+
+
+class PairSummaryStore:
+    """쌍별 호스트 요약 저장소 (날짜별)"""
+
+    def __init__(self, file_manager):
+        """
+        Args:
+            file_manager: 날짜별 디렉토리와 호스트 사전을 제공하는 FileManager
+        """
+        self.file_manager = file_manager
+        self.output_dir = file_manager.output_dir
+
+    def summaries_file(self, date_str=None):
+        """날짜별 요약 파일 경로 (None이면 현재 날짜)"""
+        date_str = date_str or self.file_manager.analysis_date
+        return pair_summaries_file(os.path.join(self.output_dir, date_str))
+
+    def save(self, url, ip, summary):
+        """
+        쌍 요약 저장 (현재 날짜)
+
+        Args:
+            summary: PairAnalysis.summarize 결과
+        """
+        dictionary = self.file_manager.get_host_dictionary()
+        host_ids = dictionary.encode_hosts([run[0] for run in summary['runs']])
+        record = dictionary.encode({'추적 URL': url, '사용자 IP': ip})
+        record.update(summary, runs=[[host_id] + run[1:] for host_id, run in zip(host_ids, summary['runs'])])
+
+        with open(self.summaries_file(), 'a', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+            f.write('\n')
+
+    def load(self, date_str=None):
+        """
+        날짜별 쌍 요약 로드 (중단으로 잘린 줄은 건너뜀)
+
+        Returns:
+            dict: {(URL, IP): 요약} - 요약의 호스트는 문자열로 변환됨
+        """
+        date_str = date_str or self.file_manager.analysis_date
+        summaries_file = self.summaries_file(date_str)
+        if not os.path.exists(summaries_file):
+            return {}
+
+        dictionary = self.file_manager.get_host_dictionary(date_str)
+        summaries = {}
+        with open(summaries_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                dictionary.decode(record)
+                record['runs'] = [[dictionary.host(run[0])] + run[1:] for run in record['runs']]
+                summaries[(record.pop('추적 URL'), record.pop('사용자 IP'))] = record
+        return summaries
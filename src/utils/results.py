@@ -0,0 +1,187 @@
+"""
+분석 결과 조회/관리 모듈 (ES/HIMS 클라이언트와 config.ini 없이 사용 가능)
+"""
+
+from .checkpoint import CheckpointManager
+from .file_manager import FileManager
+from .incremental import IncrementalState
+from .rollup import RollupManager
+
+
+class AnalysisResults:
+    """저장된 분석 결과 조회/관리자 (날짜별)"""
+    
+    def __init__(self, output_dir, analysis_date=None, file_manager=None, checkpoint_manager=None):
+        """
+        Args:
+            output_dir: 결과 디렉토리
+            analysis_date: 기준 분석 날짜 (YYYY-MM-DD), None이면 오늘 날짜
+            file_manager: 공유할 FileManager (없으면 생성)
+            checkpoint_manager: 공유할 CheckpointManager (없으면 생성)
+        """
+        self.file_manager = file_manager or FileManager(output_dir, analysis_date)
+        self.checkpoint_manager = checkpoint_manager or CheckpointManager(output_dir, analysis_date)
+        self.rollup_manager = RollupManager(self.file_manager)
+        self.analysis_date = self.file_manager.analysis_date
+    
+    def get_status(self, specific_date=None):
+        """
+        날짜별 진행 상태 (체크포인트 + 결과 파일 정보)
+        
+        Args:
+            specific_date: 조회할 날짜, None이면 기준 날짜
+        """
+        target_date = specific_date or self.analysis_date
+        checkpoint_info = self.checkpoint_manager.get_checkpoint_info(target_date)
+        date_info = self.file_manager.get_date_info(target_date)
+        
+        return {
+            'date': target_date,
+            'checkpoint': checkpoint_info,
+            'records': date_info['total_records'],
+            'size_mb': date_info['file_size_mb'],
+        }
+    
+    def get_analysis_summary(self, date_range=None, exact=False):
+        """
+        분석 결과 요약 (날짜별)
+        
+        기본적으로 날짜별 rollup을 병합하여 계산하며, 고유 IP 수는 HyperLogLog
+        추정값 (표준 오차 약 1.6%)
+        
+        Args:
+            date_range: 조회할 날짜 범위 리스트, None이면 현재 날짜만
+            exact: True면 결과 파일을 스트리밍하여 정확한 고유 개수 계산
+        """
+        dates = date_range or [self.analysis_date]
+        
+        if exact:
+            totals = self.file_manager.summarize_results(date_range)
+        else:
+            totals = self.rollup_manager.summarize(dates)
+        
+        if not totals['total_records']:
+            return "분석 결과가 없습니다."
+        
+        summary = {
+            "분석 날짜": dates,
+            "총 분석 건수": totals['total_records'],
+            "고유 URL 수": totals['unique_urls'],
+            "고유 IP 수": totals['unique_ips'],
+            "유해 접속 건수": totals['harmful_records'],
+            "날짜별 건수": totals['daily_counts'],
+        }
+        
+        if not exact:
+            summary["고유 유해 호스트 수"] = totals['unique_harmful_hosts']
+            summary["고유 개수 표준 오차"] = f"±{totals['relative_error'] * 100:.1f}%"
+        
+        return summary
+    
+    def get_top_harmful_hosts(self, date_range=None, top=10, urls=None):
+        """
+        가장 많이 접속된 유해 호스트 (날짜별 rollup의 Space-Saving 스케치 병합, 결과 파일은 읽지 않음)
+        
+        건수는 호스트에 접속한 (추적 URL, IP) 쌍 수 (윈도우/세션이 여러 개여도 쌍마다 한 번)
+        
+        Args:
+            date_range: 조회할 날짜 범위 리스트, None이면 현재 날짜만
+            top: 반환할 호스트 수
+            urls: 추적 URL 리스트, None이면 전체
+        """
+        dates = date_range or [self.analysis_date]
+        totals = self.rollup_manager.top_harmful_hosts(dates, k=top, urls=urls)
+        
+        if not totals['total_hits']:
+            return "유해 호스트 접속 기록이 없습니다."
+        
+        return {
+            "분석 날짜": dates,
+            "추적 URL": urls or "전체",
+            "유해 호스트 접속 수": totals['total_hits'],
+            "목록 밖 호스트 최대 건수": totals['untracked_max_count'],
+            "상위 유해 호스트": [
+                {"호스트": item['host'], "건수": item['count'], "오차": item['error']}
+                for item in totals['top']
+            ],
+        }
+    
+    def clear_data(self, specific_date=None, clear_all=False):
+        """
+        데이터 초기화
+        
+        Args:
+            specific_date: 특정 날짜만 삭제 (YYYY-MM-DD)
+            clear_all: 모든 날짜 삭제 여부
+        """
+        if clear_all:
+            self.file_manager.clear_all_results()
+            print("모든 날짜의 데이터가 삭제되었습니다.")
+        else:
+            target_date = specific_date or self.analysis_date
+            self.file_manager.clear_results(target_date)
+            self.checkpoint_manager.clear_checkpoint(target_date)
+            # 증분 상태가 남으면 다음 증분 실행이 닫힌 쌍을 건너뜀
+            IncrementalState(self.file_manager.output_dir, target_date).clear()
+            print(f"{target_date} 날짜의 데이터가 삭제되었습니다.")
+    
+    def compact_results(self, date_range=None):
+        """
+        결과 압축 및 인덱스 생성
+        
+        Args:
+            date_range: 압축할 날짜 리스트, None이면 현재 날짜만
+        """
+        return [
+            stats for stats in (
+                self.file_manager.compact_results(date_str)
+                for date_str in (date_range or [self.analysis_date])
+            ) if stats
+        ]
+    
+    def get_available_dates(self):
+        """분석 가능한 날짜 목록 반환"""
+        return {
+            'analysis_dates': self.file_manager.get_available_dates(),
+            'checkpoint_dates': self.checkpoint_manager.get_available_checkpoint_dates()
+        }
+    
+    def get_daily_summary(self):
+        """날짜별 요약 정보"""
+        file_summary = self.file_manager.get_daily_summary()
+        checkpoint_summary = self.checkpoint_manager.get_all_checkpoints_summary()
+        
+        # 날짜별로 병합
+        combined = {}
+        
+        # 파일 정보 추가
+        for item in file_summary:
+            date = item['date']
+            combined[date] = {
+                'date': date,
+                'records': item['records'],
+                'size_mb': item['size_mb'],
+                'has_checkpoint': False,
+                'progress': 0,
+                'status': 'completed' if item['records'] > 0 else 'no_data'
+            }
+        
+        # 체크포인트 정보 추가
+        for item in checkpoint_summary:
+            date = item['date']
+            if date in combined:
+                combined[date]['has_checkpoint'] = True
+                combined[date]['progress'] = item['progress']
+                combined[date]['status'] = 'in_progress' if item['progress'] < 100 else 'completed'
+            else:
+                combined[date] = {
+                    'date': date,
+                    'records': 0,
+                    'size_mb': 0,
+                    'has_checkpoint': True,
+                    'progress': item['progress'],
+                    'status': 'in_progress'
+                }
+        
+        return sorted(combined.values(), key=lambda x: x['date'], reverse=True)
+
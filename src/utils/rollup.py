@@ -0,0 +1,267 @@
+"""
+일별 집계(rollup) 관리 모듈
+
+집계 단위는 (추적 URL, IP) 쌍: 여러 시간 윈도우/세션 결과가 있는 쌍은 가장 긴 윈도우의 결과만
+한 번 집계 (유해 여부는 세션 중 하나라도 유해, 유해 호스트는 세션들의 합집합)
+"""
+
+import json
+import os
+from datetime import datetime
+from .archive import record_key
+from .sketches import HyperLogLog, SpaceSaving
+
+
+ROLLUP_COLUMNS = ['추적 URL', '사용자 IP', '유해 접속 여부', '유해 URL 리스트', '시간 윈도우(시간)', '세션 번호']
+# 집계 방식이 바뀌면 올려서 이전 rollup을 다시 생성
+ROLLUP_VERSION = 3
+
+
+def iter_pair_records(records):
+    """
+    결과 레코드를 쌍 단위로 묶어 (URL, IP, 유해 여부, 유해 호스트 리스트) 순회
+
+    FileManager.find와 같이 record_key로 중복을 제거하며 나중에 기록된 레코드가 유효
+    (레코드 순서와 관계없이 묶으므로 한 날짜의 레코드를 모두 읽은 뒤 순회, 메모리는 레코드 수에 비례)
+    """
+    pairs = {}
+    for record in records:
+        key = (record['추적 URL'], record['사용자 IP'])
+        pairs.setdefault(key, {})[record_key(record)] = (
+            record.get('시간 윈도우(시간)') or 0,
+            record['유해 접속 여부'] == 1,
+            record['유해 URL 리스트'] or [],
+        )
+
+    for (url, ip), latest in pairs.items():
+        window = max(record_window for record_window, _, _ in latest.values())
+        harmful = False
+        hosts = {}
+        for record_window, record_harmful, record_hosts in latest.values():
+            if record_window == window:
+                harmful = harmful or record_harmful
+                hosts.update(dict.fromkeys(record_hosts))
+        yield url, ip, harmful, list(hosts)
+
+
+
+class RollupManager:
+    """날짜별/추적 URL별 집계 관리자"""
+
+    def __init__(self, file_manager, precision=12, top_capacity=256):
+        """
+        Args:
+            file_manager: 결과 파일을 제공하는 FileManager
+            precision: HyperLogLog 정밀도 (레지스터 2^precision개)
+            top_capacity: 유해 호스트 상위 항목 스케치(Space-Saving) 크기
+        """
+        self.file_manager = file_manager
+        self.output_dir = file_manager.output_dir
+        self.precision = precision
+        self.top_capacity = top_capacity
+
+    def _rollup_file(self, date_str):
+        """날짜별 rollup 파일 경로"""
+        return os.path.join(self.output_dir, date_str, f"rollup_{date_str}.json")
+
+    def build_rollup(self, date_str):
+        """
+        날짜별 결과 파일을 한 번 스트리밍하여 rollup 생성 (records/harmful_records는 쌍 수)
+
+        Returns:
+            dict: rollup (결과 파일이 없으면 None)
+        """
+        signature = self.file_manager.get_results_signature(date_str)
+        if not signature:
+            return None
+
+        ips = HyperLogLog(self.precision)
+        harmful_hosts = HyperLogLog(self.precision)
+        urls = {}
+        records = 0
+        harmful_records = 0
+
+        for url, ip, harmful, hosts in iter_pair_records(self.file_manager.iter_records([date_str], ROLLUP_COLUMNS)):
+            if url not in urls:
+                urls[url] = {
+                    'records': 0,
+                    'harmful_records': 0,
+                    'ips': HyperLogLog(self.precision),
+                    'harmful_hosts': HyperLogLog(self.precision),
+                    'harmful_top': SpaceSaving(self.top_capacity),
+                }
+            url_rollup = urls[url]
+            url_rollup['records'] += 1
+            url_rollup['harmful_records'] += int(harmful)
+            url_rollup['ips'].add(ip)
+            url_rollup['harmful_hosts'].update(hosts)
+            url_rollup['harmful_top'].update(hosts)
+
+            records += 1
+            harmful_records += int(harmful)
+            ips.add(ip)
+            harmful_hosts.update(hosts)
+
+        return {
+            'analysis_date': date_str,
+            'version': ROLLUP_VERSION,
+            'created_at': datetime.now().isoformat(),
+            'source_size': signature,
+            'records': records,
+            'harmful_records': harmful_records,
+            'ips': ips.to_dict(),
+            'harmful_hosts': harmful_hosts.to_dict(),
+            # 날짜 전체 상위 호스트는 추적 URL별 스케치 병합 (호스트마다 스케치 갱신은 한 번)
+            'harmful_top': SpaceSaving.union(
+                (url_rollup['harmful_top'] for url_rollup in urls.values()), self.top_capacity
+            ).to_dict(),
+            'urls': {
+                url: {
+                    'records': url_rollup['records'],
+                    'harmful_records': url_rollup['harmful_records'],
+                    'ips': url_rollup['ips'].to_dict(),
+                    'harmful_hosts': url_rollup['harmful_hosts'].to_dict(),
+                    'harmful_top': url_rollup['harmful_top'].to_dict(),
+                }
+                for url, url_rollup in urls.items()
+            },
+        }
+
+    def write_rollup(self, date_str=None):
+        """rollup 생성 후 저장 (임시 파일에 쓴 뒤 교체)"""
+        date_str = date_str or self.file_manager.analysis_date
+        rollup = self.build_rollup(date_str)
+        if rollup is None:
+            return None
+
+        rollup_file = self._rollup_file(date_str)
+        tmp_file = f"{rollup_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(rollup, f, ensure_ascii=False)
+        os.replace(tmp_file, rollup_file)
+        return rollup
+
+    def load_rollup(self, date_str):
+        """
+        rollup 로드 (없거나 결과 파일이 바뀌었으면 다시 생성)
+
+        Returns:
+            dict: rollup (결과가 없는 날짜면 None)
+        """
+        signature = self.file_manager.get_results_signature(date_str)
+        if not signature:
+            return None
+
+        rollup_file = self._rollup_file(date_str)
+        if os.path.exists(rollup_file):
+            try:
+                with open(rollup_file, 'r', encoding='utf-8') as f:
+                    rollup = json.load(f)
+                # 집계 방식이 바뀌기 전에 만든 rollup은 다시 생성
+                if rollup.get('source_size') == signature and rollup.get('version') == ROLLUP_VERSION:
+                    return rollup
+            except json.JSONDecodeError:
+                pass
+
+        return self.write_rollup(date_str)
+
+    def summarize(self, date_range, per_url=False):
+        """
+        날짜 범위 요약 (rollup 병합)
+
+        고유 IP/유해 호스트 수는 HyperLogLog 추정값 (상대 오차는 relative_error 참고)
+
+        Args:
+            date_range: 날짜 리스트
+            per_url: 추적 URL별 집계 포함 여부
+
+        Returns:
+            dict: 요약 집계
+        """
+        ips = []
+        harmful_hosts = []
+        urls = {}
+        daily_counts = {}
+        records = 0
+        harmful_records = 0
+
+        for date_str in date_range:
+            rollup = self.load_rollup(date_str)
+            if not rollup or not rollup['records']:
+                continue
+
+            records += rollup['records']
+            harmful_records += rollup['harmful_records']
+            daily_counts[date_str] = rollup['records']
+            ips.append(HyperLogLog.from_dict(rollup['ips']))
+            harmful_hosts.append(HyperLogLog.from_dict(rollup['harmful_hosts']))
+
+            for url, url_rollup in rollup['urls'].items():
+                if url not in urls:
+                    urls[url] = {'records': 0, 'harmful_records': 0, 'ips': []}
+                urls[url]['records'] += url_rollup['records']
+                urls[url]['harmful_records'] += url_rollup['harmful_records']
+                if per_url:
+                    urls[url]['ips'].append(HyperLogLog.from_dict(url_rollup['ips']))
+
+        ips = HyperLogLog.union(ips, self.precision)
+        summary = {
+            'total_records': records,
+            'harmful_records': harmful_records,
+            'unique_urls': len(urls),
+            'unique_ips': ips.count(),
+            'unique_harmful_hosts': HyperLogLog.union(harmful_hosts, self.precision).count(),
+            'daily_counts': daily_counts,
+            'relative_error': round(ips.relative_error(), 4),
+        }
+
+        if per_url:
+            summary['per_url'] = {
+                url: {
+                    'records': url_summary['records'],
+                    'harmful_records': url_summary['harmful_records'],
+                    'harmful_rate': round(url_summary['harmful_records'] / url_summary['records'], 4),
+                    'unique_ips': HyperLogLog.union(url_summary['ips'], self.precision).count(),
+                }
+                for url, url_summary in urls.items()
+            }
+
+        return summary
+
+    def top_harmful_hosts(self, date_range, k=10, urls=None):
+        """
+        날짜 범위에서 가장 많이 접속된 유해 호스트 (날짜별/추적 URL별 Space-Saving 스케치 병합)
+
+        건수는 유해 URL 리스트에 호스트가 포함된 쌍 수의 추정값 (실제 건수의 상한)이며,
+        건수 - 오차가 하한
+
+        Args:
+            date_range: 날짜 리스트
+            k: 반환할 호스트 수
+            urls: 추적 URL 리스트, None이면 전체
+
+        Returns:
+            dict: 상위 호스트 집계
+        """
+        sketches = []
+        for date_str in date_range:
+            rollup = self.load_rollup(date_str)
+            if not rollup or not rollup['records']:
+                continue
+            if urls is None:
+                sketches.append(SpaceSaving.from_dict(rollup['harmful_top']))
+            else:
+                sketches.extend(
+                    SpaceSaving.from_dict(rollup['urls'][url]['harmful_top'])
+                    for url in urls if url in rollup['urls']
+                )
+
+        merged = SpaceSaving.union(sketches, self.top_capacity)
+        return {
+            'total_hits': merged.total,
+            'untracked_max_count': merged.min_count(),
+            'top': [
+                {'host': host, 'count': count, 'error': error}
+                for host, count, error in merged.top(k)
+            ],
+        }
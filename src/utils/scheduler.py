@@ -0,0 +1,227 @@
+"""
+시간 예산 기반 (URL, IP) 작업 스케줄러 모듈
+"""
+
+import json
+import math
+import os
+import time
+from datetime import datetime
+
+
+class CostModel:
+    """
+    (URL, IP) 쌍 처리 시간 추정 모델
+
+    처리 시간 ≈ 고정 비용 + 문서당 비용 × doc_count 를 관측값으로 온라인 회귀
+    (오래된 관측은 decay 비율로 가중치 감소), 실행 간 유지를 위해 파일에 저장
+    """
+
+    def __init__(self, history_file, default_overhead_sec=1.0, default_sec_per_doc=0.0005, decay=0.98):
+        """
+        Args:
+            history_file: 관측 통계 저장 파일
+            default_overhead_sec: 관측이 부족할 때 사용할 쌍당 고정 비용(초)
+            default_sec_per_doc: 관측이 부족할 때 사용할 문서당 비용(초)
+            decay: 새 관측마다 기존 통계에 곱할 비율
+        """
+        self.history_file = history_file
+        self.default_overhead_sec = default_overhead_sec
+        self.default_sec_per_doc = default_sec_per_doc
+        self.decay = decay
+        self.sums = {'n': 0.0, 'x': 0.0, 'y': 0.0, 'xx': 0.0, 'xy': 0.0}
+        self.samples = 0
+        self._load()
+
+    def _load(self):
+        """저장된 통계 로드"""
+        if not os.path.exists(self.history_file):
+            return
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.sums.update(data.get('sums', {}))
+            self.samples = data.get('samples', 0)
+        except (json.JSONDecodeError, OSError):
+            pass
+
+    def save(self):
+        """통계 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_file = f"{self.history_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': datetime.now().isoformat(),
+                'samples': self.samples,
+                'sums': self.sums,
+                'coefficients': self.coefficients(),
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.history_file)
+
+    def observe(self, doc_count, seconds):
+        """처리 시간 관측 추가"""
+        for key in self.sums:
+            self.sums[key] *= self.decay
+        self.sums['n'] += 1
+        self.sums['x'] += doc_count
+        self.sums['y'] += seconds
+        self.sums['xx'] += doc_count * doc_count
+        self.sums['xy'] += doc_count * seconds
+        self.samples += 1
+
+    def coefficients(self):
+        """(고정 비용, 문서당 비용) 추정값"""
+        s = self.sums
+        if self.samples < 5 or s['n'] <= 0:
+            return self.default_overhead_sec, self.default_sec_per_doc
+
+        variance = s['n'] * s['xx'] - s['x'] * s['x']
+        if variance > 0:
+            slope = (s['n'] * s['xy'] - s['x'] * s['y']) / variance
+            intercept = (s['y'] - slope * s['x']) / s['n']
+            if slope >= 0 and intercept >= 0:
+                return intercept, slope
+
+        # doc_count 차이가 없거나 회귀가 불안정하면 평균 처리 시간만 사용
+        return s['y'] / s['n'], 0.0
+
+    def estimate(self, doc_count):
+        """처리 시간 추정값(초)"""
+        overhead, per_doc = self.coefficients()
+        return overhead + per_doc * doc_count
+
+
+class PairScheduler:
+    """
+    (URL, IP) 쌍을 기대 가치/비용 순으로 정렬하여 시간 예산 안에서 실행
+
+    - 기대 가치 = 추적 URL의 과거 유해 접속 비율(평활) × log(1 + IP doc_count)
+    - 우선순위 = 기대 가치 / 추정 처리 시간
+    - 남은 시간보다 추정 시간이 긴 쌍은 건너뛰고, 마감 이후에는 새 작업을 시작하지 않음
+    - 건너뛴 쌍은 날짜별 ledger 파일(deferred_<date>.json)에 기록
+    """
+
+    def __init__(self, budget_seconds, cost_model, harmful_rates=None, prior_weight=10):
+        """
+        Args:
+            budget_seconds: 실행 시간 예산(초)
+            cost_model: CostModel
+            harmful_rates: {url: (유해 건수, 전체 건수)} 과거 집계
+            prior_weight: 전체 평균 유해 비율로 평활할 때의 가상 건수
+        """
+        self.budget_seconds = budget_seconds
+        self.cost_model = cost_model
+        self.harmful_rates = harmful_rates or {}
+        self.prior_weight = prior_weight
+        self.start_time = time.monotonic()
+
+        harmful = sum(h for h, _ in self.harmful_rates.values())
+        total = sum(n for _, n in self.harmful_rates.values())
+        # 이력이 없으면 모든 URL을 같은 가치로 취급 (IP 규모만으로 정렬)
+        self.prior_rate = (harmful + 1) / (total + 2)
+
+        self.plan = []
+        self.deferred = []
+        self._started = {}
+        self._completed = 0
+        self._pending = iter(())
+
+    def elapsed(self):
+        """시작 후 경과 시간(초)"""
+        return time.monotonic() - self.start_time
+
+    def remaining(self):
+        """남은 시간(초)"""
+        return self.budget_seconds - self.elapsed()
+
+    def url_rate(self, url):
+        """추적 URL의 평활된 유해 접속 비율"""
+        harmful, total = self.harmful_rates.get(url, (0, 0))
+        return (harmful + self.prior_weight * self.prior_rate) / (total + self.prior_weight)
+
+    def add_pairs(self, pairs):
+        """
+        작업 등록 후 우선순위로 정렬
+
+        Args:
+            pairs: [{'url', 'ip', 'doc_count'}, ...] (같은 우선순위는 입력 순서 유지)
+        """
+        for pair in pairs:
+            estimated = self.cost_model.estimate(pair['doc_count'])
+            value = self.url_rate(pair['url']) * math.log1p(pair['doc_count'])
+            self.plan.append({
+                **pair,
+                'estimated_seconds': round(estimated, 3),
+                'priority': value / max(estimated, 1e-6),
+            })
+        self.plan.sort(key=lambda entry: entry['priority'], reverse=True)
+        self._pending = iter(self.plan)
+
+    def __iter__(self):
+        """
+        예산 안에 끝날 것으로 추정되는 쌍을 우선순위 순으로 반환
+
+        추정 시간은 반환 시점의 비용 모델로 다시 계산하므로 실행 중 관측이 반영됨
+        """
+        for entry in self._pending:
+            remaining = self.remaining()
+            if remaining <= 0:
+                self._defer(entry, 'deadline')
+                continue
+
+            estimated = self.cost_model.estimate(entry['doc_count'])
+            if estimated > remaining:
+                self._defer(entry, 'budget')
+                continue
+
+            self._started[(entry['url'], entry['ip'])] = entry
+            yield entry
+
+    def _defer(self, entry, reason):
+        """연기된 쌍 기록"""
+        self.deferred.append({
+            'url': entry['url'],
+            'ip': entry['ip'],
+            'doc_count': entry['doc_count'],
+            'estimated_seconds': round(self.cost_model.estimate(entry['doc_count']), 3),
+            'priority': round(entry['priority'], 6),
+            'reason': reason,
+        })
+
+    def record(self, url, ip):
+        """처리 완료 기록 (비용 모델 관측은 RunStatus가 추가)"""
+        if self._started.pop((url, ip), None) is not None:
+            self._completed += 1
+
+    def release(self, url, ip):
+        """
+        완료되지 않은 쌍을 시작 목록에서 제거 (건너뛰었거나 실패한 쌍)
+
+        완료 건수에 포함하지 않으며 연기 목록에도 넣지 않음 (실패한 쌍은 failed_pairs_<date>.json에 기록됨)
+        """
+        self._started.pop((url, ip), None)
+
+    def finish(self):
+        """
+        실행 종료 처리 (시작되지 않았거나 중단된 쌍을 연기 목록에 추가)
+
+        Returns:
+            dict: ledger
+        """
+        reason = 'deadline' if self.remaining() <= 0 else 'interrupted'
+        for entry in self._started.values():
+            self._defer(entry, reason)
+        self._started.clear()
+        for entry in self._pending:
+            self._defer(entry, reason)
+
+        overhead, per_doc = self.cost_model.coefficients()
+        return {
+            'created_at': datetime.now().isoformat(),
+            'budget_seconds': self.budget_seconds,
+            'elapsed_seconds': round(self.elapsed(), 2),
+            'planned': len(self.plan),
+            'completed': self._completed,
+            'deferred_count': len(self.deferred),
+            'cost_model': {'overhead_sec': round(overhead, 4), 'sec_per_doc': per_doc},
+            'deferred': self.deferred,
+        }
@@ -0,0 +1,224 @@
+"""
+병합 가능한 확률적 집계(스케치) 모듈
+"""
+
+import base64
+import hashlib
+import heapq
+import math
+import zlib
+
+
+def _hash64(value):
+    """값의 64비트 해시"""
+    digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+class HyperLogLog:
+    """
+    고유 개수 추정용 HyperLogLog 스케치
+
+    - 레지스터 수 m = 2^precision, 표준 오차 약 1.04 / sqrt(m)
+      (기본 precision=12 → m=4096, 표준 오차 약 1.6%, 95% 구간 약 ±3.3%)
+    - 같은 precision끼리 레지스터별 최대값으로 병합 (날짜/URL 간 합집합)
+    - 작은 개수 구간은 linear counting으로 보정
+    """
+
+    def __init__(self, precision=12, registers=None):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+
+    def add(self, value):
+        """값 추가"""
+        h = _hash64(value)
+        index = h >> (64 - self.precision)
+        remaining = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        """여러 값 추가"""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        """다른 스케치 병합 (제자리 병합)"""
+        if other.precision != self.precision:
+            raise ValueError(f"precision 불일치: {self.precision} != {other.precision}")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    @classmethod
+    def union(cls, sketches, precision=12):
+        """여러 스케치를 한 번에 병합 (레지스터 위치별 최대값을 한 번의 순회로 계산)"""
+        sketches = list(sketches)
+        if not sketches:
+            return cls(precision)
+        if any(sketch.precision != sketches[0].precision for sketch in sketches):
+            raise ValueError("precision이 다른 스케치는 병합할 수 없습니다.")
+        if len(sketches) == 1:
+            return cls(sketches[0].precision, sketches[0].registers)
+        return cls(sketches[0].precision, map(max, *(sketch.registers for sketch in sketches)))
+
+    def count(self):
+        """고유 개수 추정값"""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        harmonic = sum(2.0 ** -r for r in self.registers)
+        estimate = alpha * self.m * self.m / harmonic
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)
+
+        return int(round(estimate))
+
+    def relative_error(self):
+        """표준 상대 오차"""
+        return 1.04 / math.sqrt(self.m)
+
+    def to_dict(self):
+        """직렬화 (레지스터는 zlib 압축 후 base64)"""
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(zlib.compress(bytes(self.registers))).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """역직렬화"""
+        registers = zlib.decompress(base64.b64decode(data['registers']))
+        return cls(data['precision'], registers)
+
+
+class SpaceSaving:
+    """
+    빈도 상위 항목(heavy hitter) 추정용 Space-Saving 스케치
+
+    - 최대 capacity개 항목의 (추정 건수, 오차)를 유지하며, 가득 차면 건수가 가장 작은
+      항목을 새 항목으로 교체 (새 항목 건수 = 교체된 건수 + 1, 오차 = 교체된 건수)
+    - 추정 건수는 실제 건수의 상한, 추정 건수 - 오차는 하한 (오차는 전체 건수/capacity 이하)
+    - 실제 건수가 전체 건수/capacity보다 큰 항목은 반드시 포함
+    - 병합은 양쪽 건수를 더하고 한쪽에 없는 항목은 그쪽 최소 건수를 더한 뒤 상위 capacity개 유지
+      (Agarwal et al., Mergeable Summaries)
+    """
+
+    def __init__(self, capacity=256, counts=None, errors=None, total=0):
+        self.capacity = capacity
+        self.counts = dict(counts or {})
+        self.errors = dict(errors or {})
+        self.total = total
+        self._heap = None
+
+    def add(self, value, weight=1):
+        """값 추가"""
+        self.total += weight
+        counts = self.counts
+        if value in counts:
+            counts[value] += weight
+            if self._heap is not None:
+                self._push(value)
+            return
+        if len(counts) < self.capacity:
+            counts[value] = weight
+            self.errors[value] = 0
+            if self._heap is not None:
+                self._push(value)
+            return
+
+        # 건수가 가장 작은 항목 교체 (힙에서 건수가 바뀐 항목은 건너뜀)
+        if self._heap is None:
+            self._heap = [(count, key) for key, count in counts.items()]
+            heapq.heapify(self._heap)
+        heap = self._heap
+        while True:
+            count, key = heapq.heappop(heap)
+            if counts.get(key) == count:
+                break
+        del counts[key]
+        del self.errors[key]
+        counts[value] = count + weight
+        self.errors[value] = count
+        self._push(value)
+
+    def _push(self, value):
+        """최소 건수 힙에 갱신된 건수 추가 (오래된 항목이 쌓이면 다시 구성)"""
+        heapq.heappush(self._heap, (self.counts[value], value))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def update(self, values):
+        """여러 값 추가"""
+        for value in values:
+            self.add(value)
+
+    def min_count(self):
+        """추적하지 않는 항목의 실제 건수 상한 (가득 차지 않았으면 0)"""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        """다른 스케치 병합 (제자리 병합)"""
+        if other.capacity != self.capacity:
+            raise ValueError(f"capacity 불일치: {self.capacity} != {other.capacity}")
+        self_min = self.min_count()
+        other_min = other.min_count()
+
+        merged = {}
+        for key in self.counts.keys() | other.counts.keys():
+            merged[key] = (
+                self.counts.get(key, self_min) + other.counts.get(key, other_min),
+                self.errors.get(key, self_min) + other.errors.get(key, other_min),
+            )
+        top = heapq.nlargest(self.capacity, merged.items(), key=lambda item: (item[1][0], item[0]))
+
+        self.counts = {key: count for key, (count, _) in top}
+        self.errors = {key: error for key, (_, error) in top}
+        self.total += other.total
+        self._heap = None
+        return self
+
+    @classmethod
+    def union(cls, sketches, capacity=256):
+        """여러 스케치 병합"""
+        sketches = list(sketches)
+        if not sketches:
+            return cls(capacity)
+        merged = cls(sketches[0].capacity)
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+
+    def top(self, k=10):
+        """
+        상위 k개 항목
+
+        Returns:
+            list: (항목, 추정 건수, 오차) 튜플 리스트 (추정 건수 내림차순)
+        """
+        return [
+            (key, count, self.errors[key])
+            for key, count in heapq.nlargest(k, self.counts.items(), key=lambda item: (item[1], item[0]))
+        ]
+
+    def to_dict(self):
+        """직렬화 (건수 내림차순 [항목, 건수, 오차] 리스트)"""
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'items': [list(item) for item in self.top(len(self.counts))],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """역직렬화"""
+        return cls(
+            data['capacity'],
+            {key: count for key, count, _ in data['items']},
+            {key: error for key, _, error in data['items']},
+            data['total'],
+        )
@@ -0,0 +1,231 @@
+"""
+실행 상태(처리량, 진행 중 요청, ETA) 집계 및 로컬 HTTP 조회 모듈
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RunStatus:
+    """
+    분석 실행 상태 집계기 (스레드 안전)
+
+    - 처리량: 전체 평균과 최근 window_seconds 구간의 pairs/sec, rows/sec
+    - ETA: 남은 (URL, IP) 쌍의 doc_count로 비용 모델 추정 시간을 합산
+      (IP 목록을 아직 조회하지 않은 URL은 조회한 URL들의 URL당 평균 비용으로 추정)
+    - 처리가 끝난 쌍의 (doc_count, 처리 시간)은 비용 모델에 관측으로 추가하므로
+      추정값은 실행 중 실제 처리 속도를 따라감
+    """
+
+    def __init__(self, cost_model, window_seconds=60):
+        """
+        Args:
+            cost_model: CostModel (쌍 처리 시간 추정/관측)
+            window_seconds: 최근 처리량 계산 구간(초)
+        """
+        self.cost_model = cost_model
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, analysis_date=None, total_urls=0, mode='sequential'):
+        """새 실행 시작"""
+        with self._lock:
+            self.analysis_date = analysis_date
+            self.mode = mode
+            self.total_urls = total_urls
+            self.started_at = time.time()
+            self._start = time.monotonic()
+            self._pending = {}
+            self._url_docs = {}
+            self._finished_urls = set()
+            self._current = {}
+            self._recent = deque()
+            self._counts = {'pairs': 0, 'skipped': 0, 'rows': 0, 'es_in_flight': 0}
+            self._seconds = 0.0
+            self.finished = False
+
+    def add_pairs(self, url, pairs):
+        """
+        처리 예정 쌍 등록
+
+        Args:
+            url: 추적 URL
+            pairs: [(ip, doc_count), ...]
+        """
+        with self._lock:
+            for ip, doc_count in pairs:
+                self._pending[(url, ip)] = doc_count
+            self._url_docs.setdefault(url, []).extend(doc_count for _, doc_count in pairs)
+
+    def finish_url(self, url):
+        """URL 처리 종료 (처리하지 않은 남은 쌍은 대기열에서 제거)"""
+        with self._lock:
+            self._finished_urls.add(url)
+            for key in [key for key in self._pending if key[0] == url]:
+                del self._pending[key]
+
+    def start_pair(self, url, ip):
+        """쌍 처리 시작"""
+        with self._lock:
+            self._current[(url, ip)] = time.monotonic()
+
+    def skip_pair(self, url, ip):
+        """이미 처리된 쌍 (시간 측정 없이 대기열에서 제거)"""
+        with self._lock:
+            self._pending.pop((url, ip), None)
+            self._counts['skipped'] += 1
+
+    def finish_pair(self, url, ip, rows=0):
+        """쌍 처리 종료 (성공/실패 무관, 비용 모델 관측 추가)"""
+        now = time.monotonic()
+        with self._lock:
+            started = self._current.pop((url, ip), now)
+            doc_count = self._pending.pop((url, ip), None)
+            seconds = now - started
+
+            self._counts['pairs'] += 1
+            self._counts['rows'] += rows
+            self._seconds += seconds
+            self._recent.append((now, rows))
+            if doc_count is not None:
+                self.cost_model.observe(doc_count, seconds)
+
+    def fetch_started(self):
+        """ES 원시 데이터 조회 시작"""
+        with self._lock:
+            self._counts['es_in_flight'] += 1
+
+    def fetch_finished(self):
+        """ES 원시 데이터 조회 종료"""
+        with self._lock:
+            self._counts['es_in_flight'] -= 1
+
+    def finish(self):
+        """실행 종료"""
+        with self._lock:
+            self.finished = True
+
+    def snapshot(self, hims_stats=None):
+        """
+        현재 상태
+
+        Args:
+            hims_stats: HIMSLookupService.get_stats() 결과
+
+        Returns:
+            dict: 처리량, 진행 중 요청, 대기열, 캐시 적중률, ETA
+        """
+        now = time.monotonic()
+        with self._lock:
+            elapsed = now - self._start
+            while self._recent and self._recent[0][0] < now - self.window_seconds:
+                self._recent.popleft()
+            recent_span = min(self.window_seconds, elapsed) or 1e-9
+            recent_rows = sum(rows for _, rows in self._recent)
+
+            estimate = self.cost_model.estimate
+            remaining_known = sum(estimate(doc_count) for doc_count in self._pending.values())
+            seen_urls = len(self._url_docs)
+            unseen_urls = max(0, self.total_urls - max(seen_urls, len(self._finished_urls)))
+            avg_url_cost = (
+                sum(estimate(d) for docs in self._url_docs.values() for d in docs) / seen_urls
+                if seen_urls else None
+            )
+
+            if self.finished:
+                eta = 0.0
+            elif unseen_urls and avg_url_cost is None:
+                eta = None
+            else:
+                eta = remaining_known + unseen_urls * (avg_url_cost or 0.0)
+
+            done = self._seconds
+            status = {
+                'analysis_date': self.analysis_date,
+                'mode': self.mode,
+                'finished': self.finished,
+                'elapsed_sec': round(elapsed, 1),
+                'pairs_done': self._counts['pairs'],
+                'pairs_skipped': self._counts['skipped'],
+                'rows_done': self._counts['rows'],
+                'pairs_per_sec': round(self._counts['pairs'] / elapsed, 3) if elapsed else 0.0,
+                'rows_per_sec': round(self._counts['rows'] / elapsed, 1) if elapsed else 0.0,
+                'recent_pairs_per_sec': round(len(self._recent) / recent_span, 3),
+                'recent_rows_per_sec': round(recent_rows / recent_span, 1),
+                'in_flight': {
+                    'pairs': len(self._current),
+                    'es_requests': self._counts['es_in_flight'],
+                    'hims_hosts': (hims_stats or {}).get('in_flight', 0),
+                },
+                'queue_depth': {
+                    'pairs': len(self._pending),
+                    'urls_not_listed': unseen_urls,
+                },
+                'urls': {'total': self.total_urls, 'finished': len(self._finished_urls)},
+                'eta_sec': round(eta, 1) if eta is not None else None,
+                'progress_percentage': (
+                    round(done * 100 / (done + eta), 2) if eta is not None and done + eta > 0 else None
+                ),
+            }
+
+        if hims_stats is not None:
+            status['cache'] = {
+                'hims_hit_rate': hims_stats.get('hit_rate'),
+                'hims_dedup_rate': hims_stats.get('dedup_rate'),
+                'hims_shared_hits': hims_stats.get('shared_hits'),
+                'hims_cache_size': hims_stats.get('cache_size'),
+            }
+        return status
+
+
+class StatusServer:
+    """
+    로컬 HTTP 상태 조회 서버 (GET /status → JSON)
+
+    데몬 스레드에서 실행되며 분석 처리와 독립적으로 응답
+    """
+
+    def __init__(self, snapshot, host='127.0.0.1', port=8765):
+        """
+        Args:
+            snapshot: 상태 dict를 반환하는 함수
+            host: 바인드 주소 (기본 로컬만)
+            port: 포트 (0이면 임의 포트)
+        """
+        self.snapshot = snapshot
+
+        status_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/status'):
+                    self.send_error(404)
+                    return
+                body = json.dumps(status_server.snapshot(), ensure_ascii=False, default=str).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.address = self.httpd.server_address
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='status-server', daemon=True)
+
+    def start(self):
+        """서버 시작"""
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,131 @@
+"""
+결과 아카이브 압축/인덱스 및 FileManager 압축 조회 테스트
+"""
+
+import json
+
+import pytest
+
+from src.utils.archive import ResultArchive, record_key
+from src.utils.file_manager import FileManager
+
+DATE = '2025-01-01'
+
+
+def _result(ip, url='track.com', harmful=1, window=2, session=None, total=10):
+    record = {'추적 URL': url, '사용자 IP': ip, '유해 접속 여부': harmful, '시간 윈도우(시간)': window,
+              '총 접속 건수': total, '유해 URL 리스트': ['bad.com'] if harmful else []}
+    if session is not None:
+        record['세션 번호'] = session
+    return record
+
+
+@pytest.fixture
+def archive(tmp_path):
+    (tmp_path / DATE).mkdir()
+    return ResultArchive(str(tmp_path), block_size=3)
+
+
+def test_compact_dedupes_last_wins_and_sorts(archive):
+    records = [
+        _result('10.0.0.2', total=1),
+        _result('10.0.0.1'),
+        _result('10.0.0.2', total=2),
+        _result('10.0.0.1', window=1),
+        _result('10.0.0.2', session=1),
+    ]
+
+    stats = archive.compact(DATE, [dict(r) for r in records])
+
+    assert stats['input_records'] == 5
+    assert stats['output_records'] == 4
+    index = archive.load_index(DATE)
+    stored = list(archive.read_blocks(DATE, index, range(len(index['blocks']))))
+    assert [record_key(r) for r in stored] == [
+        ('track.com', '10.0.0.1', 1, None),
+        ('track.com', '10.0.0.1', 2, None),
+        ('track.com', '10.0.0.2', 2, None),
+        ('track.com', '10.0.0.2', 2, 1),
+    ]
+    assert stored[2]['총 접속 건수'] == 2
+
+
+def test_candidate_blocks_intersects_index(archive):
+    records = [_result(f"10.0.0.{100 + i}", harmful=int(i % 4 == 0)) for i in range(12)]
+    archive.compact(DATE, records)
+    index = archive.load_index(DATE)
+
+    assert len(index['blocks']) == 4
+    assert archive.candidate_blocks(index, {}) == [0, 1, 2, 3]
+    assert archive.candidate_blocks(index, {'사용자 IP': '10.0.0.105'}) == [1]
+    # 블록 단위 교집합이므로 같은 블록의 다른 레코드가 조건을 채우면 후보 (상위 집합)
+    assert archive.candidate_blocks(index, {'사용자 IP': '10.0.0.105', '유해 접속 여부': 1}) == [1]
+    assert archive.candidate_blocks(index, {'사용자 IP': '10.0.0.110', '유해 접속 여부': 1}) == []
+    assert archive.candidate_blocks(index, {'사용자 IP': 'missing'}) == []
+
+    harmful_blocks = archive.candidate_blocks(index, {'유해 접속 여부': 1})
+    found = [r['사용자 IP'] for r in archive.read_blocks(DATE, index, harmful_blocks) if r['유해 접속 여부'] == 1]
+    assert sorted(found) == ['10.0.0.100', '10.0.0.104', '10.0.0.108']
+
+
+def test_compact_applies_encode_but_indexes_decoded_values(archive):
+    archive.compact(DATE, [_result('10.0.0.1')], encode=lambda r: dict(r, **{'추적 URL': 0}))
+    index = archive.load_index(DATE)
+
+    assert archive.candidate_blocks(index, {'추적 URL': 'track.com'}) == [0]
+    assert next(archive.read_blocks(DATE, index, [0]))['추적 URL'] == 0
+
+
+@pytest.fixture
+def file_manager(tmp_path):
+    return FileManager(str(tmp_path), DATE)
+
+
+def test_compact_results_keeps_appends_made_during_compaction(file_manager):
+    for i in range(5):
+        file_manager.save_result(_result(f"10.0.0.{i}"))
+
+    compact = file_manager.archive.compact
+
+    def compact_with_append(date_str, records, encode=None):
+        records = list(records)
+        file_manager.save_result(_result('10.9.9.9'))
+        return compact(date_str, records, encode)
+
+    file_manager.archive.compact = compact_with_append
+    assert file_manager.compact_results()['output_records'] == 5
+
+    assert len(file_manager.find(dates=[DATE])) == 6
+    assert len(file_manager.find(ip='10.9.9.9', dates=[DATE])) == 1
+
+
+def test_compact_results_keeps_tail_written_to_rotated_file(file_manager):
+    file_manager.save_result(_result('10.0.0.1'))
+    compact = file_manager.archive.compact
+
+    def compact_with_late_write(date_str, records, encode=None):
+        records = list(records)
+        # 이름을 옮기기 전에 열린 쓰기가 압축 중에 끝난 경우
+        with open(file_manager.get_compacting_file(DATE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(_result('10.0.0.2'), ensure_ascii=False) + '\n')
+        return compact(date_str, records, encode)
+
+    file_manager.archive.compact = compact_with_late_write
+    file_manager.compact_results()
+    file_manager.archive.compact = compact
+
+    assert sorted(file_manager.find(dates=[DATE])['사용자 IP']) == ['10.0.0.1', '10.0.0.2']
+    assert file_manager.compact_results()['output_records'] == 2
+
+
+def test_find_newer_record_masks_compacted_one(file_manager):
+    file_manager.save_result(_result('10.0.0.1', harmful=1))
+    file_manager.save_result(_result('10.0.0.2', harmful=1))
+    file_manager.compact_results()
+
+    # 압축 이후 같은 키로 다시 기록된 결과가 유효
+    file_manager.save_result(_result('10.0.0.1', harmful=0))
+
+    assert file_manager.find(harmful=1, dates=[DATE])['사용자 IP'].tolist() == ['10.0.0.2']
+    assert file_manager.find(ip='10.0.0.1', dates=[DATE])['유해 접속 여부'].tolist() == [0]
+    assert len(file_manager.find(dates=[DATE])) == 2
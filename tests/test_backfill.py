@@ -0,0 +1,101 @@
+"""
+backfill 공유 상태(카테고리 캐시, ES 동시 요청 제한) 테스트
+"""
+
+import configparser
+import threading
+import time
+
+import pytest
+
+from src.data.shared import ConcurrencyLimitedClient, SharedStateManager
+
+try:
+    from src.backfill_runner import date_range
+except configparser.Error:
+    date_range = None
+
+
+class FakeESClient:
+    """동시에 실행 중인 요청 수의 최댓값을 기록하는 ES 클라이언트"""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.index_pattern = 'logs-*'
+
+    def _enter(self):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+    def _exit(self):
+        with self.lock:
+            self.running -= 1
+
+    def get_raw_data(self, url, ip):
+        self._enter()
+        time.sleep(0.02)
+        self._exit()
+        return [url, ip]
+
+    def iter_raw_pages(self, url, ip):
+        self._enter()
+        try:
+            for page in range(3):
+                time.sleep(0.005)
+                yield page
+        finally:
+            self._exit()
+
+
+def _run_threads(target, count=8):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_limited_methods_respect_semaphore():
+    fake = FakeESClient()
+    client = ConcurrencyLimitedClient(fake, threading.BoundedSemaphore(2))
+
+    _run_threads(lambda: client.get_raw_data('track.com', '10.0.0.1'))
+
+    assert fake.peak == 2
+    assert client.index_pattern == 'logs-*'
+
+
+def test_generator_holds_slot_until_closed():
+    fake = FakeESClient()
+    semaphore = threading.BoundedSemaphore(1)
+    client = ConcurrencyLimitedClient(fake, semaphore)
+
+    pages = client.iter_raw_pages('track.com', '10.0.0.1')
+    assert next(pages) == 0
+    assert not semaphore.acquire(blocking=False)
+
+    # 반복 도중 닫은 경우에도 슬롯 반환
+    pages.close()
+    assert semaphore.acquire(blocking=False)
+    semaphore.release()
+
+    _run_threads(lambda: list(client.iter_raw_pages('track.com', '10.0.0.1')))
+    assert fake.peak == 1
+
+
+def test_shared_category_cache():
+    with SharedStateManager() as manager:
+        cache = manager.CategoryCache()
+        cache.update({'a.com': '10', 'b.com': None})
+
+        assert cache.get_many(['a.com', 'b.com', 'c.com']) == {'a.com': '10', 'b.com': None}
+        assert cache.size() == 2
+
+
+@pytest.mark.skipif(date_range is None, reason="config.ini가 필요합니다")
+def test_date_range_is_inclusive():
+    assert date_range('2024-12-30', '2025-01-02') == ['2024-12-30', '2024-12-31', '2025-01-01', '2025-01-02']
+    assert date_range('2025-01-01', '2025-01-01') == ['2025-01-01']
@@ -0,0 +1,37 @@
+"""
+체크포인트/실패한 쌍 기록 테스트
+"""
+
+import os
+
+from src.utils.checkpoint import CheckpointManager
+
+DATE = '2025-01-01'
+
+
+def test_failed_pairs_round_trip(tmp_path):
+    manager = CheckpointManager(str(tmp_path), DATE)
+    failed = {('track.com', '10.0.0.1'): {'attempts': 2, 'circuit_open': 1}}
+    manager.save_failed_pairs(failed)
+
+    assert manager.load_failed_pairs() == {
+        ('track.com', '10.0.0.1'): {'attempts': 2, 'circuit_open': 1, 'url': 'track.com', 'ip': '10.0.0.1'}
+    }
+
+    manager.save_failed_pairs({})
+    assert not os.path.exists(manager.failed_pairs_file)
+
+
+def test_clear_checkpoint_removes_failed_pairs(tmp_path):
+    manager = CheckpointManager(str(tmp_path), DATE)
+    other = CheckpointManager(str(tmp_path), '2025-01-02')
+    for checkpoint_manager in (manager, other):
+        checkpoint_manager.save_checkpoint(0, 0, 1, 1, 'track.com')
+        checkpoint_manager.save_failed_pairs({('track.com', '10.0.0.1'): {'attempts': 1, 'circuit_open': 0}})
+
+    other.clear_checkpoint(DATE)
+
+    assert manager.load_checkpoint() is None
+    assert manager.load_failed_pairs() == {}
+    assert other.load_checkpoint() is not None
+    assert other.load_failed_pairs()
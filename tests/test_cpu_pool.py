@@ -0,0 +1,51 @@
+"""
+공유 메모리 프레임 전달 테스트
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.cpu_pool import SharedFrame, attach_frame
+
+
+def _frame():
+    return pd.DataFrame({
+        '@timestamp': pd.to_datetime(['2025-01-01T00:00:00Z', None, '2025-01-01T00:00:05Z']),
+        'sHost': pd.Categorical(['a.com', 'b.com', 'a.com']),
+        'category': pd.array([10, None, 1], dtype='Int16'),
+        'count': np.array([1, 2, 3], dtype=np.int32),
+        'flag': np.array([True, False, True]),
+        'note': ['x', None, 'z'],
+    }, index=[5, 6, 7])
+
+
+def test_shared_frame_round_trip():
+    df = _frame()
+    shared = SharedFrame(df)
+    shm = SharedMemory(name=shared.spec['shm_name'])
+    try:
+        attached = attach_frame(shared.spec, shm)
+
+        pd.testing.assert_frame_equal(attached, df.reset_index(drop=True))
+        # 숫자 컬럼은 버퍼 뷰 (복사하지 않음), nullable 정수 컬럼은 dtype 유지
+        assert not attached['count'].to_numpy().flags.owndata
+        assert attached['category'].dtype == 'Int16'
+        del attached
+    finally:
+        shm.close()
+        shared.release()
+
+
+def test_shared_frame_empty():
+    df = _frame().iloc[:0]
+    shared = SharedFrame(df)
+    shm = SharedMemory(name=shared.spec['shm_name'])
+    try:
+        attached = attach_frame(shared.spec, shm)
+        assert attached.empty and list(attached.columns) == list(df.columns)
+        del attached
+    finally:
+        shm.close()
+        shared.release()
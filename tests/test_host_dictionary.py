@@ -0,0 +1,82 @@
+"""
+날짜별 호스트 사전 인코딩 테스트
+"""
+
+import pytest
+
+from src.utils.host_dictionary import HostDictionary, host_dictionary_file
+
+
+def _record(**fields):
+    record = {'사용자 IP': '10.0.0.1', '추적 URL': 'track.com', '접속 Top URL': 'bad.com',
+              '유해 URL 리스트': ['bad.com', 'worse.com'], '총 접속 건수': 7}
+    record.update(fields)
+    return record
+
+
+@pytest.fixture
+def dictionary_file(tmp_path):
+    date_dir = tmp_path / '2025-01-01'
+    date_dir.mkdir()
+    return host_dictionary_file(str(date_dir))
+
+
+def test_host_dictionary_file_name(tmp_path):
+    assert host_dictionary_file(str(tmp_path / '2025-01-01') + '/').endswith('hosts_2025-01-01.txt')
+
+
+def test_encode_decode_round_trip(dictionary_file):
+    dictionary = HostDictionary(dictionary_file)
+    record = _record()
+
+    encoded = dictionary.encode(record)
+    assert encoded['추적 URL'] == 0
+    assert encoded['접속 Top URL'] == 1
+    assert encoded['유해 URL 리스트'] == [1, 2]
+    # 호스트가 아닌 필드와 원본 레코드는 그대로
+    assert encoded['사용자 IP'] == '10.0.0.1' and encoded['총 접속 건수'] == 7
+    assert record['추적 URL'] == 'track.com'
+
+    assert dictionary.decode(dict(encoded)) == record
+
+
+def test_ids_are_stable_across_instances(dictionary_file):
+    first = HostDictionary(dictionary_file)
+    encoded = first.encode(_record())
+
+    # 다른 인스턴스(다른 프로세스)는 파일에서 같은 id를 읽음
+    second = HostDictionary(dictionary_file)
+    assert second.decode(dict(encoded)) == _record()
+    assert second.encode_hosts(['worse.com', 'new.com']) == [2, 3]
+
+    # 먼저 만든 인스턴스도 나중에 추가된 호스트를 다시 읽음
+    assert first.host(3) == 'new.com'
+    assert first.encode_hosts(['new.com']) == [3]
+
+
+def test_decode_keeps_string_records(dictionary_file):
+    dictionary = HostDictionary(dictionary_file)
+    record = _record()
+
+    assert dictionary.decode(dict(record)) == record
+    assert dictionary.decode({'유해 URL 리스트': []}) == {'유해 URL 리스트': []}
+
+
+def test_truncated_line_is_ignored_and_overwritten(dictionary_file):
+    dictionary = HostDictionary(dictionary_file)
+    dictionary.encode_hosts(['a.com', 'b.com'])
+    with open(dictionary_file, 'a', encoding='utf-8') as f:
+        f.write('partial.co')
+
+    reader = HostDictionary(dictionary_file)
+    reader.refresh()
+    assert reader.hosts == ['a.com', 'b.com']
+
+    assert reader.encode_hosts(['c.com']) == [2]
+    with open(dictionary_file, encoding='utf-8') as f:
+        assert f.read() == 'a.com\nb.com\nc.com\n'
+
+
+def test_unknown_id_raises(dictionary_file):
+    with pytest.raises(ValueError):
+        HostDictionary(dictionary_file).host(5)
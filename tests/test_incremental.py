@@ -0,0 +1,60 @@
+"""
+증분 실행 상태(워터마크, 열린/닫힌 쌍) 테스트
+"""
+
+import json
+import os
+
+from src.utils.incremental import IncrementalState, incremental_state_file
+from src.utils.results import AnalysisResults
+
+DATE = '2025-01-01'
+
+
+def _state(tmp_path):
+    state = IncrementalState(str(tmp_path), DATE)
+    state.windows_hours = [1, 5]
+    state.watermark = '2025-01-01T06:00:00+00:00'
+    pair = state.open_pair('track.com', '10.0.0.1', '2025-01-01T05:00:00+00:00')
+    pair['results'] = [{'추적 URL': 'track.com', '사용자 IP': '10.0.0.1', '시간 윈도우(시간)': 5}]
+    state.open_pair('track.com', '10.0.0.2', '2025-01-01T00:30:00+00:00')
+    state.close_pair('track.com', '10.0.0.2')
+    state.retry_ips['10.0.0.3'] = {'urls': ['track.com'], 'since': '2025-01-01T05:30:00+00:00'}
+    return state
+
+
+def test_state_round_trip(tmp_path):
+    _state(tmp_path).save()
+
+    state = IncrementalState(str(tmp_path), DATE)
+    assert state.load()
+    assert state.state_file == incremental_state_file(os.path.join(str(tmp_path), DATE))
+    assert state.watermark == '2025-01-01T06:00:00+00:00'
+    assert state.windows_hours == [1, 5]
+    assert state.is_tracked('track.com', '10.0.0.1') and state.is_tracked('track.com', '10.0.0.2')
+    assert not state.is_tracked('track.com', '10.0.0.3')
+    assert (state.open_pair_count(), state.closed_pair_count(), state.tracked_count('track.com')) == (1, 1, 2)
+    assert state.retry_ips['10.0.0.3']['urls'] == ['track.com']
+
+
+def test_write_open_results(tmp_path):
+    state = _state(tmp_path)
+    state.write_open_results()
+
+    with open(state.open_results_file, encoding='utf-8') as f:
+        assert [json.loads(line)['사용자 IP'] for line in f] == ['10.0.0.1']
+
+
+def test_clear_data_removes_incremental_state(tmp_path):
+    state = _state(tmp_path)
+    state.save()
+    state.write_open_results()
+    other = IncrementalState(str(tmp_path), '2025-01-02')
+    other.save()
+
+    AnalysisResults(str(tmp_path), DATE).clear_data(DATE)
+
+    assert not os.path.exists(state.state_file)
+    assert not os.path.exists(state.open_results_file)
+    assert not IncrementalState(str(tmp_path), DATE).load()
+    assert os.path.exists(other.state_file)
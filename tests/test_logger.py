@@ -0,0 +1,63 @@
+"""
+큐 기반 로거(JSON 레코드, 진행 파일) 및 쌍 단위 진행 로그 집계 테스트
+"""
+
+import json
+import logging
+import os
+
+from src.utils.file_manager import FileManager
+from src.utils.logger import DateBasedLogger, JsonFormatter
+
+
+def _read_json_lines(log_dir):
+    (log_file,) = [name for name in os.listdir(log_dir) if name.endswith('.jsonl')]
+    with open(os.path.join(log_dir, log_file), encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_json_formatter_includes_fields():
+    record = logging.makeLogRecord({
+        'name': 'test', 'levelname': 'INFO', 'msg': 'hello %s', 'args': ('world',),
+        'event': 'completed', 'ip': '10.0.0.1', 'progress_file': '/tmp/progress.txt',
+    })
+    data = json.loads(JsonFormatter().format(record))
+
+    assert data['message'] == 'hello world'
+    assert (data['event'], data['ip']) == ('completed', '10.0.0.1')
+    assert 'progress_file' not in data
+
+
+def test_logger_writes_json_and_progress_file(tmp_path):
+    log_dir = str(tmp_path / 'logs')
+    progress_file = str(tmp_path / 'progress.txt')
+    logger = DateBasedLogger('test_logger_json', log_dir)
+    logger.info('started', event='run_start', urls=3)
+    logger.info('pair done', progress_file=progress_file)
+    logger.debug('not recorded')
+    logger.stop()
+
+    records = _read_json_lines(log_dir)
+    assert [record['message'] for record in records] == ['started', 'pair done']
+    assert records[0]['urls'] == 3
+    with open(progress_file, encoding='utf-8') as f:
+        assert f.read().rstrip().endswith('] pair done')
+
+
+def test_pair_events_are_aggregated(tmp_path):
+    log_dir = str(tmp_path / 'logs')
+    file_manager = FileManager(str(tmp_path / 'results'), '2025-01-01', progress_interval_sec=3600)
+    file_manager.logger = DateBasedLogger('test_logger_pairs', log_dir)
+
+    for i in range(100):
+        file_manager.log_pair('started', f"Processing {i}", 'track.com', f"10.0.0.{i}")
+        file_manager.log_pair('completed', f"Completed {i}", 'track.com', f"10.0.0.{i}")
+    file_manager.log_pair('error', 'Error processing 10.0.0.7', 'track.com', '10.0.0.7')
+    file_manager.flush_progress()
+    file_manager.logger.stop()
+
+    # 오류는 바로 기록, 나머지는 요약 한 줄
+    records = _read_json_lines(log_dir)
+    assert [record['event'] for record in records] == ['error', 'progress_summary']
+    assert records[1]['counts'] == {'started': 100, 'completed': 100, 'error': 1}
+    assert records[1]['pairs'] == 100
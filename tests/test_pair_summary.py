@@ -0,0 +1,36 @@
+"""
+쌍별 호스트 요약 저장소 테스트
+"""
+
+from src.utils.file_manager import FileManager
+from src.utils.pair_summary import PairSummaryStore
+
+DATE = '2025-01-01'
+
+
+def _summary(hosts):
+    return {
+        'start': '2025-01-01T00:00:00+00:00',
+        'runs': [[host, '10', i * 1000, i * 1000 + 500, 2] for i, host in enumerate(hosts)],
+        'params': {'sessionize': False, 'windows_hours': [1, 5]},
+    }
+
+
+def test_summaries_round_trip_with_host_ids(tmp_path):
+    file_manager = FileManager(str(tmp_path), DATE)
+    store = PairSummaryStore(file_manager)
+    store.save('track.com', '10.0.0.1', _summary(['a.com', 'b.com']))
+    store.save('track.com', '10.0.0.2', _summary(['b.com']))
+    # 재분석된 쌍은 마지막 줄이 유효
+    store.save('track.com', '10.0.0.1', _summary(['c.com']))
+    with open(store.summaries_file(), 'a', encoding='utf-8') as f:
+        f.write('{"truncated": ')
+
+    with open(store.summaries_file(), encoding='utf-8') as f:
+        assert 'a.com' not in f.read()
+
+    summaries = PairSummaryStore(FileManager(str(tmp_path), DATE)).load(DATE)
+    assert set(summaries) == {('track.com', '10.0.0.1'), ('track.com', '10.0.0.2')}
+    assert summaries[('track.com', '10.0.0.1')]['runs'] == [['c.com', '10', 0, 500, 2]]
+    assert summaries[('track.com', '10.0.0.2')]['params'] == {'sessionize': False, 'windows_hours': [1, 5]}
+    assert store.load('2025-01-02') == {}
@@ -0,0 +1,134 @@
+"""
+쌍 분석 파이프라인 테스트 (여러 시간 윈도우 한 번 분석 = 윈도우별 단일 분석)
+
+분석기는 config.ini의 카테고리 설정을 읽으므로 설정 파일이 없으면 건너뜀
+"""
+
+import configparser
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.schema import IngestSchema
+
+try:
+    from src.analysis.analyzer import URLAnalyzer
+    from src.analysis.pipeline import PairAnalysis
+except configparser.Error:
+    pytest.skip("config.ini가 필요합니다 (카테고리 설정)", allow_module_level=True)
+
+URL = 'track.com'
+IP = '10.0.0.1'
+WINDOWS = [1, 2, 5]
+HARMFUL = {'10': 'adult'}
+SAFE = {'1': 'news'}
+CAT_MAP = {'bad1.com': '10', 'bad2.com': '10', 'news.com': '1', 'cdn.com': None, URL: '1'}
+
+
+def _raw_frame(seed=0, rows=600):
+    """추적 URL 방문 이후 6시간 동안 호스트가 반복되는 원시 프레임"""
+    rng = np.random.default_rng(seed)
+    hosts = list(CAT_MAP)
+    offsets = np.sort(rng.integers(0, 6 * 3600, rows))
+    sequence = []
+    while len(sequence) < rows:
+        sequence.extend([hosts[rng.integers(0, len(hosts))]] * int(rng.integers(1, 6)))
+    frame = pd.DataFrame({
+        '@timestamp': pd.Timestamp('2025-01-01T00:10:00Z') + pd.to_timedelta(offsets, unit='s'),
+        'sHost': sequence[:rows],
+        'sSrcIP': IP,
+    })
+    before = pd.DataFrame({'@timestamp': [pd.Timestamp('2025-01-01T00:00:00Z')], 'sHost': [URL], 'sSrcIP': [IP]})
+    return IngestSchema().apply(pd.concat([before, frame], ignore_index=True))
+
+
+def _pair_analysis(windows, collapse_runs=False, sessionize=False):
+    analyzer = URLAnalyzer()
+    analyzer.categorizer.harmful_categories = HARMFUL
+    analyzer.categorizer.safe_categories = SAFE
+    return PairAnalysis(IngestSchema(), analyzer, windows, 3, sessionize=sessionize, collapse_runs=collapse_runs)
+
+
+def _run(pair_analysis, df):
+    results, skipped, _ = pair_analysis.run(df, URL, IP, CAT_MAP)
+    assert skipped is None
+    return results
+
+
+@pytest.mark.parametrize('collapse_runs', [False, True])
+def test_multi_window_equals_single_windows(collapse_runs):
+    df = _raw_frame()
+
+    multi = _run(_pair_analysis(WINDOWS, collapse_runs), df)
+    assert [result['시간 윈도우(시간)'] for result in multi] == WINDOWS
+
+    for result in multi:
+        hours = result['시간 윈도우(시간)']
+        single, = _run(_pair_analysis([hours]), df)
+        assert {key: value for key, value in result.items() if key != '시간 윈도우(시간)'} == single
+
+
+def test_run_frames_match_record_frames():
+    df = _raw_frame(seed=3)
+
+    assert _run(_pair_analysis(WINDOWS, collapse_runs=True), df) == _run(_pair_analysis(WINDOWS), df)
+
+
+def test_harmful_hosts_found():
+    results = _run(_pair_analysis([5]), _raw_frame(seed=1))
+
+    assert results[0]['유해 접속 여부'] == 1
+    assert sorted(results[0]['유해 URL 리스트']) == ['bad1.com', 'bad2.com']
+
+
+def _session_frame():
+    """추적 URL을 두 번 방문 (두 번째 방문은 세션 간격 이후)"""
+    rows = [
+        ('00:00:00', URL), ('00:01:00', 'news.com'), ('00:02:00', 'bad1.com'), ('00:03:00', 'cdn.com'),
+        ('00:05:00', URL), ('00:06:00', 'news.com'),
+        ('02:00:00', URL), ('02:01:00', 'bad2.com'), ('02:02:00', 'bad2.com'), ('02:03:00', 'news.com'),
+    ]
+    return IngestSchema().apply(pd.DataFrame({
+        '@timestamp': [pd.Timestamp(f"2025-01-01T{time}Z") for time, _ in rows],
+        'sHost': [host for _, host in rows],
+        'sSrcIP': IP,
+    }))
+
+
+def test_sessions_split_on_tracked_visits():
+    results = _run(_pair_analysis([5], sessionize=True), _session_frame())
+
+    assert [result['세션 번호'] for result in results] == [1, 2]
+    # 간격 이내의 재방문은 같은 세션의 추적 URL 레코드
+    assert results[0]['총 접속 건수'] == 5
+    assert results[0]['고유 추적 URL 개수'] == 1
+    assert results[0]['유해 URL 리스트'] == ['bad1.com']
+    assert results[1]['총 접속 건수'] == 3
+    assert results[1]['유해 URL 리스트'] == ['bad2.com']
+    assert results[1]['세션 시작 시각'].startswith('2025-01-01T02:00:00')
+
+
+@pytest.mark.parametrize('collapse_runs', [False, True])
+def test_navigation_metrics(collapse_runs):
+    # 윈도우는 추적 URL 첫 방문 이후 레코드 (재방문은 윈도우 안의 추적 URL 레코드)
+    rows = [
+        ('00:00:00', URL), ('00:01:00', 'news.com'), ('00:01:30', 'news.com'), ('00:02:00', URL),
+        ('00:02:30', 'bad1.com'), ('00:03:00', 'cdn.com'), ('00:03:30', 'bad2.com'),
+    ]
+    df = IngestSchema().apply(pd.DataFrame({
+        '@timestamp': [pd.Timestamp(f"2025-01-01T{time}Z") for time, _ in rows],
+        'sHost': [host for _, host in rows],
+        'sSrcIP': IP,
+    }))
+    result, = _run(_pair_analysis([5], collapse_runs), df)
+
+    transitions = result['클래스 전이 횟수']
+    assert transitions['안전']['추적 URL'] == 1
+    assert transitions['추적 URL']['유해'] == 1
+    assert transitions['유해']['미분류'] == 1
+    assert transitions['미분류']['유해'] == 1
+    # 같은 호스트 반복 요청(news.com)은 이동이 아님
+    assert sum(count for row in transitions.values() for count in row.values()) == 4
+    assert result['클래스별 체류 시간(초)'] == {'추적 URL': 30.0, '유해': 30.0, '안전': 60.0, '미분류': 30.0}
+    assert result['추적→첫 유해 홉 수'] == 1
@@ -0,0 +1,265 @@
+"""
+서킷 브레이커, 재시도 예산, ResilientClient 테스트
+"""
+
+import threading
+import time
+import types
+
+import pytest
+
+from src.data import resilience
+from src.data.resilience import (
+    CircuitBreaker, CircuitOpenError, ResilientClient, RetryBudget, StalledBackendError, find_resilient,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience, 'time', types.SimpleNamespace(monotonic=fake.monotonic, sleep=time.sleep))
+    return fake
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_sec=10)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened_count == 1
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_allows_single_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_sec=10)
+    breaker.record_failure()
+
+    clock.now += 9.9
+    assert not breaker.allow()
+
+    clock.now += 0.2
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+    # 시험 요청 실패 → 다시 open (reset_timeout_sec 다시 대기)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened_count == 2
+    assert not breaker.allow()
+
+    # 시험 요청 성공 → closed
+    clock.now += 10.1
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_breaker_release_returns_probe_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_sec=10)
+    breaker.record_failure()
+    clock.now += 10.1
+
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_retry_budget_tokens():
+    budget = RetryBudget(ratio=0.5, max_tokens=2.0)
+
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+    for _ in range(10):
+        budget.deposit()
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+
+
+class FakeClient:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+        self.page_calls = 0
+        self.release = threading.Event()
+
+    def lookup(self, value):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError('unavailable')
+        return value * 2
+
+    def block(self):
+        self.release.wait(5)
+        return 'late'
+
+    def get_raw_data(self, seconds):
+        time.sleep(seconds)
+        return 'rows'
+
+    def iter_raw_pages(self, pages):
+        self.page_calls += 1
+        for page in range(pages):
+            yield page
+
+    def other(self):
+        return 'plain'
+
+
+def _client(fake, **options):
+    params = dict(
+        max_timeout_sec=0.05, min_timeout_sec=0.01, hedge=False, max_retries=2, retry_base_delay_sec=0.0,
+        breaker_failure_threshold=5, max_threads=4,
+    )
+    params.update(options)
+    methods = ('lookup', 'block', 'get_raw_data', 'iter_raw_pages')
+    return ResilientClient(fake, 'test', methods, **params)
+
+
+def test_retries_within_budget():
+    fake = FakeClient(failures=2)
+    client = _client(fake)
+
+    assert client.lookup(21) == 42
+    stats = client.get_stats()
+    assert stats['retries'] == 2 and stats['successes'] == 1
+    assert client.other() == 'plain'
+
+
+def test_breaker_short_circuits_calls():
+    fake = FakeClient(failures=100)
+    client = _client(fake, max_retries=0, breaker_failure_threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            client.lookup(1)
+    with pytest.raises(CircuitOpenError):
+        client.lookup(1)
+    assert fake.calls == 2
+    assert client.get_stats()['breaker_state'] == CircuitBreaker.OPEN
+
+
+def test_scroll_methods_have_no_adaptive_timeout():
+    client = _client(FakeClient(), min_samples=1)
+
+    assert client.get_raw_data(0.2) == 'rows'
+    stats = client.get_stats()
+    assert stats['timeouts'] == 0 and stats['retries'] == 0
+    assert 'timeout_sec' not in stats['methods']['get_raw_data']
+
+
+def test_generator_pages_are_streamed():
+    fake = FakeClient()
+    client = _client(fake)
+
+    pages = client.iter_raw_pages(3)
+    assert fake.page_calls == 0
+    assert list(pages) == [0, 1, 2]
+    assert list(client.iter_raw_pages(0)) == []
+
+
+def test_generator_first_page_runs_in_caller_thread():
+    fake = FakeClient()
+    threads = []
+
+    def iter_raw_pages(pages):
+        threads.append(threading.current_thread())
+        time.sleep(0.1)
+        yield from range(pages)
+
+    fake.iter_raw_pages = iter_raw_pages
+    client = _client(fake, min_samples=1)
+
+    # 첫 페이지가 적응형 타임아웃(최대 0.05초)보다 느려도 포기하지 않음 (스크롤 컨텍스트 유지)
+    assert list(client.iter_raw_pages(2)) == [0, 1]
+    assert threads == [threading.current_thread()]
+    stats = client.get_stats()
+    assert stats['timeouts'] == 0 and stats['abandoned_running'] == 0
+    assert 'timeout_sec' not in stats['methods']['iter_raw_pages']
+
+
+def test_stalled_backend_fails_fast():
+    fake = FakeClient()
+    client = _client(fake, max_retries=0, max_abandoned=1)
+
+    with pytest.raises(TimeoutError):
+        client.block()
+    assert client.get_stats()['abandoned_running'] == 1
+
+    with pytest.raises(StalledBackendError):
+        client.block()
+    assert client.get_stats()['stalled'] == 1
+
+    # 포기한 요청이 끝나면 다시 요청을 보냄
+    fake.release.set()
+    deadline = time.monotonic() + 2
+    while client.get_stats()['abandoned_running'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.lookup(2) == 4
+
+
+def test_stalled_backend_does_not_open_breaker():
+    fake = FakeClient()
+    client = _client(fake, max_retries=0, max_abandoned=1, breaker_failure_threshold=2)
+
+    with pytest.raises(TimeoutError):
+        client.block()
+    for _ in range(3):
+        with pytest.raises(StalledBackendError):
+            client.block()
+    assert client.get_stats()['breaker_state'] == CircuitBreaker.CLOSED
+
+    fake.release.set()
+    deadline = time.monotonic() + 2
+    while client.get_stats()['abandoned_running'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.lookup(2) == 4
+
+
+def test_inner_circuit_open_does_not_open_outer_breaker():
+    inner = _client(FakeClient(failures=100), max_retries=0, breaker_failure_threshold=1)
+    with pytest.raises(ConnectionError):
+        inner.lookup(1)
+    outer = ResilientClient(inner, 'outer', ('lookup',), max_retries=0, breaker_failure_threshold=1, max_threads=2)
+
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            outer.lookup(1)
+    assert outer.get_stats()['breaker_state'] == CircuitBreaker.CLOSED
+
+
+def test_wrap_skips_already_wrapped_clients():
+    class Limiter:
+        def __init__(self, client):
+            self._client = client
+
+    client = _client(FakeClient())
+    limited = Limiter(client)
+
+    assert find_resilient(limited) is client
+    assert find_resilient(Limiter(FakeClient())) is None
+    assert ResilientClient.wrap(limited, 'test', ('lookup',), {}) is limited
+    assert ResilientClient.wrap(FakeClient(), 'test', ('lookup',), {'enabled': False}).__class__ is FakeClient
@@ -0,0 +1,117 @@
+"""
+일별 rollup 쌍 단위 집계 테스트
+"""
+
+from src.utils.rollup import RollupManager, iter_pair_records
+from src.utils.file_manager import FileManager
+
+DATE = '2025-01-01'
+
+
+def _result(ip, window, harmful, hosts, session=None, url='track.com'):
+    record = {'추적 URL': url, '사용자 IP': ip, '시간 윈도우(시간)': window,
+              '유해 접속 여부': harmful, '유해 URL 리스트': hosts}
+    if session is not None:
+        record['세션 번호'] = session
+    return record
+
+
+def test_iter_pair_records_uses_largest_window():
+    records = [
+        _result('10.0.0.1', 1, 0, []),
+        _result('10.0.0.1', 2, 1, ['a.com']),
+        _result('10.0.0.1', 5, 1, ['a.com', 'b.com']),
+        _result('10.0.0.2', 5, 0, []),
+        _result('10.0.0.2', 1, 1, ['c.com']),
+    ]
+
+    assert list(iter_pair_records(records)) == [
+        ('track.com', '10.0.0.1', True, ['a.com', 'b.com']),
+        ('track.com', '10.0.0.2', False, []),
+    ]
+
+
+def test_iter_pair_records_merges_sessions():
+    records = [
+        _result('10.0.0.1', 5, 0, [], session=1),
+        _result('10.0.0.1', 5, 1, ['a.com'], session=2),
+        _result('10.0.0.1', 5, 1, ['b.com', 'a.com'], session=3),
+        _result('10.0.0.1', 5, 0, [], url='other.com'),
+    ]
+
+    assert list(iter_pair_records(records)) == [
+        ('track.com', '10.0.0.1', True, ['a.com', 'b.com']),
+        ('other.com', '10.0.0.1', False, []),
+    ]
+
+
+def test_iter_pair_records_groups_non_contiguous_pairs():
+    records = [
+        _result('10.0.0.1', 1, 1, ['a.com']),
+        _result('10.0.0.2', 5, 0, []),
+        _result('10.0.0.1', 5, 0, []),
+        _result('10.0.0.2', 1, 1, ['c.com']),
+    ]
+
+    assert list(iter_pair_records(records)) == [
+        ('track.com', '10.0.0.1', False, []),
+        ('track.com', '10.0.0.2', False, []),
+    ]
+
+
+def test_iter_pair_records_last_record_wins():
+    records = [
+        _result('10.0.0.1', 5, 1, ['a.com'], session=1),
+        _result('10.0.0.2', 5, 0, []),
+        _result('10.0.0.1', 5, 0, [], session=1),
+        _result('10.0.0.1', 5, 1, ['b.com'], session=2),
+    ]
+
+    assert list(iter_pair_records(records)) == [
+        ('track.com', '10.0.0.1', True, ['b.com']),
+        ('track.com', '10.0.0.2', False, []),
+    ]
+
+
+def test_iter_pair_records_without_window_column():
+    records = [{'추적 URL': 'u', '사용자 IP': 'ip', '유해 접속 여부': 1, '유해 URL 리스트': None}]
+
+    assert list(iter_pair_records(records)) == [('u', 'ip', True, [])]
+
+
+def _rollup(tmp_path, name, records):
+    file_manager = FileManager(str(tmp_path / name), DATE)
+    for record in records:
+        file_manager.save_result(record)
+    rollup = RollupManager(file_manager).build_rollup(DATE)
+    return {key: value for key, value in rollup.items() if key not in ('created_at', 'source_size')}
+
+
+def test_multi_window_rollup_equals_largest_window_rollup(tmp_path):
+    pairs = [(f"10.0.0.{i}", i % 3 == 0, [f"bad{i % 4}.com"] if i % 3 == 0 else []) for i in range(30)]
+    multi = [
+        _result(ip, window, int(harmful and window > 1), hosts if window > 1 else [])
+        for ip, harmful, hosts in pairs for window in (1, 2, 5)
+    ]
+    single = [_result(ip, 5, int(harmful), hosts) for ip, harmful, hosts in pairs]
+
+    multi_rollup = _rollup(tmp_path, 'multi', multi)
+    assert multi_rollup == _rollup(tmp_path, 'single', single)
+    assert multi_rollup['records'] == 30
+    assert multi_rollup['harmful_records'] == 10
+    assert sum(count for _, count, _ in multi_rollup['harmful_top']['items']) == 10
+
+
+def test_rewritten_pairs_counted_once(tmp_path):
+    file_manager = FileManager(str(tmp_path), DATE)
+    for record in (_result('10.0.0.1', 5, 1, ['a.com']), _result('10.0.0.2', 5, 0, [])):
+        file_manager.save_result(record)
+    file_manager.compact_results(DATE)
+    # 압축 이후 같은 쌍을 다시 분석한 결과 (나중 레코드가 유효)
+    file_manager.save_result(_result('10.0.0.1', 5, 0, []))
+
+    rollup = RollupManager(file_manager).build_rollup(DATE)
+    summary = file_manager.summarize_results([DATE])
+
+    assert (rollup['records'], rollup['harmful_records']) == (2, 0)
+    assert (summary['total_records'], summary['harmful_records']) == (2, 0)
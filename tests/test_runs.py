@@ -0,0 +1,65 @@
+"""
+연속 동일 호스트 run 압축 테스트
+"""
+
+import pandas as pd
+
+from src.analysis.runs import RUN_COUNT, RUN_LAST_TS, collapse_runs, decode_runs, encode_runs
+
+
+def _frame(hosts, start='2025-01-01T00:00:00Z', step_sec=10):
+    ts = pd.Timestamp(start) + pd.to_timedelta([i * step_sec for i in range(len(hosts))], unit='s')
+    return pd.DataFrame({'@timestamp': ts, 'sHost': pd.Categorical(hosts)})
+
+
+def test_collapse_runs_merges_consecutive_hosts():
+    df = _frame(['a', 'a', 'b', 'b', 'b', 'a'])
+    runs = collapse_runs(df)
+
+    assert runs['sHost'].astype(object).tolist() == ['a', 'b', 'a']
+    assert runs[RUN_COUNT].tolist() == [2, 3, 1]
+    assert runs['@timestamp'].tolist() == df['@timestamp'].iloc[[0, 2, 5]].tolist()
+    assert runs[RUN_LAST_TS].tolist() == df['@timestamp'].iloc[[1, 4, 5]].tolist()
+
+
+def test_collapse_runs_splits_at_window_breaks():
+    df = _frame(['a'] * 6)
+    # 경계 시각 이하(0~20초)와 초과(30초~) 레코드는 다른 run
+    runs = collapse_runs(df, [df['@timestamp'].iloc[2]])
+
+    assert runs[RUN_COUNT].tolist() == [3, 3]
+    assert runs['@timestamp'].tolist() == df['@timestamp'].iloc[[0, 3]].tolist()
+
+
+def test_collapse_runs_plain_object_hosts():
+    df = _frame(['x', 'x', 'y'])
+    df['sHost'] = df['sHost'].astype(object)
+
+    assert collapse_runs(df)[RUN_COUNT].tolist() == [2, 1]
+
+
+def test_collapse_runs_empty_frame():
+    runs = collapse_runs(_frame([]))
+
+    assert runs.empty
+    assert RUN_COUNT in runs and RUN_LAST_TS in runs
+
+
+def test_encode_decode_runs_round_trip():
+    df = _frame(['a', 'a', 'b', 'c', 'c'], step_sec=1.5)
+    runs = collapse_runs(df)
+    runs['category'] = ['10', None, '1']
+
+    encoded = encode_runs(runs)
+    assert encoded['runs'] == [
+        ['a', '10', 0, 1_500_000, 2],
+        ['b', None, 3_000_000, 3_000_000, 1],
+        ['c', '1', 4_500_000, 6_000_000, 2],
+    ]
+
+    decoded = decode_runs(encoded)
+    assert decoded['sHost'].tolist() == ['a', 'b', 'c']
+    assert decoded['category'].tolist() == ['10', None, '1']
+    assert decoded[RUN_COUNT].tolist() == [2, 1, 2]
+    assert decoded['@timestamp'].tolist() == runs['@timestamp'].tolist()
+    assert decoded[RUN_LAST_TS].tolist() == runs[RUN_LAST_TS].tolist()
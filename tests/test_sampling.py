@@ -0,0 +1,77 @@
+"""
+적응형 층화 IP 표본 추출 테스트
+"""
+
+import pytest
+
+from src.analysis.sampling import StratifiedIPSampler
+
+IPS = [f"10.0.{i // 256}.{i % 256}" for i in range(1000)]
+
+
+def _draw_all(sampler):
+    drawn = []
+    batch = sampler.next_batch()
+    while batch:
+        drawn.extend(batch)
+        batch = sampler.next_batch()
+    return drawn
+
+
+def test_batches_cover_population_once():
+    sampler = StratifiedIPSampler(IPS, strata=4, batch_size=64, seed='2025-01-01:track.com')
+    drawn = _draw_all(sampler)
+
+    assert sorted(drawn) == sorted(IPS)
+    assert sampler.sampled == len(IPS)
+    assert sampler.next_batch() == []
+
+
+def test_same_seed_same_order():
+    first = StratifiedIPSampler(IPS, seed='a').next_batch()
+
+    assert first == StratifiedIPSampler(IPS, seed='a').next_batch()
+    assert first != StratifiedIPSampler(IPS, seed='b').next_batch()
+
+
+def test_batch_is_proportional_across_strata():
+    sampler = StratifiedIPSampler(IPS, strata=4, batch_size=40, seed=1)
+    batch = sampler.next_batch()
+
+    assert len(batch) == 40
+    assert [sum(ip in stratum['members'] for ip in batch) for stratum in sampler.strata] == [10, 10, 10, 10]
+
+
+def test_full_sample_estimate_is_exact():
+    harmful = set(IPS[:250])
+    sampler = StratifiedIPSampler(IPS, strata=4, batch_size=100, seed=1)
+    for ip in _draw_all(sampler):
+        sampler.observe(ip, ip in harmful)
+
+    estimate = sampler.estimate()
+    assert estimate['rate'] == pytest.approx(0.25)
+    assert estimate['half_width'] == 0
+    assert sampler.is_converged(0.01, 10)
+
+
+def test_early_stop_and_weights():
+    # 상위 층만 유해: 층화 추정량은 표본 일부로도 모집단 비율에 수렴
+    harmful = set(IPS[:250])
+    sampler = StratifiedIPSampler(IPS, strata=4, batch_size=40, seed=1)
+    while not sampler.is_converged(0.05, 40):
+        for ip in sampler.next_batch():
+            sampler.observe(ip, ip in harmful)
+
+    estimate = sampler.estimate()
+    weights = sampler.weights()
+    assert sampler.sampled < len(IPS)
+    assert estimate['low'] <= 0.25 <= estimate['high']
+    assert len(weights) == sampler.sampled
+    assert sum(weights.values()) == pytest.approx(len(IPS), rel=0.01)
+
+
+def test_estimate_without_observations():
+    sampler = StratifiedIPSampler(IPS[:10], seed=1)
+
+    assert sampler.estimate()['rate'] is None
+    assert not sampler.is_converged(0.5, 1)
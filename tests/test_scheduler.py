@@ -0,0 +1,90 @@
+"""
+시간 예산 스케줄러 테스트
+"""
+
+import json
+
+import pytest
+
+from src.utils.scheduler import CostModel, PairScheduler
+
+
+def _cost_model(tmp_path, **options):
+    return CostModel(str(tmp_path / 'cost_model.json'), **options)
+
+
+def test_cost_model_defaults_until_enough_samples(tmp_path):
+    model = _cost_model(tmp_path, default_overhead_sec=2.0, default_sec_per_doc=0.1)
+    for _ in range(4):
+        model.observe(100, 50.0)
+
+    assert model.estimate(10) == pytest.approx(3.0)
+
+
+def test_cost_model_fits_linear_cost(tmp_path):
+    model = _cost_model(tmp_path, decay=1.0)
+    for doc_count in (10, 100, 1000, 5000, 20000):
+        model.observe(doc_count, 0.5 + 0.001 * doc_count)
+
+    overhead, per_doc = model.coefficients()
+    assert overhead == pytest.approx(0.5)
+    assert per_doc == pytest.approx(0.001)
+
+
+def test_cost_model_round_trip(tmp_path):
+    model = _cost_model(tmp_path)
+    for doc_count in (10, 100, 1000, 5000, 20000):
+        model.observe(doc_count, 1.0 + 0.002 * doc_count)
+    model.save()
+
+    restored = _cost_model(tmp_path)
+    assert restored.samples == 5
+    assert restored.coefficients() == pytest.approx(model.coefficients())
+    with open(model.history_file, encoding='utf-8') as f:
+        assert json.load(f)['samples'] == 5
+
+
+def _pairs():
+    return [
+        {'url': 'safe.com', 'ip': '10.0.0.1', 'doc_count': 100},
+        {'url': 'risky.com', 'ip': '10.0.0.2', 'doc_count': 100},
+        {'url': 'risky.com', 'ip': '10.0.0.3', 'doc_count': 10000},
+    ]
+
+
+def test_scheduler_orders_by_value_per_cost(tmp_path):
+    scheduler = PairScheduler(
+        3600, _cost_model(tmp_path, default_sec_per_doc=0.0),
+        harmful_rates={'safe.com': (0, 1000), 'risky.com': (500, 1000)},
+    )
+    scheduler.add_pairs(_pairs())
+
+    assert [entry['ip'] for entry in scheduler] == ['10.0.0.3', '10.0.0.2', '10.0.0.1']
+
+
+def test_scheduler_defers_pairs_over_budget(tmp_path):
+    scheduler = PairScheduler(60, _cost_model(tmp_path, default_overhead_sec=1.0, default_sec_per_doc=0.01))
+    scheduler.add_pairs(_pairs())
+
+    started = [entry['ip'] for entry in scheduler]
+    for ip in started:
+        scheduler.record('risky.com' if ip != '10.0.0.1' else 'safe.com', ip)
+    ledger = scheduler.finish()
+
+    assert sorted(started) == ['10.0.0.1', '10.0.0.2']
+    assert ledger['completed'] == 2
+    assert [(entry['ip'], entry['reason']) for entry in ledger['deferred']] == [('10.0.0.3', 'budget')]
+
+
+def test_scheduler_counts_only_recorded_pairs(tmp_path):
+    scheduler = PairScheduler(3600, _cost_model(tmp_path))
+    scheduler.add_pairs(_pairs())
+
+    entries = list(scheduler)
+    scheduler.record(entries[0]['url'], entries[0]['ip'])
+    scheduler.release(entries[1]['url'], entries[1]['ip'])
+    ledger = scheduler.finish()
+
+    assert ledger['completed'] == 1
+    # 건너뛰었거나 실패한 쌍은 완료로 세지 않고 연기 목록에도 넣지 않음, 시작 후 끝나지 않은 쌍만 연기
+    assert [(entry['ip'], entry['reason']) for entry in ledger['deferred']] == [(entries[2]['ip'], 'interrupted')]
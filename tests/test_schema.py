@@ -0,0 +1,140 @@
+"""
+수집 데이터 스키마(IngestSchema) 및 컬럼 디코딩(시각 변환, 예산) 테스트
+"""
+
+import pandas as pd
+import pytest
+
+from src.data.columnar import _sample_pages, decode_pages
+from src.data.schema import MIN_ROW_BYTES, FrameBudgetExceeded, IngestSchema
+
+
+def _raw_frame():
+    return pd.DataFrame({
+        '@timestamp': ['2025-01-01T00:00:00.000Z', '2025-01-01T00:00:05.000Z', 'not-a-time'],
+        'sHost': ['a.com', 'b.com', 'a.com'],
+        'sSrcIP': ['10.0.0.1'] * 3,
+        'sURI': ['/x', '/y', '/z'],
+        'bytes': [1, 2, 3],
+    })
+
+
+def test_apply_projects_and_compresses():
+    df = IngestSchema().apply(_raw_frame())
+
+    assert list(df.columns) == ['@timestamp', 'sHost', 'sSrcIP']
+    assert pd.api.types.is_datetime64_any_dtype(df['@timestamp'])
+    assert df['@timestamp'].isna().tolist() == [False, False, True]
+    assert isinstance(df['sHost'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['sSrcIP'].dtype, pd.CategoricalDtype)
+    assert df['sHost'].astype(object).tolist() == ['a.com', 'b.com', 'a.com']
+
+
+def test_apply_is_idempotent_and_keeps_input():
+    raw = _raw_frame()
+    schema = IngestSchema()
+    once = schema.apply(raw)
+
+    pd.testing.assert_frame_equal(schema.apply(once), once)
+    assert 'sURI' in raw.columns
+
+
+def test_apply_missing_fields():
+    df = IngestSchema().apply(pd.DataFrame({'sHost': ['a.com'], 'other': [1]}))
+
+    assert list(df.columns) == ['sHost']
+
+
+def test_map_hosts_on_categorical():
+    schema = IngestSchema()
+    hosts = schema.apply(_raw_frame())['sHost']
+
+    mapped = schema.map_hosts(hosts, {'a.com': '10'})
+    assert mapped.isna().tolist() == [False, True, False]
+    assert mapped.dropna().tolist() == ['10', '10']
+    assert schema.map_hosts(hosts.astype(object), {'b.com': '1'}).isna().tolist() == [True, False, True]
+
+
+def test_encode_categories():
+    schema = IngestSchema()
+
+    numeric = schema.encode_categories(pd.Series(['10', None, '1'], dtype=object))
+    assert str(numeric.dtype) == 'Int16'
+    assert numeric.isna().tolist() == [False, True, False]
+
+    # 정수 문자열로 왕복되지 않는 코드(앞자리 0, 문자)는 categorical
+    assert isinstance(schema.encode_categories(pd.Series(['010', '1'])).dtype, pd.CategoricalDtype)
+    assert isinstance(schema.encode_categories(pd.Series(['adult', None])).dtype, pd.CategoricalDtype)
+
+
+def test_within_budget():
+    df = IngestSchema().apply(_raw_frame())
+    usage_mb = IngestSchema().memory_usage_mb(df)
+
+    assert IngestSchema(0).within_budget(df) == (True, usage_mb)
+    assert IngestSchema(1).within_budget(df) == (True, usage_mb)
+
+
+def test_max_rows_is_a_lower_bound_of_frame_memory():
+    schema = IngestSchema(1)
+    assert IngestSchema(0).max_rows() is None
+    assert schema.max_rows() == 1024 * 1024 // MIN_ROW_BYTES
+
+    _, sql_pages = _sample_pages(20000, 5000)
+    df = decode_pages(sql_pages)
+    assert df.memory_usage(deep=True).sum() >= len(df) * MIN_ROW_BYTES
+
+
+def test_decode_pages_stops_when_rows_exceed_budget():
+    _, sql_pages = _sample_pages(20000, 5000)
+    pulled = []
+    closed = []
+
+    def pages():
+        try:
+            for page in sql_pages:
+                pulled.append(page)
+                yield page
+        finally:
+            closed.append(True)
+
+    with pytest.raises(FrameBudgetExceeded) as excinfo:
+        decode_pages(pages(), max_rows=7000)
+
+    assert excinfo.value.rows == 10000
+    assert len(pulled) == 2
+    assert closed == [True]
+
+
+def test_decode_pages_within_row_budget():
+    search_pages, sql_pages = _sample_pages(3000, 1000)
+
+    sql_df = decode_pages(sql_pages, max_rows=3000)
+    search_df = decode_pages(search_pages, max_rows=3000)
+
+    assert len(sql_df) == len(search_df) == 3000
+    pd.testing.assert_frame_equal(IngestSchema().apply(search_df), search_df)
+
+
+def _search_page(timestamps):
+    return {'hits': {'hits': [
+        {'_source': {'@timestamp': ts, 'sHost': 'a.com', 'sSrcIP': '10.0.0.1'}} for ts in timestamps
+    ]}}
+
+
+def test_decode_epoch_and_string_timestamps():
+    epoch_ms = 1735689600000
+    df = decode_pages([
+        _search_page([None, epoch_ms, epoch_ms + 60000.0]),
+        _search_page(['2025-01-01T00:02:00Z', '2025-01-01T00:03:00.500Z', str(epoch_ms + 240000), 'bad']),
+    ])
+
+    assert str(df['@timestamp'].dtype) == 'datetime64[ns, UTC]'
+    assert df['@timestamp'].isna().tolist() == [True] + [False] * 5 + [True]
+    assert df['@timestamp'].dropna().tolist() == [
+        pd.Timestamp('2025-01-01T00:00:00Z'),
+        pd.Timestamp('2025-01-01T00:01:00Z'),
+        pd.Timestamp('2025-01-01T00:02:00Z'),
+        pd.Timestamp('2025-01-01T00:03:00.500Z'),
+        pd.Timestamp('2025-01-01T00:04:00Z'),
+    ]
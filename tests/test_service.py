@@ -0,0 +1,68 @@
+"""
+상주 서비스 일정/실행 방식 테스트
+
+서비스는 config.ini의 설정을 읽으므로 설정 파일이 없으면 건너뜀
+"""
+
+import configparser
+from datetime import datetime, timedelta
+
+import pytest
+
+try:
+    from src.service import AnalysisService, request_run
+    from src.utils.incremental import IncrementalState
+except configparser.Error:
+    pytest.skip("config.ini가 필요합니다", allow_module_level=True)
+
+
+def _service(tmp_path, refresh_minutes=0, **options):
+    service = AnalysisService(str(tmp_path), run_at='01:00', poll_seconds=1, log=lambda *_: None, **options)
+    service.refresh_minutes = refresh_minutes
+    return service
+
+
+def test_next_scheduled_run(tmp_path):
+    service = _service(tmp_path)
+
+    assert service.next_scheduled_run(datetime(2025, 1, 2, 0, 30)) == datetime(2025, 1, 2, 1, 0)
+    assert service.next_scheduled_run(datetime(2025, 1, 2, 1, 30)) == datetime(2025, 1, 3, 1, 0)
+    service.last_run_date = '2025-01-02'
+    assert service.next_scheduled_run(datetime(2025, 1, 2, 0, 30)) == datetime(2025, 1, 3, 1, 0)
+
+
+def test_scheduled_run_analyzes_previous_day(tmp_path):
+    run_time = datetime(2025, 1, 2, 1, 0)
+
+    assert _service(tmp_path).scheduled_date(run_time) == '2025-01-01'
+    assert _service(tmp_path, run_offset_days=0).scheduled_date(run_time) == '2025-01-02'
+
+
+def test_one_mode_per_date(tmp_path):
+    today = datetime.now().strftime('%Y-%m-%d')
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    older = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d')
+    IncrementalState(str(tmp_path), yesterday).save()
+
+    assert not _service(tmp_path).uses_incremental(today)
+    assert not _service(tmp_path).uses_incremental(yesterday)
+
+    service = _service(tmp_path, refresh_minutes=10)
+    # 증분 갱신 중인 당일과 증분 상태가 있는 날짜는 증분 실행으로만 기록
+    assert service.uses_incremental(today)
+    assert service.uses_incremental(yesterday)
+    assert not service.uses_incremental(older)
+
+
+def test_trigger_files(tmp_path):
+    service = _service(tmp_path)
+    request_run(str(tmp_path), '2025-01-01', fresh=True)
+    request_run(str(tmp_path))
+    service.trigger()
+
+    assert service._pop_triggers() == [
+        {'date': '2025-01-01', 'fresh': True},
+        {'date': None, 'fresh': False},
+        {'date': None, 'fresh': False},
+    ]
+    assert service._pop_triggers() == []
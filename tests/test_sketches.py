@@ -0,0 +1,135 @@
+"""
+병합 가능한 스케치(HyperLogLog, Space-Saving) 테스트
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from src.utils.sketches import HyperLogLog, SpaceSaving
+
+
+def _hll(values, precision=12):
+    sketch = HyperLogLog(precision)
+    sketch.update(values)
+    return sketch
+
+
+def test_hll_count_within_error():
+    values = [f"10.0.{i // 256}.{i % 256}" for i in range(20000)]
+    sketch = _hll(values)
+
+    # 표준 오차 약 1.6%, 4배 여유
+    assert abs(sketch.count() - 20000) <= 20000 * 4 * sketch.relative_error()
+
+
+def test_hll_small_counts_are_exact():
+    assert _hll([]).count() == 0
+    assert _hll(['a', 'b', 'c', 'a']).count() == 3
+
+
+def test_hll_merge_equals_sketch_of_union():
+    left = [f"ip{i}" for i in range(0, 6000)]
+    right = [f"ip{i}" for i in range(4000, 10000)]
+
+    merged = _hll(left).merge(_hll(right))
+
+    assert merged.registers == _hll(left + right).registers
+    assert HyperLogLog.union([_hll(left), _hll(right)]).registers == merged.registers
+
+
+def test_hll_merge_is_idempotent():
+    sketch = _hll([f"h{i}" for i in range(3000)])
+    before = sketch.count()
+
+    assert sketch.merge(_hll([f"h{i}" for i in range(1000)])).count() == before
+
+
+def test_hll_precision_mismatch():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(10))
+    with pytest.raises(ValueError):
+        HyperLogLog.union([HyperLogLog(12), HyperLogLog(10)])
+
+
+def test_hll_serialization_round_trip():
+    sketch = _hll([f"u{i}" for i in range(500)])
+    restored = HyperLogLog.from_dict(sketch.to_dict())
+
+    assert restored.precision == sketch.precision
+    assert restored.registers == sketch.registers
+
+
+def _stream(seed=7, size=20000):
+    """상위 몇 개 값이 대부분을 차지하는 스트림"""
+    rng = random.Random(seed)
+    heavy = [f"heavy{i}" for i in range(5)]
+    return [rng.choice(heavy) if rng.random() < 0.6 else f"tail{rng.randrange(5000)}" for _ in range(size)]
+
+
+def test_space_saving_exact_under_capacity():
+    sketch = SpaceSaving(capacity=10)
+    sketch.update(['a', 'b', 'a', 'c', 'a', 'b'])
+
+    assert sketch.top(3) == [('a', 3, 0), ('b', 2, 0), ('c', 1, 0)]
+    assert sketch.min_count() == 0
+    assert sketch.total == 6
+
+
+def test_space_saving_bounds():
+    stream = _stream()
+    actual = Counter(stream)
+    sketch = SpaceSaving(capacity=64)
+    sketch.update(stream)
+
+    for key, count, error in sketch.top(len(sketch.counts)):
+        assert count - error <= actual[key] <= count
+        assert error <= len(stream) / sketch.capacity
+    # 전체의 1/capacity보다 많은 항목은 반드시 포함
+    for key, count in actual.items():
+        if count > len(stream) / sketch.capacity:
+            assert key in sketch.counts
+    # 추적하지 않는 항목의 실제 건수는 min_count 이하
+    assert all(actual[key] <= sketch.min_count() for key in actual if key not in sketch.counts)
+
+
+def test_space_saving_merge_keeps_bounds():
+    first, second = _stream(seed=1), _stream(seed=2)
+    actual = Counter(first + second)
+    left, right = SpaceSaving(capacity=64), SpaceSaving(capacity=64)
+    left.update(first)
+    right.update(second)
+
+    merged = SpaceSaving.union([left, right], capacity=64)
+
+    assert merged.total == len(first) + len(second)
+    assert len(merged.counts) <= 64
+    for key, count, error in merged.top(len(merged.counts)):
+        assert count - error <= actual[key] <= count
+    assert [key for key, _, _ in merged.top(5)] == [key for key, _ in actual.most_common(5)]
+
+
+def test_space_saving_merge_exact_under_capacity():
+    left, right = SpaceSaving(capacity=10), SpaceSaving(capacity=10)
+    left.update(['a', 'a', 'b'])
+    right.update(['b', 'c'])
+
+    assert sorted(left.merge(right).top(3)) == [('a', 2, 0), ('b', 2, 0), ('c', 1, 0)]
+
+
+def test_space_saving_capacity_mismatch():
+    with pytest.raises(ValueError):
+        SpaceSaving(capacity=8).merge(SpaceSaving(capacity=16))
+
+
+def test_space_saving_serialization_round_trip():
+    sketch = SpaceSaving(capacity=16)
+    sketch.update(_stream(size=2000))
+    restored = SpaceSaving.from_dict(sketch.to_dict())
+
+    assert restored.top(16) == sketch.top(16)
+    assert restored.total == sketch.total
+    # 복원한 스케치도 계속 갱신 가능
+    restored.update(['new'] * 1000)
+    assert restored.top(1)[0][0] == 'new'
@@ -0,0 +1,83 @@
+"""
+실행 상태 집계 및 HTTP 상태 서버 테스트
+"""
+
+import json
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from src.utils.scheduler import CostModel
+from src.utils.status import RunStatus, StatusServer
+
+
+def _status(tmp_path, total_urls=2):
+    cost_model = CostModel(str(tmp_path / 'cost_model.json'), default_overhead_sec=1.0, default_sec_per_doc=0.01)
+    status = RunStatus(cost_model)
+    status.reset('2025-01-01', total_urls)
+    return status
+
+
+def test_eta_from_pending_pairs(tmp_path):
+    status = _status(tmp_path, total_urls=1)
+    status.add_pairs('track.com', [('10.0.0.1', 100), ('10.0.0.2', 300)])
+
+    snapshot = status.snapshot()
+    assert snapshot['queue_depth'] == {'pairs': 2, 'urls_not_listed': 0}
+    assert snapshot['eta_sec'] == pytest.approx(6.0)
+
+    status.start_pair('track.com', '10.0.0.1')
+    status.finish_pair('track.com', '10.0.0.1', rows=100)
+    status.skip_pair('track.com', '10.0.0.2')
+
+    snapshot = status.snapshot()
+    assert (snapshot['pairs_done'], snapshot['pairs_skipped'], snapshot['rows_done']) == (1, 1, 100)
+    assert snapshot['eta_sec'] == 0
+    assert status.cost_model.samples == 1
+
+
+def test_eta_for_unlisted_urls(tmp_path):
+    status = _status(tmp_path, total_urls=3)
+    assert status.snapshot()['eta_sec'] is None
+
+    status.add_pairs('a.com', [('10.0.0.1', 100)])
+    snapshot = status.snapshot()
+    # IP 목록을 조회하지 않은 URL은 조회한 URL의 평균 비용으로 추정
+    assert snapshot['queue_depth']['urls_not_listed'] == 2
+    assert snapshot['eta_sec'] == pytest.approx(6.0)
+
+    status.finish_url('a.com')
+    status.finish()
+    snapshot = status.snapshot()
+    assert snapshot['finished'] and snapshot['eta_sec'] == 0
+    assert snapshot['queue_depth']['pairs'] == 0
+
+
+def test_in_flight_and_cache_stats(tmp_path):
+    status = _status(tmp_path)
+    status.start_pair('a.com', '10.0.0.1')
+    status.fetch_started()
+
+    snapshot = status.snapshot({'in_flight': 3, 'hit_rate': 0.5, 'cache_size': 10})
+    assert snapshot['in_flight'] == {'pairs': 1, 'es_requests': 1, 'hims_hosts': 3}
+    assert snapshot['cache']['hims_hit_rate'] == 0.5
+
+    status.fetch_finished()
+    assert status.snapshot()['in_flight']['es_requests'] == 0
+
+
+def test_status_server(tmp_path):
+    status = _status(tmp_path)
+    server = StatusServer(status.snapshot, port=0).start()
+    host, port = server.address
+    try:
+        with urlopen(f"http://{host}:{port}/status", timeout=5) as response:
+            body = json.loads(response.read().decode('utf-8'))
+        assert body['analysis_date'] == '2025-01-01'
+
+        with pytest.raises(HTTPError) as error:
+            urlopen(f"http://{host}:{port}/other", timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.stop()